@@ -2,15 +2,19 @@
 """
 Interactive word culling tool.
 Press 'j' to keep a word, 'k' to discard, 's' to save and quit.
-Progress is saved to a state file that can be resumed later.
+Every decision is appended to a journal file as it is made, so progress
+survives crashes and can be resumed later. Old JSON state files are
+converted to the journal format on first use.
 """
 
 import sys
 import tty
 import termios
-import json
 import os
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from src.crossword_mini.cull_journal import CullJournal
+
 def get_single_key():
     """Read a single keypress without requiring Enter."""
     fd = sys.stdin.fileno()
@@ -35,39 +39,35 @@ def cull_words(input_file, state_file):
     """Interactively filter words from input file, saving state to state_file."""
 
     # Load or initialize state
-    if os.path.exists(state_file):
-        with open(state_file, 'r') as f:
-            state = json.load(f)
-        kept = set(state.get('kept', []))
-        discarded = set(state.get('discarded', []))
-        print(f"Resuming from saved state: {len(kept)} kept, {len(discarded)} discarded")
-    else:
-        kept = set()
-        discarded = set()
+    resuming = os.path.exists(state_file)
+    journal = CullJournal(state_file)
+    if resuming:
+        kept_count = sum(journal.decisions.values())
+        print(f"Resuming from saved state: {kept_count} kept, {len(journal) - kept_count} discarded")
 
     try:
         with open(input_file, 'r') as f:
             words = [line.strip() for line in f if line.strip()]
 
         # Filter out already reviewed words
-        reviewed = kept | discarded
-        remaining = [w for w in words if w not in reviewed]
+        remaining = [w for w in words if w not in journal]
 
         print(f"Loaded {len(words)} words from {input_file}")
         print(f"Remaining to review: {len(remaining)}")
         print("Press 'j' to keep, 'k' to discard, 's' to save and quit\n")
 
         for i, word in enumerate(remaining):
-            total_reviewed = len(kept) + len(discarded)
+            total_reviewed = len(journal)
             print(f"[{total_reviewed + 1}/{len(words)}] {word}", end='', flush=True)
 
             key = get_single_key()
 
+            # Each decision is written and fsynced immediately
             if key == 'j':
-                kept.add(word)
+                journal.keep(word)
                 print(" ✓ KEPT")
             elif key == 'k':
-                discarded.add(word)
+                journal.discard(word)
                 print(" ✗ DISCARDED")
             elif key == 's':
                 print("\n\nSaving and quitting...")
@@ -77,35 +77,25 @@ def cull_words(input_file, state_file):
                 print(f" (unknown key, try again)", end='\r', flush=True)
                 continue
 
-        # Save state
-        state = {
-            'kept': sorted(list(kept)),
-            'discarded': sorted(list(discarded))
-        }
-        with open(state_file, 'w') as f:
-            json.dump(state, f, indent=2)
-
-        total = len(kept) + len(discarded)
-        print(f"\nSaved state: {len(kept)} kept, {len(discarded)} discarded ({total}/{len(words)} reviewed)")
+        journal.close()
+        kept_count = sum(journal.decisions.values())
+        print(f"\nSaved state: {kept_count} kept, {len(journal) - kept_count} discarded ({len(journal)}/{len(words)} reviewed)")
 
     except KeyboardInterrupt:
+        # Every decision is already on disk; closing only compacts the journal
         print("\n\nInterrupted! Saving progress...")
-        state = {
-            'kept': sorted(list(kept)),
-            'discarded': sorted(list(discarded))
-        }
-        with open(state_file, 'w') as f:
-            json.dump(state, f, indent=2)
-        total = len(kept) + len(discarded)
-        print(f"Saved state: {len(kept)} kept, {len(discarded)} discarded ({total}/{len(words)} reviewed)")
+        journal.close()
+        kept_count = sum(journal.decisions.values())
+        print(f"Saved state: {kept_count} kept, {len(journal) - kept_count} discarded ({len(journal)}/{len(words)} reviewed)")
     except FileNotFoundError:
+        journal.close()
         print(f"Error: Could not find file '{input_file}'")
         sys.exit(1)
 
 def main():
     if len(sys.argv) != 3:
         print("Usage: python3 cull-words.py <input_file> <state_file>")
-        print("\nThe state file (JSON) tracks kept/discarded words and allows resuming.")
+        print("\nThe state file (a decision journal) tracks kept/discarded words and allows resuming.")
         sys.exit(1)
 
     input_file = sys.argv[1]
@@ -1,35 +1,36 @@
 #!/usr/bin/env python3
 """
-Extract kept words from a cull-words.py state file.
+Extract kept words from a cull-words.py state file (journal or old JSON).
 Outputs the kept words to a text file (one per line).
 """
 
+import os
 import sys
-import json
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from src.crossword_mini.cull_journal import kept_words, read_journal
 
 def extract_kept_words(state_file, output_file):
-    """Read state file and write kept words to output file."""
+    """Replay the state file and write kept words to output file."""
     try:
-        with open(state_file, 'r') as f:
-            state = json.load(f)
-
-        kept = state.get('kept', [])
-        discarded = state.get('discarded', [])
-
-        with open(output_file, 'w') as f:
-            for word in kept:
-                f.write(word + '\n')
-
-        print(f"Extracted {len(kept)} kept words to {output_file}")
-        print(f"(Discarded {len(discarded)} words)")
-
+        decisions = read_journal(state_file)
     except FileNotFoundError:
         print(f"Error: Could not find state file '{state_file}'")
         sys.exit(1)
-    except json.JSONDecodeError:
-        print(f"Error: '{state_file}' is not a valid JSON file")
+    except ValueError:
+        print(f"Error: '{state_file}' is not a valid state file")
         sys.exit(1)
 
+    # Only touch the output once the state file has been read in full,
+    # so a bad state file leaves an existing output file intact
+    kept = kept_words(decisions)
+    with open(output_file, 'w') as f:
+        for word in kept:
+            f.write(word + '\n')
+
+    print(f"Extracted {len(kept)} kept words to {output_file}")
+    print(f"(Discarded {len(decisions) - len(kept)} words)")
+
 def main():
     if len(sys.argv) != 3:
         print("Usage: python3 extract-kept-words.py <state_file> <output_file>")
@@ -9,4 +9,14 @@ __author__ = "kevinu"
 
 from .crossword_generator import *
 from .grid import Grid
-from .word_trie import WordTrie, load_words_from_file
+from .word_trie import QueryCache, WordTrie, load_words_from_file
+from .sharded_trie import ShardedWordTrie, load_sharded_words, split_words
+from .counting import PuzzleCounter, count_puzzles, count_all_seeds, sample_puzzle
+from .service import PuzzleService
+from .clues import ClueProvider, ClueStore, StubClueProvider
+from .overlay import OverlayDictionary
+from .shared_trie import SharedWordTrie, pack_trie, write_trie_file
+from .cull_journal import CullJournal, read_journal
+from .feasibility import SeedOracle, build_seed_table, load_seed_table, write_seed_table
+from .ranking import PrefixScores, best_puzzles
+from .puzzle_sets import PuzzleSet, dictionary_delta
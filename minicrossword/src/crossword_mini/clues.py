@@ -0,0 +1,194 @@
+"""
+Clue storage with a persistent local cache and pluggable async providers.
+"""
+
+import asyncio
+import sqlite3
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional
+from .grid import Grid
+
+QUERY_CHUNK_SIZE = 500
+
+
+class ClueProvider(ABC):
+    """
+    Source of clues for words, such as an LLM endpoint.
+
+    Subclasses implement get_clues. It is always called with a batch of
+    uppercase words and may return clues for only some of them; words it
+    leaves out are simply not cached. Returned words are uppercased before
+    they are stored.
+    """
+
+    @abstractmethod
+    async def get_clues(self, words: List[str]) -> Dict[str, str]:
+        """
+        Write clues for a batch of words.
+
+        Args:
+            words: Uppercase words without a cached clue
+
+        Returns:
+            Mapping of word to clue
+        """
+
+
+class StubClueProvider(ClueProvider):
+    """Local provider returning canned or placeholder clues, for tests and offline use."""
+
+    def __init__(self, clues: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            clues: Canned clues by word; other words get a placeholder clue
+        """
+        self.clues = {word.upper(): clue for word, clue in (clues or {}).items()}
+        self.calls: List[List[str]] = []
+
+    async def get_clues(self, words: List[str]) -> Dict[str, str]:
+        self.calls.append(list(words))
+        return {word: self.clues.get(word, f"{len(word)}-letter word starting with {word[0]}")
+                for word in words}
+
+
+def _normalize_clues(clues: Dict[str, str]) -> Dict[str, str]:
+    """Key provider results by uppercase word, as the store and its lookups are."""
+    return {word.strip().upper(): clue for word, clue in clues.items()}
+
+
+class ClueStore:
+    """
+    Clues keyed by word in an SQLite database.
+
+    Lookups answer from the database first and send only the missing words
+    to the provider, in a single batch, so each word costs one provider
+    call ever.
+    """
+
+    def __init__(self, path: str = ':memory:'):
+        """
+        Args:
+            path: SQLite database file (default: an in-memory database)
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS clues (word TEXT PRIMARY KEY, clue TEXT NOT NULL)')
+        self.connection.commit()
+
+    def __len__(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM clues').fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.connection.close()
+
+    def get(self, word: str) -> Optional[str]:
+        """Get the cached clue for a word, or None."""
+        return self.get_many([word]).get(word.strip().upper())
+
+    def get_many(self, words: Iterable[str]) -> Dict[str, str]:
+        """
+        Get cached clues for several words with batched queries.
+
+        Args:
+            words: Words to look up
+
+        Returns:
+            Mapping of uppercase word to clue, for the words that have one
+        """
+        words = sorted(set(word.strip().upper() for word in words))
+        clues = {}
+
+        # Older SQLite builds allow at most 999 bound parameters per query
+        for start in range(0, len(words), QUERY_CHUNK_SIZE):
+            chunk = words[start:start + QUERY_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            clues.update(self.connection.execute(
+                f'SELECT word, clue FROM clues WHERE word IN ({placeholders})', chunk))
+
+        return clues
+
+    def put_many(self, clues: Dict[str, str]) -> None:
+        """Store clues, replacing any existing clue for the same word."""
+        self.connection.executemany(
+            'INSERT OR REPLACE INTO clues (word, clue) VALUES (?, ?)',
+            [(word.strip().upper(), clue) for word, clue in clues.items()])
+        self.connection.commit()
+
+    async def lookup(self, words: Iterable[str], provider: ClueProvider) -> Dict[str, str]:
+        """
+        Get clues for words, asking the provider only for uncached ones.
+
+        Args:
+            words: Words to look up
+            provider: Provider for words without a cached clue
+
+        Returns:
+            Mapping of uppercase word to clue
+        """
+        words = [word.strip().upper() for word in words]
+        clues = self.get_many(words)
+
+        missing = sorted(set(words) - set(clues))
+        if missing:
+            fetched = _normalize_clues(await provider.get_clues(missing))
+            self.put_many(fetched)
+            clues.update(fetched)
+
+        return clues
+
+    async def clues_for_grid(self, grid: Grid, provider: ClueProvider) -> Dict[str, List[Optional[str]]]:
+        """
+        Get clues for the ten entries of a completed grid in one batch.
+
+        Args:
+            grid: Completed grid
+            provider: Provider for entries without a cached clue
+
+        Returns:
+            Dictionary with 'across' and 'down' lists of clues in grid order
+            (None where the provider returned no clue)
+        """
+        acrosses = grid.get_acrosses()
+        downs = [grid.get_column(col) for col in range(grid.size)]
+        clues = await self.lookup(acrosses + downs, provider)
+        return {
+            'across': [clues.get(word) for word in acrosses],
+            'down': [clues.get(word) for word in downs],
+        }
+
+    async def precompute(self, words: Iterable[str], provider: ClueProvider,
+                         batch_size: int = 50, concurrency: int = 4) -> int:
+        """
+        Fill the store with clues for a whole dictionary ahead of time.
+
+        Words that already have a clue are skipped, so an interrupted run
+        can simply be restarted.
+
+        Args:
+            words: Words to precompute clues for
+            provider: Provider to ask
+            batch_size: Words per provider call
+            concurrency: Maximum provider calls in flight
+
+        Returns:
+            Number of clues added
+        """
+        words = sorted(set(word.strip().upper() for word in words if word.strip()))
+        cached = self.get_many(words)
+        missing = [word for word in words if word not in cached]
+        batches = [missing[i:i + batch_size] for i in range(0, len(missing), batch_size)]
+
+        semaphore = asyncio.Semaphore(concurrency)
+        added = 0
+
+        async def run_batch(batch: List[str]) -> None:
+            nonlocal added
+            async with semaphore:
+                fetched = _normalize_clues(await provider.get_clues(batch))
+            self.put_many(fetched)
+            added += len(fetched)
+
+        await asyncio.gather(*[run_batch(batch) for batch in batches])
+        return added
@@ -0,0 +1,456 @@
+"""
+Count puzzle completions without building grids.
+"""
+
+import random
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple
+from .dawg import WordDawg
+from .grid import Grid
+from .word_trie import WordTrie
+
+GRID_SIZE = 5
+
+
+class PuzzleCounter:
+    """
+    Counts 5x5 fills by row-by-row search over a WordDawg.
+
+    The search state after placing some rows is the tuple of DAWG states
+    reached by each column prefix. That tuple fully determines how many
+    ways the remaining rows can be filled, so those counts are memoized on
+    it alone. Candidate row words are found with bitsets over the
+    dictionary's 5-letter words: ANDing, for each column, the words whose
+    letter there extends the column gives every candidate for the next row
+    at once, and for the last row the popcount of that AND is the count.
+
+    The state counts include fills that repeat a word, which
+    generate_all_puzzles rejects. count() corrects for them separately by
+    walking only the row words the state memo knows to have fills after
+    them and dropping the fills with two equal entries. Whether an entry
+    repeats depends on the rows themselves, not just the states, so this
+    walk visits every two- and three-row prefix that has a fill and costs
+    time in proportion to the seed's fills (for CRANE on combined-five,
+    3,412 prefixes for 4,732 fills). Its counts for those prefixes are
+    kept so sample() can draw exactly; last-row counts are recomputed.
+
+    The state memos do not depend on the seed, so one counter shares them
+    across every seed it counts; they are LRU caches of ``max_memo_size``
+    entries each, so memory stays bounded however many seeds are counted.
+    Only the walk's counts, which are keyed on the placed rows, are
+    cleared when a different seed is counted or sampled.
+    """
+
+    def __init__(self, trie: WordTrie, dawg: Optional[WordDawg] = None,
+                 max_memo_size: int = 200000):
+        """
+        Args:
+            trie: Dictionary to count fills from
+            dawg: Prebuilt automaton for ``trie`` (built if omitted)
+            max_memo_size: Maximum number of entries kept in each state memo
+        """
+        self.trie = trie
+        self.dawg = dawg if dawg is not None else WordDawg(trie)
+        self.words = sorted(self._iter_row_words())
+        self.seed: Optional[str] = None
+        self.max_memo_size = max_memo_size
+        # Fills (repeats included) per (depth, column states), least recently used first
+        self.memo: 'OrderedDict[Tuple[int, Tuple[int, ...]], int]' = OrderedDict()
+        # Row words with fills after them, per (depth, column states)
+        self.branch_memo: 'OrderedDict[Tuple[int, Tuple[int, ...]], List[Tuple[str, Tuple[int, ...]]]]' = \
+            OrderedDict()
+        self.evictions = 0
+        # Fills with ten different entries per tuple of up to three placed rows
+        self.distinct_memo: Dict[Tuple[str, ...], int] = {}
+
+        self._letter_masks: List[Dict[str, int]] = [{} for _ in range(GRID_SIZE)]
+        for index, word in enumerate(self.words):
+            bit = 1 << index
+            for col, char in enumerate(word):
+                masks = self._letter_masks[col]
+                masks[char] = masks.get(char, 0) | bit
+        self._extend_masks: Dict[Tuple[int, int], int] = {}
+        self._final_masks: Dict[Tuple[int, int], int] = {}
+
+    def _iter_row_words(self) -> Iterator[str]:
+        """Yield the automaton's 5-letter words."""
+        edges = self.dawg.edges
+        stack = [(self.dawg.root, '')]
+        while stack:
+            state, prefix = stack.pop()
+            if len(prefix) == GRID_SIZE:
+                if self.dawg.is_final[state]:
+                    yield prefix
+                continue
+            stack.extend((child, prefix + char) for char, child in edges[state].items())
+
+    def seed_state(self, seed_word: str) -> Optional[Tuple[int, ...]]:
+        """Return the column states after placing a seed, or None if a column is dead."""
+        seed_word = seed_word.upper().strip()
+        if len(seed_word) != GRID_SIZE:
+            return None
+
+        edges = self.dawg.edges[self.dawg.root]
+        states = tuple(edges.get(char) for char in seed_word)
+        if None in states:
+            return None
+        return states
+
+    def use_seed(self, seed_word: str) -> None:
+        """Clear the walk's counts unless they already belong to ``seed_word``."""
+        if seed_word != self.seed:
+            self.seed = seed_word
+            self.distinct_memo.clear()
+
+    def _remember(self, memo: OrderedDict, key: Tuple, value) -> None:
+        """Store a state memo entry, evicting the least recently used one if full."""
+        memo[key] = value
+        if len(memo) > self.max_memo_size:
+            memo.popitem(last=False)
+            self.evictions += 1
+
+    def count(self, seed_word: str) -> int:
+        """
+        Count the fills of a grid whose first row is ``seed_word``.
+
+        Args:
+            seed_word: The 5-letter word in row 0 (need not be in the dictionary)
+
+        Returns:
+            Number of fills in which every other row and every column is a
+            word and no two entries are the same word
+        """
+        seed_word = seed_word.upper().strip()
+        states = self.seed_state(seed_word)
+        if states is None:
+            return 0
+        self.use_seed(seed_word)
+        if not self.count_from(states, 1):
+            return 0
+        return self.count_distinct((seed_word,), states)
+
+    def count_from(self, states: Tuple[int, ...], depth: int) -> int:
+        """
+        Count the ways to fill rows ``depth`` onwards, repeated words included.
+
+        Args:
+            states: DAWG state reached by each column prefix
+            depth: Number of rows already placed
+
+        Returns:
+            Number of completions
+        """
+        if depth == GRID_SIZE - 2:
+            return self._count_last_two_rows(states)
+        key = (depth, states)
+        total = self.memo.get(key)
+        if total is not None:
+            self.memo.move_to_end(key)
+            return total
+
+        if depth == GRID_SIZE - 1:
+            total = self._last_row_mask(states).bit_count()
+        else:
+            total = 0
+            options = []
+            for next_states, words in self.row_words(states).items():
+                ways = self.count_from(next_states, depth + 1)
+                if ways:
+                    total += len(words) * ways
+                    options.extend((word, next_states) for word in words)
+            if options:
+                options.sort()
+                self._remember(self.branch_memo, key, options)
+
+        self._remember(self.memo, key, total)
+        return total
+
+    def _count_last_two_rows(self, states: Tuple[int, ...]) -> int:
+        """
+        Count the ways to fill the last two rows, repeated words included.
+
+        Nearly every state this deep is reached once and has no fills, so
+        the count is not memoized, and each candidate's last rows are
+        counted from its columns' masks without building the states it
+        leads to.
+        """
+        edges = self.dawg.edges
+        total = 0
+        for index in _iter_bits(self._next_row_mask(states)):
+            mask = -1
+            for col, (state, char) in enumerate(zip(states, self.words[index])):
+                mask &= self._final_mask(col, edges[state][char])
+                if not mask:
+                    break
+            total += mask.bit_count()
+        return total
+
+    def count_distinct(self, rows: Tuple[str, ...], states: Tuple[int, ...]) -> int:
+        """
+        Count the completions of ``rows`` in which no two entries are equal.
+
+        Args:
+            rows: The rows placed so far
+            states: DAWG state reached by each column prefix
+
+        Returns:
+            Number of completions with ten different entries
+        """
+        if len(rows) == GRID_SIZE - 1:
+            return len(self.last_words(rows, states))
+        total = self.distinct_memo.get(rows)
+        if total is not None:
+            return total
+
+        total = 0
+        for word, next_states in self.branches(states, len(rows)):
+            if word not in rows:
+                total += self.count_distinct(rows + (word,), next_states)
+
+        self.distinct_memo[rows] = total
+        return total
+
+    def branches(self, states: Tuple[int, ...], depth: int) -> List[Tuple[str, Tuple[int, ...]]]:
+        """
+        List the next row words that have completions.
+
+        Args:
+            states: DAWG state reached by each column prefix
+            depth: Number of rows already placed (less than GRID_SIZE - 1)
+
+        Returns:
+            (word, next column states) pairs in alphabetical order
+        """
+        key = (depth, states)
+        options = self.branch_memo.get(key)
+        if options is not None:
+            self.branch_memo.move_to_end(key)
+            return options
+
+        # count_from records the branches of the states it memoizes; the
+        # last two rows are counted without them, and an entry may have
+        # been evicted since, so list them here
+        options = [(word, next_states)
+                   for next_states, words in self.row_words(states).items()
+                   if self.count_from(next_states, depth + 1)
+                   for word in words]
+        options.sort()
+        self._remember(self.branch_memo, key, options)
+        return options
+
+    def row_words(self, states: Tuple[int, ...]) -> Dict[Tuple[int, ...], List[str]]:
+        """
+        Group the words that can fill the next row by the column states they lead to.
+
+        Args:
+            states: DAWG state reached by each column prefix
+
+        Returns:
+            Mapping of next column states to the row words leading there,
+            in alphabetical order
+        """
+        edges = self.dawg.edges
+        groups: Dict[Tuple[int, ...], List[str]] = {}
+        for index in _iter_bits(self._next_row_mask(states)):
+            word = self.words[index]
+            next_states = tuple([edges[state][char] for state, char in zip(states, word)])
+            groups.setdefault(next_states, []).append(word)
+        return groups
+
+    def last_words(self, rows: Tuple[str, ...], states: Tuple[int, ...]) -> List[str]:
+        """
+        List the last row words that complete ``rows`` with ten different entries.
+
+        Args:
+            rows: The first GRID_SIZE - 1 rows
+            states: DAWG state reached by each column prefix
+
+        Returns:
+            Matching words in alphabetical order
+        """
+        words = []
+        column_prefixes = [''.join(letters) for letters in zip(*rows)]
+        for index in _iter_bits(self._last_row_mask(states)):
+            word = self.words[index]
+            if word in rows:
+                continue
+            entries = set(rows)
+            entries.add(word)
+            for prefix, char in zip(column_prefixes, word):
+                column = prefix + char
+                if column in entries:
+                    break
+                entries.add(column)
+            else:
+                words.append(word)
+        return words
+
+    def _next_row_mask(self, states: Tuple[int, ...]) -> int:
+        """Bitset of the words whose every letter extends its column."""
+        mask = -1
+        for col, state in enumerate(states):
+            column_mask = self._extend_masks.get((col, state))
+            if column_mask is None:
+                column_mask = 0
+                for char in self.dawg.edges[state]:
+                    column_mask |= self._letter_masks[col].get(char, 0)
+                self._extend_masks[(col, state)] = column_mask
+            mask &= column_mask
+            if not mask:
+                break
+        return mask
+
+    def _last_row_mask(self, states: Tuple[int, ...]) -> int:
+        """Bitset of the words whose every letter completes its column."""
+        mask = -1
+        for col, state in enumerate(states):
+            mask &= self._final_mask(col, state)
+            if not mask:
+                break
+        return mask
+
+    def _final_mask(self, col: int, state: int) -> int:
+        """Bitset of the words whose letter at ``col`` completes a column in ``state``."""
+        column_mask = self._final_masks.get((col, state))
+        if column_mask is None:
+            column_mask = 0
+            for char, child in self.dawg.edges[state].items():
+                if self.dawg.is_final[child]:
+                    column_mask |= self._letter_masks[col].get(char, 0)
+            self._final_masks[(col, state)] = column_mask
+        return column_mask
+
+    def sample(self, seed_word: str, rng: Optional[random.Random] = None) -> Optional[Grid]:
+        """
+        Draw one fill of a seed uniformly at random.
+
+        Walks down one row at a time, choosing each row word with
+        probability proportional to the memoized fills after it, so every
+        fill count() counts is equally likely and none is ever redrawn.
+        count() fills the memos for the seed, so each draw after it is a
+        single root-to-leaf walk that adds no memo entries; only the
+        fourth row's choices recount their last rows.
+
+        Args:
+            seed_word: The 5-letter word in row 0
+            rng: Random number generator (a fresh unseeded one if omitted);
+                pass random.Random(n) for reproducible draws
+
+        Returns:
+            The sampled grid, or None if the seed has no fills
+        """
+        seed_word = seed_word.upper().strip()
+        total = self.count(seed_word)
+        if total == 0:
+            return None
+        if rng is None:
+            rng = random.Random()
+
+        rows: Tuple[str, ...] = (seed_word,)
+        states = self.seed_state(seed_word)
+        # Exact integer draws; counts can be too large for float weights
+        pick = rng.randrange(total)
+        for depth in range(1, GRID_SIZE - 1):
+            for word, next_states in self.branches(states, depth):
+                if word in rows:
+                    continue
+                ways = self.count_distinct(rows + (word,), next_states)
+                if pick < ways:
+                    rows += (word,)
+                    states = next_states
+                    break
+                pick -= ways
+        rows += (self.last_words(rows, states)[pick],)
+
+        grid = Grid()
+        for row, word in enumerate(rows):
+            grid.place_word(word, row)
+        return grid
+
+
+def _iter_bits(mask: int) -> Iterator[int]:
+    """Yield the indexes of the set bits of a non-negative mask, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def count_puzzles(seed_word: str, trie: WordTrie) -> int:
+    """
+    Count the puzzles that can be generated from a seed word.
+
+    Args:
+        seed_word: The 5-letter word in row 0
+        trie: Dictionary to fill from
+
+    Counting never builds a grid, but removing the fills that repeat a
+    word walks every two- and three-row prefix that has a fill, so the
+    time still grows with the number of fills (see PuzzleCounter).
+
+    Returns:
+        Number of fills in which every entry is a dictionary word and no
+        two entries are the same word, i.e. len(generate_all_puzzles(...))
+    """
+    return PuzzleCounter(trie).count(seed_word)
+
+
+def sample_puzzle(seed_word: str, trie: WordTrie, random_seed: Optional[int] = None,
+                  counter: Optional[PuzzleCounter] = None) -> Optional[Grid]:
+    """
+    Draw a puzzle uniformly from every fill of a seed, without enumerating them.
+
+    Without ``counter`` every call builds a WordDawg and counts the seed's
+    fills from scratch, which costs far more than the draw itself (the
+    count walks every two- and three-row prefix that has a fill); pass one
+    PuzzleCounter for ``trie`` to repeated calls so they share that work.
+    Its memos are size-bounded, so drawing from many seeds does not grow
+    it without limit.
+
+    Args:
+        seed_word: The 5-letter word in row 0
+        trie: Dictionary to fill from
+        random_seed: Seed for the random number generator, for reproducible draws
+        counter: PuzzleCounter built for ``trie`` (a new one if omitted)
+
+    Returns:
+        A grid with ten distinct entries, each of generate_all_puzzles'
+        fills being equally likely, or None if the seed has no fills
+    """
+    if counter is None:
+        counter = PuzzleCounter(trie)
+    return counter.sample(seed_word, random.Random(random_seed))
+
+
+def count_all_seeds(trie: WordTrie) -> Dict[str, int]:
+    """
+    Count the puzzles for every 5-letter word in the dictionary as a seed.
+
+    One PuzzleCounter serves every seed, so the automaton and the word
+    bitsets are built once and the counts memoized on column states are
+    shared between seeds, up to the counter's memo size.
+
+    Args:
+        trie: Dictionary to fill from
+
+    Returns:
+        Mapping of seed word to number of fills
+    """
+    counter = PuzzleCounter(trie)
+    return {seed: counter.count(seed) for seed in counter.words}
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+    from .word_trie import load_words_from_file
+
+    if len(sys.argv) != 2:
+        print("Usage: python3 -m src.crossword_mini.counting <words.txt>")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    seed_counts = count_all_seeds(load_words_from_file(sys.argv[1]))
+    elapsed = time.perf_counter() - started
+    print(f"Counted {sum(seed_counts.values())} puzzles from {len(seed_counts)} seeds "
+          f"in {elapsed:.1f}s ({elapsed / max(len(seed_counts), 1):.3f}s per seed)")
@@ -2,66 +2,424 @@
 Main crossword generator class that orchestrates the puzzle creation.
 """
 
+import asyncio
+import math
 import random
-from typing import List, Optional, Dict, Any
-from .grid import Grid
-from .word_trie import WordTrie
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+from .dawg import WordDawg
+from .grid import Direction, Grid
+# Relative imports stay on single lines: crossword.html comments them out line by line
+from .row_search import claim_entries, column_cursors, column_letter_sets, word_bit
+from .row_search import slot_cells, slot_pattern
+from .word_trie import TrieNode, WordTrie
 import copy
 
-def _search_pattern_for_char_at_index(char: str, index: int) -> str:
-    return "?" * index + char + "?" * (5 - index - 1)
+def generate_next_word_candidates(grid: Grid, row: int, trie: WordTrie,
+                                  cursors: Optional[List[TrieNode]] = None) -> List[str]:
+    # Each column allows the letters that continue its prefix; one letter-set
+    # query then walks the trie once for all combinations, and (for a
+    # ShardedWordTrie) only loads shards the first column allows.
+    return list(trie.iter_words_with_letter_sets(column_letter_sets(grid, row, trie, cursors)))
+
+
+class SearchBudgetExceeded(Exception):
+    """Raised when a search expands more nodes than its budget allows."""
+
+
+class SearchCancelled(Exception):
+    """Raised when an async search is cancelled by its caller."""
+
+
+class SearchBudget:
+    """
+    Counts expanded search nodes, enforces an optional limit and tracks
+    progress: the row being filled and the deepest partial fill so far.
+    """
+
+    def __init__(self, max_nodes: Optional[int] = None, report_every: Optional[int] = None):
+        """
+        Args:
+            max_nodes: Optional limit on the number of expanded nodes
+            report_every: Ask the search to pause every this many nodes
+                (default: never pause)
+        """
+        self.max_nodes = max_nodes
+        self.report_every = report_every
+        self.nodes = 0
+        self.depth = 0
+        self.best_rows: List[str] = []
+
+    def charge(self, grid: Grid, row: int, entries: Optional[List[str]] = None) -> bool:
+        """
+        Count one node expanded while filling ``row``.
+
+        Slot searches, which do not fill rows in order, pass the number of
+        complete slots as ``row`` and those slots' words as ``entries``.
+
+        Args:
+            grid: The grid being filled
+            row: Search depth (the row being filled)
+            entries: Words of the partial fill (default: the across words
+                of the rows above ``row``)
+
+        Returns:
+            True if the search should pause for a progress report
+
+        Raises:
+            SearchBudgetExceeded: Past the node limit
+        """
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise SearchBudgetExceeded(f"Search exceeded {self.max_nodes} nodes")
+
+        self.depth = row
+        if row > len(self.best_rows):
+            self.best_rows = entries if entries is not None else grid.get_acrosses()[:row]
+        return self.report_every is not None and self.nodes % self.report_every == 0
+
+    def get_progress(self) -> Dict[str, Any]:
+        """Get the node count, current row and deepest partial fill (its across words)."""
+        return {'nodes': self.nodes, 'depth': self.depth, 'best_rows': list(self.best_rows)}
+
+
+class NogoodTable:
+    """
+    Size-capped LRU table of search states proven to have no completion.
+
+    A state is the row being filled plus the WordDawg state of each column
+    prefix. Different partial grids whose columns can be completed in
+    exactly the same ways share a state, so once one of them is proven dead
+    the others are skipped without searching. A table can be reused across
+    generate_puzzle calls for the same dictionary.
+    """
+
+    def __init__(self, trie: WordTrie, max_size: int = 100000):
+        """
+        Args:
+            trie: Dictionary the table is used with (later inserts are not
+                reflected; a ShardedWordTrie has all its shards loaded)
+            max_size: Maximum number of dead states to keep
+        """
+        self.dawg = WordDawg(trie)
+        self.max_size = max_size
+        self.dead = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.dead)
+
+    def is_dead(self, state: Tuple) -> bool:
+        """Check whether a state is known to be dead, updating the counters."""
+        if state in self.dead:
+            self.dead.move_to_end(state)
+            self.hits += 1
+            return True
+
+        self.misses += 1
+        return False
+
+    def add(self, state: Tuple) -> None:
+        """Record a dead state, evicting the least recently used one if full."""
+        self.dead[state] = True
+        self.dead.move_to_end(state)
+        if len(self.dead) > self.max_size:
+            self.dead.popitem(last=False)
+            self.evictions += 1
+
+    def get_stats(self) -> dict:
+        """Get hit/miss/eviction counters and the current size."""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.dead),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+class LeastConstrainingOrder:
+    """
+    Orders candidate rows so that those leaving the columns the most room
+    are tried first (least-constraining-value ordering).
+
+    A row is scored from WordDawg.suffix_counts: after following the row's
+    letter down each column, the number of words each column can still be
+    completed to. The score combines the five counts by their product
+    (default) or their minimum. Scoring is a few list lookups per
+    candidate, and ties are broken alphabetically so the order does not
+    depend on set iteration order.
+    """
+
+    SCORES = ('product', 'min')
+
+    def __init__(self, trie: WordTrie, score: str = 'product', dawg: Optional[WordDawg] = None):
+        """
+        Args:
+            trie: Dictionary the ordering is used with
+            score: How column counts are combined: 'product' or 'min'
+            dawg: Prebuilt automaton for ``trie`` (built if omitted); pass
+                nogoods.dawg to use the ordering together with a NogoodTable
+
+        Raises:
+            ValueError: If score is not 'product' or 'min'
+        """
+        if score not in self.SCORES:
+            raise ValueError(f"score must be one of {self.SCORES}, got {score!r}")
+
+        self.dawg = dawg if dawg is not None else WordDawg(trie)
+        self.counts = self.dawg.suffix_counts
+        self.score = score
+
+    def order(self, words: List[str], states: Tuple[int, ...]) -> List[str]:
+        """
+        Sort candidate row words, most promising first.
+
+        Args:
+            words: Candidate words for the next row
+            states: DAWG state reached by each column prefix
+
+        Returns:
+            The words, best score first
+        """
+        edges = self.dawg.edges
+        counts = self.counts
+        combine = math.prod if self.score == 'product' else min
+
+        scored = [(-combine([counts[edges[state][char]] for state, char in zip(states, word)]), word)
+                  for word in words]
+        scored.sort()
+        return [word for _, word in scored]
+
+
+def _search_dawg(nogoods: Optional[NogoodTable],
+                 ordering: Optional[LeastConstrainingOrder]) -> Optional[WordDawg]:
+    """
+    Return the automaton whose states the search tracks, if any.
+
+    Raises:
+        ValueError: If nogoods and ordering were built on different automata
+    """
+    if nogoods is not None and ordering is not None and ordering.dawg is not nogoods.dawg:
+        raise ValueError("ordering must share the NogoodTable's automaton; "
+                         "build it with dawg=nogoods.dawg")
+    if nogoods is not None:
+        return nogoods.dawg
+    if ordering is not None:
+        return ordering.dawg
+    return None
+
+
+def _extend_puzzle(grid: Grid, row: int, used: int, trie: WordTrie,
+                   nogoods: Optional[NogoodTable],
+                   states: Optional[Tuple[int, ...]],
+                   budget: SearchBudget,
+                   ordering: Optional[LeastConstrainingOrder] = None,
+                   cursors: Optional[List[TrieNode]] = None):
+    """
+    Fill rows ``row`` onwards in place by depth-first search.
+
+    ``cursors`` holds the trie node of each column prefix (from
+    column_cursors). Each placed row advances them by one child lookup,
+    and every depth keeps its own list, so backtracking needs no undo.
+
+    This is a generator so that the search can pause: it yields whenever
+    budget.charge asks for a progress report, and never otherwise. Drive
+    it with _run_search, or step it with next() to interleave other work.
+
+    Returns:
+        (solved, clean) as the generator's return value, where clean means
+        a failure did not depend on the used-word set, so the state can be
+        recorded as dead for any grid
+    """
+    if row == grid.size:
+        return True, True
+
+    state = (row, states)
+    if nogoods is not None and nogoods.is_dead(state):
+        return False, True
+
+    if budget.charge(grid, row):
+        yield
+    clean = True
+    candidate_words = generate_next_word_candidates(grid, row, trie, cursors)
+    if ordering is not None:
+        candidate_words = ordering.order(candidate_words, states)
+    else:
+        # Last candidate first, matching the order of the original stack-based search
+        candidate_words.reverse()
+
+    for word in candidate_words:
+        grid.place_word(word, row)
+        next_cursors = None
+        downs = None
+        if cursors is not None:
+            next_cursors = [node.children[char] for node, char in zip(cursors, word)]
+            if row == grid.size - 1:
+                downs = [node.word for node in next_cursors]
+
+        new_used = claim_entries(grid, row, word, used, trie, downs)
+        if new_used is None:
+            clean = False
+            continue
+
+        next_states = None
+        if states is not None:
+            edges = (ordering if nogoods is None else nogoods).dawg.edges
+            next_states = tuple(edges[state][char] for state, char in zip(states, word))
+
+        solved, sub_clean = yield from _extend_puzzle(grid, row + 1, new_used, trie, nogoods,
+                                                      next_states, budget, ordering,
+                                                      next_cursors)
+        if solved:
+            return True, True
+        clean = clean and sub_clean
 
-def generate_next_word_candidates(grid: Grid, row: int, trie: WordTrie) -> List[str]:
-    candidates = None
     for col in range(grid.size):
-        current_column = grid.get_column(col)
-        column_candidates = trie.get_words_with_prefix(current_column)
-        next_row_letters = set([word[row] for word in column_candidates])
-        col_matches = set()
-        for letter in next_row_letters:
-            pattern = _search_pattern_for_char_at_index(letter, col)
-            match = trie.get_words_with_pattern(pattern)
-            col_matches.update(match)
-        if candidates is None:
-            candidates = col_matches
-        else:
-            candidates.intersection_update(col_matches)
-
-    return list(candidates)
-
-
-def generate_puzzle(seed_word: str, trie: WordTrie) -> Optional[Grid]:
+        grid.clear_cell(row, col)
+
+    if clean and nogoods is not None:
+        nogoods.add(state)
+    return False, clean
+
+
+def _run_search(search) -> Any:
+    """Run a search generator to completion and return its result."""
+    try:
+        while True:
+            next(search)
+    except StopIteration as done:
+        return done.value
+
+
+def _start_puzzle(seed_word: str, dawg: Optional[WordDawg]) -> Tuple[Grid, Optional[Tuple[int, ...]]]:
+    """Place the seed and compute its column states (None in the tuple marks a dead column)."""
     grid = Grid()
     grid.place_word(seed_word, 0)
-    possible_grids = [grid]
-    while possible_grids:
-        candidate_grid = possible_grids.pop()
 
-        next_row = candidate_grid.first_empty_row()
-        if not next_row:
-            return candidate_grid
+    states = None
+    if dawg is not None:
+        root_edges = dawg.edges[dawg.root]
+        states = tuple(root_edges.get(char) for char in grid.get_acrosses()[0])
+    return grid, states
 
-        candidate_words = generate_next_word_candidates(candidate_grid, next_row, trie)
 
-        for word in candidate_words:
-            new_grid = copy.deepcopy(candidate_grid)
-            if new_grid.can_place_word(word, next_row, trie):
-                new_grid.place_word(word, next_row)
-                possible_grids.append(new_grid)
+def generate_puzzle(seed_word: str, trie: WordTrie,
+                    nogoods: Optional[NogoodTable] = None,
+                    max_nodes: Optional[int] = None,
+                    ordering: Optional[LeastConstrainingOrder] = None) -> Optional[Grid]:
+    """
+    Generate a puzzle whose first row is ``seed_word``.
+
+    Args:
+        seed_word: The 5-letter word in row 0
+        trie: Dictionary to fill from
+        nogoods: Optional table of dead states, shared across calls
+        max_nodes: Optional limit on the number of expanded search nodes
+        ordering: Optional value ordering for candidate rows; without one,
+            rows are tried in candidate order
+
+    Returns:
+        The first completed grid found, or None if no fill exists
+
+    Raises:
+        SearchBudgetExceeded: If the search expands more than max_nodes nodes
+        ValueError: If nogoods and ordering use different automata
+    """
+    grid, states = _start_puzzle(seed_word, _search_dawg(nogoods, ordering))
+    if states is not None and None in states:
+        return None
+
+    cursors = column_cursors(grid, 1, trie)
+    if cursors is not None and None in cursors:
+        return None
+
+    solved, _ = _run_search(_extend_puzzle(grid, 1, word_bit(seed_word, trie), trie, nogoods,
+                                           states, SearchBudget(max_nodes), ordering, cursors))
+    if solved:
+        return grid
+    return None
+
 
+async def generate_puzzle_async(seed_word: str, trie: WordTrie,
+                                nogoods: Optional[NogoodTable] = None,
+                                max_nodes: Optional[int] = None,
+                                yield_every: int = 1000,
+                                progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+                                cancelled: Optional[Callable[[], bool]] = None,
+                                ordering: Optional[LeastConstrainingOrder] = None) -> Optional[Grid]:
+    """
+    Cooperative version of generate_puzzle for event-loop hosts such as Pyodide.
+
+    The search runs exactly as in generate_puzzle, but every ``yield_every``
+    expanded nodes it reports progress, checks for cancellation and awaits
+    asyncio.sleep(0) so the event loop (and a browser page) stays responsive.
+    Cancelling the awaiting task also stops the search.
+
+    Args:
+        seed_word: The 5-letter word in row 0
+        trie: Dictionary to fill from
+        nogoods: Optional table of dead states, shared across calls
+        max_nodes: Optional limit on the number of expanded search nodes
+        yield_every: Expanded nodes between pauses
+        progress: Called at each pause with SearchBudget.get_progress()
+        cancelled: Called at each pause; returning True stops the search
+        ordering: Optional value ordering for candidate rows
+
+    Returns:
+        The first completed grid found, or None if no fill exists
+
+    Raises:
+        SearchBudgetExceeded: If the search expands more than max_nodes nodes
+        SearchCancelled: If ``cancelled`` returned True
+        ValueError: If nogoods and ordering use different automata
+    """
+    grid, states = _start_puzzle(seed_word, _search_dawg(nogoods, ordering))
+    if states is not None and None in states:
+        return None
+
+    cursors = column_cursors(grid, 1, trie)
+    if cursors is not None and None in cursors:
+        return None
+
+    budget = SearchBudget(max_nodes, report_every=yield_every)
+    search = _extend_puzzle(grid, 1, word_bit(seed_word, trie), trie, nogoods, states, budget,
+                            ordering, cursors)
+    try:
+        while True:
+            try:
+                next(search)
+            except StopIteration as done:
+                solved, _ = done.value
+                break
+
+            if progress is not None:
+                progress(budget.get_progress())
+            if cancelled is not None and cancelled():
+                raise SearchCancelled(f"Search cancelled after {budget.nodes} nodes")
+            await asyncio.sleep(0)
+    finally:
+        search.close()
+
+    if solved:
+        return grid
     return None
 
 def generate_all_puzzles(seed_word: str, trie: WordTrie) -> List[Grid]:
     grid = Grid()
     grid.place_word(seed_word, 0)
     num_rows = grid.size
-    possible_grids = [grid]
+    possible_grids = [(grid, word_bit(seed_word, trie))]
     complete_puzzles = []
     while possible_grids:
-        candidate_grid = possible_grids.pop()
+        candidate_grid, used = possible_grids.pop()
 
         next_row = candidate_grid.first_empty_row()
-        if not next_row:
+        if next_row is None:
             print(candidate_grid.display())
             complete_puzzles.append(candidate_grid)
             continue
@@ -71,6 +429,495 @@ def generate_all_puzzles(seed_word: str, trie: WordTrie) -> List[Grid]:
         for word in candidate_words:
             new_grid = copy.deepcopy(candidate_grid)
             new_grid.place_word(word, next_row)
-            possible_grids.append(new_grid)
+            new_used = claim_entries(new_grid, next_row, word, used, trie)
+            if new_used is not None:
+                possible_grids.append((new_grid, new_used))
 
     return complete_puzzles
+
+
+def _square_candidates(grid: Grid, row: int, trie: WordTrie,
+                       cursors: Optional[List[Optional[TrieNode]]]) -> List[str]:
+    """
+    Candidate words for ``row`` of a word square.
+
+    Cells left of the diagonal were fixed by earlier rows' columns, and
+    every letter from the diagonal on must continue its column's prefix,
+    so one letter-set query yields exactly the words that fit.
+    """
+    letter_sets: List[Any] = [grid.get_cell(row, col) for col in range(row)]
+    if cursors is None:
+        letter_sets += [trie.next_letters(grid.get_column(col)[:row], normalized=True)
+                        for col in range(row, grid.size)]
+    else:
+        letter_sets += [cursors[col].children.keys() for col in range(row, grid.size)]
+    return list(trie.iter_words_with_letter_sets(letter_sets))
+
+
+def _extend_square(grid: Grid, row: int, used: int, trie: WordTrie, budget: SearchBudget,
+                   cursors: Optional[List[Optional[TrieNode]]]) -> Iterator[Optional[Grid]]:
+    """
+    Fill a word square from ``row`` on, placing each word as a row and as
+    the matching column.
+
+    Yields a copy of every completed square, and None whenever
+    budget.charge asks for a progress report. The five words must be
+    distinct; each of them is both an across and a down entry.
+    """
+    if row == grid.size:
+        yield copy.deepcopy(grid)
+        return
+
+    if budget.charge(grid, row):
+        yield None
+
+    for word in _square_candidates(grid, row, trie, cursors):
+        bit = word_bit(word, trie)
+        if used & bit:
+            continue
+
+        grid.place_word(word, row)
+        grid.place_down_word(word, row)
+        next_cursors = None
+        if cursors is not None:
+            next_cursors = [None] * (row + 1) + [cursors[col].children[word[col]]
+                                                 for col in range(row + 1, grid.size)]
+        yield from _extend_square(grid, row + 1, used | bit, trie, budget, next_cursors)
+
+    for index in range(row, grid.size):
+        grid.clear_cell(row, index)
+        grid.clear_cell(index, row)
+
+
+def _start_square(seed_word: str, trie: WordTrie,
+                  budget: SearchBudget) -> Iterator[Optional[Grid]]:
+    """Start a word-square search with the seed as row and column 0."""
+    grid = Grid()
+    grid.place_word(seed_word, 0)
+    grid.place_down_word(seed_word, 0)
+
+    cursors = column_cursors(grid, 1, trie)
+    if cursors is not None and None in cursors:
+        return
+    yield from _extend_square(grid, 1, word_bit(seed_word, trie), trie, budget, cursors)
+
+
+def iter_word_squares(seed_word: str, trie: WordTrie,
+                      max_nodes: Optional[int] = None) -> Iterator[Grid]:
+    """
+    Lazily yield every word square whose first row (and column) is ``seed_word``.
+
+    In a word square row i equals column i, so each placed row also fixes
+    its column and only five words are chosen instead of ten; row i's
+    first i letters are already fixed by the columns above it.
+
+    Args:
+        seed_word: The 5-letter word in row 0
+        trie: Dictionary to fill from
+        max_nodes: Optional limit on the number of expanded search nodes
+
+    Yields:
+        Completed squares with five distinct words, in search order
+
+    Raises:
+        SearchBudgetExceeded: If the search expands more than max_nodes nodes
+    """
+    for grid in _start_square(seed_word.upper(), trie, SearchBudget(max_nodes)):
+        if grid is not None:
+            yield grid
+
+
+def generate_word_square(seed_word: str, trie: WordTrie,
+                         max_nodes: Optional[int] = None) -> Optional[Grid]:
+    """
+    Generate a word square (row i equals column i) whose first row is ``seed_word``.
+
+    Args:
+        seed_word: The 5-letter word in row 0
+        trie: Dictionary to fill from
+        max_nodes: Optional limit on the number of expanded search nodes
+
+    Returns:
+        The first square found, or None if none exists
+
+    Raises:
+        SearchBudgetExceeded: If the search expands more than max_nodes nodes
+    """
+    return next(iter_word_squares(seed_word, trie, max_nodes), None)
+
+
+def generate_all_word_squares(seed_word: str, trie: WordTrie) -> List[Grid]:
+    """Generate every word square whose first row is ``seed_word``."""
+    return list(iter_word_squares(seed_word, trie))
+
+
+async def generate_word_square_async(seed_word: str, trie: WordTrie,
+                                     max_nodes: Optional[int] = None,
+                                     yield_every: int = 1000,
+                                     progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+                                     cancelled: Optional[Callable[[], bool]] = None) -> Optional[Grid]:
+    """
+    Cooperative version of generate_word_square; pauses, progress reports
+    and cancellation work as in generate_puzzle_async.
+
+    Returns:
+        The first square found, or None if none exists
+
+    Raises:
+        SearchBudgetExceeded: If the search expands more than max_nodes nodes
+        SearchCancelled: If ``cancelled`` returned True
+    """
+    budget = SearchBudget(max_nodes, report_every=yield_every)
+    search = _start_square(seed_word.upper(), trie, budget)
+    try:
+        for grid in search:
+            if grid is not None:
+                return grid
+
+            if progress is not None:
+                progress(budget.get_progress())
+            if cancelled is not None and cancelled():
+                raise SearchCancelled(f"Search cancelled after {budget.nodes} nodes")
+            await asyncio.sleep(0)
+    finally:
+        search.close()
+    return None
+
+
+def _scan_slots(grid: Grid, slots: List[Tuple[Direction, int]],
+                pinned: Set[Tuple[Direction, int]], trie: WordTrie
+                ) -> Optional[Tuple[int, List[str], List[Tuple[Tuple[Direction, int], str]]]]:
+    """
+    Check the complete slots of ``grid`` and collect the open ones.
+
+    Every complete slot must hold a distinct dictionary word, except pinned
+    slots, which the caller filled and which are only required to be
+    distinct.
+
+    Returns:
+        (used, words, open_slots): the bitset of the complete dictionary
+        words, every complete slot's word, and each open slot with its
+        pattern; None if a complete slot breaks the rules
+    """
+    used = 0
+    # Pinned entries that are not dictionary words have no bit to claim
+    pinned_words = set()
+    words = []
+    open_slots = []
+    for slot in slots:
+        pattern = slot_pattern(grid, slot)
+        if '?' in pattern:
+            open_slots.append((slot, pattern))
+            continue
+
+        bit = word_bit(pattern, trie)
+        if not bit:
+            if slot not in pinned or pattern in pinned_words:
+                return None
+            pinned_words.add(pattern)
+        elif used & bit:
+            return None
+        used |= bit
+        words.append(pattern)
+    return used, words, open_slots
+
+
+def _most_constrained_slot(open_slots: List[Tuple[Tuple[Direction, int], str]],
+                           trie: WordTrie) -> Optional[Tuple[Tuple[Direction, int], List[str]]]:
+    """
+    Forward check every open slot and pick the one with the fewest words.
+
+    Enumeration stops once a slot is known not to beat the current best.
+
+    Returns:
+        (slot, words) for the most constrained slot, or None if some open
+        slot has no matching word
+    """
+    best_slot = None
+    best_words = None
+    for slot, pattern in open_slots:
+        limit = None if best_words is None else len(best_words)
+        words = list(trie.iter_words_with_pattern(pattern, limit=limit, normalized=True))
+        if not words:
+            return None
+        if best_words is None or len(words) < len(best_words):
+            best_slot, best_words = slot, words
+    return best_slot, best_words
+
+
+def _branch_on_slot(grid: Grid, slot: Tuple[Direction, int], words: List[str], used: int,
+                    trie: WordTrie, fill: Callable[[], bool]) -> bool:
+    """
+    Try each word not in ``used`` in ``slot`` and call ``fill`` to search on.
+
+    Returns True as soon as ``fill`` does, leaving that word in the grid;
+    otherwise the slot's empty cells are cleared again and False returned.
+    """
+    empty_cells = [(row, col) for row, col in slot_cells(grid.size, slot)
+                   if grid.is_empty(row, col)]
+    for word in words:
+        if used & word_bit(word, trie):
+            continue
+
+        for row, col in empty_cells:
+            letter = word[col] if slot[0] is Direction.ACROSS else word[row]
+            grid.set_cell(row, col, letter)
+
+        if fill():
+            return True
+
+        for row, col in empty_cells:
+            grid.clear_cell(row, col)
+
+    return False
+
+
+def _fill_slots(grid: Grid, slots: List[Tuple[Direction, int]],
+                pinned: Set[Tuple[Direction, int]], trie: WordTrie) -> bool:
+    """
+    Fill the open slots of ``grid`` in place, most constrained slot first.
+
+    Complete slots follow the rules of _scan_slots. Returns True if the
+    grid was completed.
+    """
+    scan = _scan_slots(grid, slots, pinned, trie)
+    if scan is None:
+        return False
+    used, _, open_slots = scan
+    if not open_slots:
+        return True
+
+    best = _most_constrained_slot(open_slots, trie)
+    if best is None:
+        return False
+    return _branch_on_slot(grid, best[0], best[1], used, trie,
+                           lambda: _fill_slots(grid, slots, pinned, trie))
+
+
+def generate_puzzle_from_grid(grid: Grid, trie: WordTrie) -> Optional[Grid]:
+    """
+    Complete a grid whose cells may be pre-filled anywhere.
+
+    Cells can be fixed in any row or column, including whole words in
+    several slots. The search always branches on the open slot with the
+    fewest matching words, so it starts from the most constrained region
+    of the grid rather than from row 1. Slots that are already complete
+    are kept as given even if they are not in the dictionary; every slot
+    the search completes must be a dictionary word, and all ten entries
+    must be distinct.
+
+    Args:
+        grid: Partially filled grid (left unchanged)
+        trie: Dictionary to fill from
+
+    Returns:
+        A completed copy of the grid, or None if no fill exists
+    """
+    grid = copy.deepcopy(grid)
+    slots = ([(Direction.ACROSS, row) for row in range(grid.size)] +
+             [(Direction.DOWN, col) for col in range(grid.size)])
+    pinned = {slot for slot in slots if '?' not in slot_pattern(grid, slot)}
+
+    if _fill_slots(grid, slots, pinned, trie):
+        return grid
+    return None
+
+
+def generate_puzzle_with_words(trie: WordTrie, acrosses: Optional[Dict[int, str]] = None,
+                               downs: Optional[Dict[int, str]] = None) -> Optional[Grid]:
+    """
+    Complete a grid with words pinned in any across and down slots.
+
+    Args:
+        trie: Dictionary to fill from
+        acrosses: Mapping of row index to the word pinned in that row
+        downs: Mapping of column index to the word pinned in that column
+
+    Returns:
+        A completed grid, or None if no fill exists
+
+    Raises:
+        ValueError: If a pinned word has the wrong length or two pinned
+            words disagree on a shared cell
+    """
+    grid = Grid()
+    slots = ([(Direction.ACROSS, row, word) for row, word in (acrosses or {}).items()] +
+             [(Direction.DOWN, col, word) for col, word in (downs or {}).items()])
+
+    for direction, index, word in slots:
+        word = word.strip().upper()
+        if len(word) != grid.size:
+            raise ValueError(f"Pinned word must have {grid.size} letters: {word}")
+
+        for (row, col), letter in zip(slot_cells(grid.size, (direction, index)), word):
+            existing = grid.get_cell(row, col)
+            if existing and existing != letter:
+                raise ValueError(f"{word} conflicts with {existing} at row {row}, column {col}")
+            grid.set_cell(row, col, letter)
+
+    return generate_puzzle_from_grid(grid, trie)
+
+
+class ThemeIndex:
+    """
+    Theme-membership index: the theme words usable in a dictionary's grids.
+
+    Theme words of the wrong length or missing from the dictionary can
+    never be placed, so they are dropped up front (and listed in
+    ``skipped``). The remaining words go into a small trie of their own,
+    so checking whether a partly filled slot can still hold a theme word
+    costs a walk over a few dozen words instead of the whole dictionary.
+    When the dictionary has a query cache, that trie gets one too.
+    """
+
+    def __init__(self, words: Iterable[str], trie: WordTrie, size: int = 5):
+        """
+        Args:
+            words: Theme words, e.g. word_lists.get_themed_words('food')
+            trie: Dictionary the puzzles are filled from
+            size: Grid size (the length of every entry)
+        """
+        words = {word.strip().upper() for word in words if word.strip()}
+        self.words = sorted(word for word in words
+                            if len(word) == size and trie.search(word))
+        self.skipped = sorted(words.difference(self.words))
+        self.trie = WordTrie()
+        for word in self.words:
+            self.trie.insert(word)
+        if isinstance(trie, WordTrie) and trie.query_cache is not None:
+            self.trie.enable_query_cache(trie.query_cache.max_size)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, word: str) -> bool:
+        return self.trie.search(word)
+
+    def matches(self, pattern: str) -> List[str]:
+        """Get the theme words that fit a slot pattern ('?' for empty cells)."""
+        return list(self.trie.iter_words_with_pattern(pattern, normalized=True))
+
+    def count(self, grid: Grid) -> int:
+        """Count the distinct theme words among a grid's entries."""
+        entries = grid.get_acrosses() + [grid.get_column(col) for col in range(grid.size)]
+        return len({word for word in entries if word in self})
+
+
+class _ThemedSearch:
+    """State of one theme-constrained slot search."""
+
+    def __init__(self, theme: ThemeIndex, min_theme_words: int, maximize: bool,
+                 budget: SearchBudget):
+        self.theme = theme
+        self.maximize = maximize
+        self.budget = budget
+        # A grid must beat best_count; without maximize it only has to reach the quota
+        self.best_count = min_theme_words - 1
+        self.best_grid: Optional[Grid] = None
+
+
+def _fill_themed_slots(grid: Grid, slots: List[Tuple[Direction, int]],
+                       pinned: Set[Tuple[Direction, int]], trie: WordTrie,
+                       search: _ThemedSearch,
+                       plain: FrozenSet[Tuple[Direction, int]] = frozenset()) -> bool:
+    """
+    Fill the open slots of ``grid`` in place so it holds enough theme words.
+
+    Works like _fill_slots, with two additions. A grid is pruned when the
+    theme words already placed plus one per open slot that can still hold
+    an unused theme word cannot reach the target. While the target is not
+    reached, the search branches on the theme-compatible slot with the
+    fewest theme words: first on each of those words, then on leaving the
+    slot to ordinary words (``plain`` slots no longer count towards the
+    bound), which keeps the branching factor down to the theme's size.
+
+    Returns True once the search is finished: a grid reaching the quota was
+    found, or (when maximizing) one holding as many theme words as possible.
+    """
+    scan = _scan_slots(grid, slots, pinned, trie)
+    if scan is None:
+        return False
+    used, complete, open_slots = scan
+    search.budget.charge(grid, len(complete), complete)
+    theme = search.theme
+    placed = {word for word in complete if word in theme}
+
+    # Upper bound on the theme words any completion can hold
+    target = search.best_count + 1
+    theme_slots = []
+    for slot, pattern in open_slots:
+        if slot in plain:
+            continue
+        words = [word for word in theme.matches(pattern) if word not in placed]
+        if words:
+            theme_slots.append((slot, words))
+    if len(placed) + min(len(theme_slots), len(theme) - len(placed)) < target:
+        return False
+
+    if not open_slots:
+        search.best_count = len(placed)
+        search.best_grid = copy.deepcopy(grid)
+        # Keep improving when maximizing, unless every entry is a theme word
+        return not search.maximize or len(placed) == len(slots)
+
+    best = _most_constrained_slot(open_slots, trie)
+    if best is None:
+        return False
+    best_slot, best_words = best
+
+    theme_branch = len(placed) < target and theme_slots and len(best_words) > 1
+    if theme_branch:
+        best_slot, best_words = min(theme_slots, key=lambda item: len(item[1]))
+
+    if _branch_on_slot(grid, best_slot, best_words, used, trie,
+                       lambda: _fill_themed_slots(grid, slots, pinned, trie, search, plain)):
+        return True
+    if theme_branch:
+        return _fill_themed_slots(grid, slots, pinned, trie, search, plain | {best_slot})
+    return False
+
+
+def generate_themed_puzzle(trie: WordTrie, theme: Any, min_theme_words: int = 1,
+                           grid: Optional[Grid] = None, maximize: bool = False,
+                           max_nodes: Optional[int] = None) -> Optional[Grid]:
+    """
+    Generate a puzzle containing at least ``min_theme_words`` theme words.
+
+    Theme words count once each, whether placed across or down. With
+    ``maximize`` the search continues past the first such grid and returns
+    one with as many theme words as possible (branch and bound on the best
+    count found so far).
+
+    Args:
+        trie: Dictionary to fill from (theme words must be in it)
+        theme: A ThemeIndex, or theme words such as
+            word_lists.get_themed_words('food')
+        min_theme_words: Required number of theme words
+        grid: Optional partially filled grid to complete, as for
+            generate_puzzle_from_grid (left unchanged)
+        maximize: Return a grid with the most theme words instead of the first
+        max_nodes: Optional limit on the number of expanded nodes
+
+    Returns:
+        A completed grid, or None if no grid holds enough theme words
+
+    Raises:
+        SearchBudgetExceeded: If the search expands more than ``max_nodes``
+            nodes before finding a grid; when maximizing, the best grid
+            found so far is returned instead once there is one
+    """
+    grid = copy.deepcopy(grid) if grid is not None else Grid()
+    if not isinstance(theme, ThemeIndex):
+        theme = ThemeIndex(theme, trie, grid.size)
+
+    slots = ([(Direction.ACROSS, row) for row in range(grid.size)] +
+             [(Direction.DOWN, col) for col in range(grid.size)])
+    pinned = {slot for slot in slots if '?' not in slot_pattern(grid, slot)}
+    search = _ThemedSearch(theme, min_theme_words, maximize, SearchBudget(max_nodes))
+
+    try:
+        _fill_themed_slots(grid, slots, pinned, trie, search)
+    except SearchBudgetExceeded:
+        if not maximize or search.best_grid is None:
+            raise
+    return search.best_grid
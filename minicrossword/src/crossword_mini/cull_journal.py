@@ -0,0 +1,244 @@
+"""
+Append-only journal of the keep/discard decisions made with cull-words.py.
+
+Each decision is one line, ``+WORD`` to keep or ``-WORD`` to discard,
+appended and fsynced as it is made, so saving costs one short write per
+decision and a crash loses at most the line being written. Lines end with
+``\n`` only; the file is read and written without newline translation, so
+a word may contain any other character. When a word is
+decided more than once the last line wins. A torn last line (no trailing
+newline) is ignored on load and cut off before the next append.
+
+The journal is compacted into one line per word once it holds many
+superseded lines, and on close if it holds any. Compaction writes a
+temporary file, fsyncs it and renames it over the journal, so the journal
+on disk is always either the old or the new version.
+
+State files written by older versions of cull-words.py (a JSON object with
+``kept`` and ``discarded`` lists) are read as well and converted to the
+journal format on the first compaction.
+"""
+
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+KEEP_MARK = '+'
+DISCARD_MARK = '-'
+
+
+def _parse_lines(data: str) -> Tuple[Dict[str, bool], int, int]:
+    """
+    Replay journal text.
+
+    Returns:
+        (decisions, entries, valid_length): word -> kept flag, the number of
+        complete lines and the length of the text up to the last one
+    """
+    decisions: Dict[str, bool] = {}
+    entries = 0
+    valid_length = data.rfind('\n') + 1
+    for line in data[:valid_length].split('\n'):
+        if len(line) < 2 or line[0] not in (KEEP_MARK, DISCARD_MARK):
+            continue
+        decisions[line[1:]] = line[0] == KEEP_MARK
+        entries += 1
+    return decisions, entries, valid_length
+
+
+def _is_legacy_state(data: str) -> bool:
+    """Check whether file contents are an old JSON state object."""
+    return data.lstrip().startswith('{')
+
+
+def _legacy_decisions(data: str) -> Dict[str, bool]:
+    """Read the decisions of an old JSON state object."""
+    state = json.loads(data)
+    decisions = {word: True for word in state.get('kept', [])}
+    decisions.update((word, False) for word in state.get('discarded', []))
+    return decisions
+
+
+def read_journal(path: str) -> Dict[str, bool]:
+    """
+    Read the final decision for every word in a journal or legacy state file.
+
+    Args:
+        path: Journal (or JSON state) file
+
+    Returns:
+        Mapping of word to True if kept, False if discarded
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        ValueError: If a legacy JSON state file is malformed
+    """
+    with open(path, 'r', encoding='utf-8', newline='\n') as f:
+        if _is_legacy_state(f.read(256)):
+            f.seek(0)
+            return _legacy_decisions(f.read())
+
+        # Replay line by line; only the final decision per word is kept in memory
+        f.seek(0)
+        decisions: Dict[str, bool] = {}
+        for line in f:
+            if not line.endswith('\n'):
+                break
+            if len(line) > 2 and line[0] in (KEEP_MARK, DISCARD_MARK):
+                decisions[line[1:-1]] = line[0] == KEEP_MARK
+        return decisions
+
+
+def kept_words(decisions: Dict[str, bool]) -> List[str]:
+    """Get the kept words of a set of decisions (as read by read_journal), sorted."""
+    return sorted(word for word, kept in decisions.items() if kept)
+
+
+class CullJournal:
+    """
+    Keep/discard decisions backed by an append-only, crash-safe journal file.
+    """
+
+    def __init__(self, path: str, compact_ratio: float = 2.0, min_compact_entries: int = 1000):
+        """
+        Open a journal, creating it if missing.
+
+        Args:
+            path: Journal file (an old JSON state file is converted)
+            compact_ratio: Compact once the journal holds this many lines
+                per decided word
+            min_compact_entries: Never compact automatically below this many lines
+
+        Raises:
+            ValueError: If a legacy JSON state file is malformed
+        """
+        self.path = path
+        self.compact_ratio = compact_ratio
+        self.min_compact_entries = min_compact_entries
+        self.decisions: Dict[str, bool] = {}
+        self.entries = 0
+        self.file = None
+
+        needs_rewrite = False
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8', newline='\n') as f:
+                data = f.read()
+
+            if _is_legacy_state(data):
+                self.decisions = _legacy_decisions(data)
+                needs_rewrite = True
+            else:
+                self.decisions, self.entries, valid_length = _parse_lines(data)
+                if valid_length < len(data):
+                    # Drop a torn line left by a crash before appending again
+                    with open(path, 'r+', encoding='utf-8', newline='\n') as f:
+                        f.truncate(len(data[:valid_length].encode('utf-8')))
+
+        if needs_rewrite:
+            self.compact()
+        else:
+            self.file = open(path, 'a', encoding='utf-8', newline='\n')
+            self._maybe_compact()
+
+    def __enter__(self) -> 'CullJournal':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.decisions)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.decisions
+
+    @property
+    def kept(self) -> List[str]:
+        """Kept words, sorted."""
+        return kept_words(self.decisions)
+
+    @property
+    def discarded(self) -> List[str]:
+        """Discarded words, sorted."""
+        return sorted(word for word, kept in self.decisions.items() if not kept)
+
+    def keep(self, word: str) -> None:
+        """Durably record that a word is kept."""
+        self.record(word, True)
+
+    def discard(self, word: str) -> None:
+        """Durably record that a word is discarded."""
+        self.record(word, False)
+
+    def record(self, word: str, kept: bool) -> None:
+        """
+        Append one decision and fsync it before returning.
+
+        Args:
+            word: The word decided on
+            kept: True to keep the word, False to discard it
+
+        Raises:
+            ValueError: If the word is empty or spans several lines
+        """
+        if not word or '\n' in word:
+            raise ValueError(f"Cannot record word {word!r}")
+
+        self.file.write((KEEP_MARK if kept else DISCARD_MARK) + word + '\n')
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.decisions[word] = kept
+        self.entries += 1
+        self._maybe_compact()
+
+    def _maybe_compact(self) -> None:
+        """Compact when superseded lines make up too much of the journal."""
+        if (self.entries >= self.min_compact_entries
+                and self.entries > self.compact_ratio * len(self.decisions)):
+            self.compact()
+
+    def compact(self) -> None:
+        """Atomically rewrite the journal with one line per decided word."""
+        if self.file is not None:
+            self.file.close()
+
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8', newline='\n') as f:
+            for word in self.kept:
+                f.write(KEEP_MARK + word + '\n')
+            for word in self.discarded:
+                f.write(DISCARD_MARK + word + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        self._fsync_directory()
+
+        self.entries = len(self.decisions)
+        self.file = open(self.path, 'a', encoding='utf-8', newline='\n')
+
+    def _fsync_directory(self) -> None:
+        """Make the rename durable; skipped where directories cannot be opened."""
+        try:
+            fd = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    def close(self, compact: Optional[bool] = None) -> None:
+        """
+        Close the journal.
+
+        Args:
+            compact: Compact before closing (default: only if any line is superseded)
+        """
+        if self.file is None:
+            return
+        if compact or (compact is None and self.entries > len(self.decisions)):
+            self.compact()
+        self.file.close()
+        self.file = None
@@ -0,0 +1,100 @@
+"""
+Minimal word automaton (DAWG) built from a WordTrie.
+
+Two trie nodes fall into the same DAWG state when exactly the same set of
+suffixes completes them to a word. During row-by-row search the remaining
+subproblem only depends on those suffix sets, so DAWG states are a compact,
+shareable key for memoizing search results.
+"""
+
+from typing import Dict, List, Optional
+from .sharded_trie import ShardedWordTrie
+from .word_trie import WordTrie
+
+
+class WordDawg:
+    """
+    Minimized deterministic automaton accepting exactly the words of a trie.
+
+    States are dense integers. ``edges[state]`` maps a letter to the next
+    state and ``is_final[state]`` says whether the letters read so far form
+    a word.
+    """
+
+    def __init__(self, trie: WordTrie):
+        """
+        Build the automaton in one iterative post-order pass over the trie.
+
+        A ShardedWordTrie has every pending shard loaded first, since the
+        pass walks the nodes directly and would miss unloaded words.
+
+        Args:
+            trie: The trie to minimize (later inserts are not reflected)
+        """
+        if isinstance(trie, ShardedWordTrie):
+            trie.load_all()
+        self.edges: List[Dict[str, int]] = []
+        self.is_final: List[bool] = []
+        self._suffix_counts: Optional[List[int]] = None
+        registry = {}
+        state_of = {}
+
+        stack = [(trie.root, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if not children_done:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.children.values())
+                continue
+
+            edges = {char: state_of[child] for char, child in node.children.items()}
+            signature = (node.is_end_of_word, tuple(sorted(edges.items())))
+            state = registry.get(signature)
+            if state is None:
+                state = len(self.edges)
+                registry[signature] = state
+                self.edges.append(edges)
+                self.is_final.append(node.is_end_of_word)
+            state_of[node] = state
+
+        self.root = state_of[trie.root]
+
+    @property
+    def state_count(self) -> int:
+        """Number of states in the automaton."""
+        return len(self.edges)
+
+    @property
+    def suffix_counts(self) -> List[int]:
+        """
+        Number of suffixes each state accepts, i.e. how many words can still
+        be completed from it (computed on first use).
+        """
+        if self._suffix_counts is None:
+            # States are numbered after their children, so one forward pass suffices
+            counts: List[int] = []
+            for edges, final in zip(self.edges, self.is_final):
+                counts.append(int(final) + sum(counts[state] for state in edges.values()))
+            self._suffix_counts = counts
+        return self._suffix_counts
+
+    def walk(self, prefix: str, state: Optional[int] = None) -> Optional[int]:
+        """
+        Follow a prefix from ``state`` (default: the root).
+
+        Args:
+            prefix: Uppercase letters to follow
+            state: State to start from
+
+        Returns:
+            The state reached, or None if no word continues with the prefix
+        """
+        if state is None:
+            state = self.root
+
+        for char in prefix:
+            state = self.edges[state].get(char)
+            if state is None:
+                return None
+
+        return state
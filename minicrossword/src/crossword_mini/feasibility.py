@@ -0,0 +1,178 @@
+"""
+Fast-fail feasibility checks for seed words.
+
+A seed with no fill costs a full exhaustive search before generate_puzzle
+can report failure. SeedOracle answers first, from cheap necessary
+conditions and an optional precomputed table of seeds proven to have no
+fill, so most impossible seeds are rejected without searching. Its
+verdicts are reported separately from the search: "infeasible" is a
+proof, and everything else is "unknown" and still needs the search.
+"""
+
+import json
+from typing import Any, Dict, Iterable, List, Optional, Set
+from .crossword_generator import NogoodTable, SearchBudgetExceeded, generate_puzzle
+from .word_trie import WordTrie
+
+GRID_SIZE = 5
+
+INFEASIBLE = 'infeasible'
+UNKNOWN = 'unknown'
+
+
+def load_seed_table(path: str) -> Set[str]:
+    """
+    Read a seed table written by write_seed_table.
+
+    Returns:
+        The seeds proven to have no fill
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return seed_table_from_json(json.load(f))
+
+
+def seed_table_from_json(data: Dict[str, List[str]]) -> Set[str]:
+    """Convert a table's JSON object (an ``infeasible`` list) to a set of seeds."""
+    return set(data.get('infeasible', []))
+
+
+def write_seed_table(path: str, table: Iterable[str]) -> None:
+    """
+    Write a seed table as a JSON object with a sorted ``infeasible`` list.
+
+    Only infeasible seeds are stored: a seed with a fill still needs the
+    search to find it, so listing those would only make the file, which
+    the browser fetches at startup, as large as the dictionary.
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'infeasible': sorted(table)}, f)
+
+
+class SeedOracle:
+    """
+    Rejects seed words that provably have no fill, without searching.
+
+    Necessary conditions checked, in order:
+
+    - the seed has 5 letters and is not excluded by the table;
+    - each seed letter starts some 5-letter word (its column's down word);
+    - every later row has a word, other than the seed, whose letters are
+      each allowed at that depth by the down words of their column.
+
+    The letters each column allows at each depth are computed once per
+    starting letter and cached, so after warm-up a check is five small
+    letter-set queries. With a ShardedWordTrie only the shards of the
+    seed's letters are loaded, the same ones the search would load.
+    """
+
+    def __init__(self, trie: WordTrie, table: Optional[Iterable[str]] = None):
+        """
+        Args:
+            trie: Dictionary the seeds are filled from
+            table: Optional seeds proven to have no fill in this dictionary
+                (see build_seed_table)
+        """
+        self.trie = trie
+        self.table = set(table or ())
+        self._depth_letters: Dict[str, List[Set[str]]] = {}
+        self.stats = {'checked': 0, 'rejected': 0, 'table_hits': 0}
+
+    def _letters_below(self, letter: str) -> List[Set[str]]:
+        """Letters the down words starting with ``letter`` allow at each depth."""
+        depth_letters = self._depth_letters.get(letter)
+        if depth_letters is None:
+            depth_letters = [set() for _ in range(GRID_SIZE)]
+            for word in self.trie.iter_words_with_prefix(letter, normalized=True):
+                if len(word) == GRID_SIZE:
+                    for depth, char in enumerate(word):
+                        depth_letters[depth].add(char)
+            self._depth_letters[letter] = depth_letters
+        return depth_letters
+
+    def check(self, seed_word: str) -> Dict[str, Any]:
+        """
+        Decide a seed without searching, where possible.
+
+        Args:
+            seed_word: Word for the first row
+
+        Returns:
+            Dict with ``seed``, ``verdict`` (INFEASIBLE or UNKNOWN) and
+            ``reason``, a short explanation
+        """
+        seed = seed_word.upper().strip()
+        self.stats['checked'] += 1
+        verdict, reason = self._decide(seed)
+        if verdict == INFEASIBLE:
+            self.stats['rejected'] += 1
+        return {'seed': seed, 'verdict': verdict, 'reason': reason}
+
+    def _decide(self, seed: str) -> tuple:
+        if len(seed) != GRID_SIZE or not seed.isalpha():
+            return INFEASIBLE, f"seed must be {GRID_SIZE} letters"
+
+        if seed in self.table:
+            self.stats['table_hits'] += 1
+            return INFEASIBLE, "listed as infeasible in the seed table"
+
+        columns = [self._letters_below(letter) for letter in seed]
+        for col, letter in enumerate(seed):
+            if not columns[col][0]:
+                return INFEASIBLE, f"no word starts with {letter} for column {col + 1}"
+
+        for row in range(1, GRID_SIZE):
+            letter_sets = [column[row] for column in columns]
+            words = self.trie.iter_words_with_letter_sets(letter_sets, limit=2)
+            if not any(word != seed for word in words):
+                return INFEASIBLE, f"no word fits row {row + 1} under the seed's columns"
+
+        return UNKNOWN, "passed the prechecks"
+
+
+def build_seed_table(trie: WordTrie, seeds: Optional[Iterable[str]] = None,
+                     max_nodes: Optional[int] = 100000) -> List[str]:
+    """
+    Find the seeds with no fill by precheck and full search, for a precomputed table.
+
+    Seeds whose search exceeds ``max_nodes`` are left out, so the table
+    only holds proven verdicts. One NogoodTable is shared by every search.
+
+    Args:
+        trie: Dictionary to fill from
+        seeds: Seeds to decide (default: every 5-letter word in ``trie``)
+        max_nodes: Node limit per search (None for no limit)
+
+    Returns:
+        The seeds proven to have no fill, in the order given
+    """
+    if seeds is None:
+        seeds = list(trie.iter_words_by_length(GRID_SIZE))
+
+    oracle = SeedOracle(trie)
+    nogoods = NogoodTable(trie)
+    table = []
+    for seed in seeds:
+        seed = seed.upper().strip()
+        if oracle.check(seed)['verdict'] == INFEASIBLE:
+            table.append(seed)
+            continue
+        try:
+            if generate_puzzle(seed, trie, nogoods, max_nodes=max_nodes) is None:
+                table.append(seed)
+        except SearchBudgetExceeded:
+            pass
+    return table
+
+
+if __name__ == "__main__":
+    import sys
+    from .word_trie import load_words_from_file
+
+    if len(sys.argv) not in (3, 4):
+        print("Usage: python3 -m src.crossword_mini.feasibility <words.txt> <seeds.json> [max_nodes]")
+        sys.exit(1)
+
+    node_limit = int(sys.argv[3]) if len(sys.argv) == 4 else 100000
+    seed_table = build_seed_table(load_words_from_file(sys.argv[1]), max_nodes=node_limit)
+    write_seed_table(sys.argv[2], seed_table)
+    print(f"Wrote {len(seed_table)} infeasible seeds to {sys.argv[2]}")
@@ -30,6 +30,11 @@ class Grid:
             return self.grid[row][col]
         return ''
 
+    def clear_cell(self, row: int, col: int) -> None:
+        """Empty the cell at the specified position."""
+        if 0 <= row < self.size and 0 <= col < self.size:
+            self.grid[row][col] = ''
+
     def is_empty(self, row: int, col: int) -> bool:
         """Check if a cell is empty."""
         return self.get_cell(row, col) == ''
@@ -76,6 +81,11 @@ class Grid:
         for col, letter in enumerate(word):
             self.set_cell(row, col, letter)
 
+    def place_down_word(self, word: str, col: int):
+        word = word.upper()
+        for row, letter in enumerate(word):
+            self.set_cell(row, col, letter)
+
     def get_acrosses(self) -> List[str]:
         acrosses = []
         for row in range(self.size):
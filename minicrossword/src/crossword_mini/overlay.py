@@ -0,0 +1,176 @@
+"""
+Dictionary overlays: compose shared base tries with include/exclude layers.
+"""
+
+from typing import Iterable, Iterator, List, Optional, Set
+from .cull_journal import read_journal
+from .word_trie import TrieNode, WordTrie
+
+
+def read_word_list(filepath: str) -> List[str]:
+    """Read a word list file (one word per line), skipping blank lines."""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def read_discarded_words(state_file: str) -> List[str]:
+    """Read the words discarded in a cull-words.py state file (journal or old JSON)."""
+    return sorted(word for word, kept in read_journal(state_file).items() if not kept)
+
+
+class OverlayDictionary:
+    """
+    Read-only view combining several WordTries with include/exclude layers.
+
+    The base tries are shared, never copied, so building an overlay only
+    costs a small trie for the included words and a set of the excluded
+    ones. Queries are answered by the bases in order, with duplicates
+    dropped and excluded words filtered out; exclusions win over both the
+    bases and the include layer.
+
+    An overlay supports the query methods the generators use, so it can be
+    passed anywhere a WordTrie is expected. The bases should not be
+    modified while an overlay over them is in use.
+    """
+
+    def __init__(self, bases: List[WordTrie], include: Optional[Iterable[str]] = None,
+                 exclude: Optional[Iterable[str]] = None):
+        """
+        Args:
+            bases: Base dictionaries, in priority order
+            include: Extra words to add on top of the bases
+            exclude: Words to hide from the bases and the include layer
+        """
+        self.bases = list(bases)
+        self.excluded = set(word.strip().upper() for word in (exclude or []))
+
+        self.included = WordTrie()
+        for word in include or []:
+            self.included.insert(word)
+
+        self.sources = self.bases + [self.included]
+        # A single base with no included words cannot produce duplicates
+        self.needs_dedupe = len(self.bases) + (1 if self.included.word_count else 0) > 1
+
+        self._word_count = None
+        self._merged = None
+
+    @property
+    def word_count(self) -> int:
+        """Number of distinct words visible through the overlay."""
+        if self._word_count is None:
+            self._word_count = sum(1 for _ in self.iter_words_with_prefix('', normalized=True))
+        return self._word_count
+
+    @property
+    def root(self) -> TrieNode:
+        """
+        Root of a merged trie of the visible words.
+
+        Only structure-walking features such as WordDawg need this; the
+        merged trie is built on first access and then reused.
+        """
+        if self._merged is None:
+            self._merged = WordTrie()
+            for word in self.iter_words_with_prefix('', normalized=True):
+                self._merged.insert(word)
+        return self._merged.root
+
+    def search(self, word: str) -> bool:
+        """Check if a word is visible through the overlay."""
+        return self.get_word_id(word) is not None
+
+    def starts_with(self, prefix: str) -> bool:
+        """Check if any visible word starts with the given prefix."""
+        for _ in self.iter_words_with_prefix(prefix, limit=1):
+            return True
+        return False
+
+    def get_word_id(self, word: str) -> Optional[int]:
+        """
+        Get a word's ID from the first source that has it.
+
+        Source IDs are interleaved (source ID times the number of sources,
+        plus the source's position), so they stay unique even while a
+        lazily loaded base such as a ShardedWordTrie is still growing.
+
+        Returns:
+            The word's ID, or None if the word is missing or excluded
+        """
+        word = word.upper().strip()
+        if word in self.excluded:
+            return None
+
+        for index, source in enumerate(self.sources):
+            word_id = source.get_word_id(word)
+            if word_id is not None:
+                return word_id * len(self.sources) + index
+
+        return None
+
+    def get_words_with_prefix(self, prefix: str) -> List[str]:
+        return list(self.iter_words_with_prefix(prefix))
+
+    def get_words_by_length(self, length: int) -> List[str]:
+        return list(self.iter_words_by_length(length))
+
+    def get_words_with_pattern(self, pattern: str, wildcard: str = '?') -> List[str]:
+        return list(self.iter_words_with_pattern(pattern, wildcard))
+
+    def iter_words_with_prefix(self, prefix: str, limit: Optional[int] = None,
+                               normalized: bool = False) -> Iterator[str]:
+        if not normalized:
+            prefix = prefix.upper().strip()
+        return self._merge(
+            (source.iter_words_with_prefix(prefix, normalized=True) for source in self.sources),
+            limit)
+
+    def iter_words_by_length(self, length: int, limit: Optional[int] = None) -> Iterator[str]:
+        return self._merge(
+            (source.iter_words_by_length(length) for source in self.sources), limit)
+
+    def iter_words_with_pattern(self, pattern: str, wildcard: str = '?',
+                                limit: Optional[int] = None,
+                                normalized: bool = False) -> Iterator[str]:
+        if not normalized:
+            pattern = pattern.upper().strip()
+        return self._merge(
+            (source.iter_words_with_pattern(pattern, wildcard, normalized=True)
+             for source in self.sources),
+            limit)
+
+    def iter_words_with_letter_sets(self, letter_sets: List[Optional[Iterable[str]]],
+                                    limit: Optional[int] = None) -> Iterator[str]:
+        return self._merge(
+            (source.iter_words_with_letter_sets(letter_sets) for source in self.sources), limit)
+
+    def next_letters(self, prefix: str, normalized: bool = False) -> Set[str]:
+        """Get the letters that continue a prefix in at least one visible word."""
+        if not normalized:
+            prefix = prefix.upper().strip()
+        depth = len(prefix)
+        # Read from the visible words, so letters only reached through excluded words are left out
+        return {word[depth] for word in self.iter_words_with_prefix(prefix, normalized=True)
+                if len(word) > depth}
+
+    def _merge(self, results: Iterable[Iterator[str]], limit: Optional[int]) -> Iterator[str]:
+        """Chain per-source results, dropping excluded and repeated words."""
+        if limit == 0:
+            return
+
+        excluded = self.excluded
+        seen = set() if self.needs_dedupe else None
+        found = 0
+        for words in results:
+            for word in words:
+                if word in excluded:
+                    continue
+                if seen is not None:
+                    if word in seen:
+                        continue
+                    seen.add(word)
+
+                yield word
+                found += 1
+                if found == limit:
+                    return
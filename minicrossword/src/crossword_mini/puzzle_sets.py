@@ -0,0 +1,198 @@
+"""
+Stored sets of enumerated puzzles, kept up to date across dictionary edits.
+"""
+
+import json
+from typing import Dict, Iterable, List, Set, Tuple
+from .grid import Direction, Grid
+from .row_search import column_cursors, iter_row_fills, slot_cells, word_bit
+from .word_trie import WordTrie
+
+# A stored grid is identified by its across words
+GridKey = Tuple[str, ...]
+
+
+def _grid_from_key(key: GridKey) -> Grid:
+    grid = Grid()
+    for row, word in enumerate(key):
+        grid.place_word(word, row)
+    return grid
+
+
+def dictionary_delta(old_words: Iterable[str], new_words: Iterable[str]) -> Tuple[Set[str], Set[str]]:
+    """
+    Compare two word lists.
+
+    Returns:
+        (added, removed): uppercase words only in ``new_words``, and only in ``old_words``
+    """
+    old = {word.strip().upper() for word in old_words if word.strip()}
+    new = {word.strip().upper() for word in new_words if word.strip()}
+    return new - old, old - new
+
+
+class PuzzleSet:
+    """
+    Every fill of one seed, as generate_all_puzzles enumerates them, with a
+    word-to-grid index so the set can follow dictionary edits.
+
+    The seed row is given and need not be a word; the other nine entries
+    are dictionary words, and all ten are distinct. A removed word can
+    therefore only invalidate the grids that use it in one of those nine
+    entries, which the index lists directly. An added word can only create
+    grids that use it in one of them, so those are found by searching with
+    the word pinned in each slot in turn. The row search only lets a
+    column take letters that can still reach the pinned cells below, so
+    each such search covers a small part of the full one. Either way the
+    work depends on the edit, not on the size of the set.
+    """
+
+    def __init__(self, seed_word: str, grids: Iterable[GridKey] = ()):
+        """
+        Args:
+            seed_word: The word in row 0 of every grid
+            grids: Stored grids, each given as its five across words
+        """
+        self.seed_word = seed_word.strip().upper()
+        self.grids: Set[GridKey] = set()
+        self.index: Dict[str, Set[GridKey]] = {}
+        for key in grids:
+            self._add(tuple(key))
+
+    @classmethod
+    def enumerate(cls, seed_word: str, trie: WordTrie) -> 'PuzzleSet':
+        """Enumerate every fill of a seed from scratch."""
+        puzzles = cls(seed_word)
+        puzzles._search(trie, Grid())
+        return puzzles
+
+    def __len__(self) -> int:
+        return len(self.grids)
+
+    def __contains__(self, grid: Grid) -> bool:
+        return tuple(grid.get_acrosses()) in self.grids
+
+    def get_grids(self) -> List[Grid]:
+        """Get the stored grids, ordered by their across words."""
+        return [_grid_from_key(key) for key in sorted(self.grids)]
+
+    def _entries(self, key: GridKey) -> List[str]:
+        """The nine entries of a grid other than the seed row."""
+        downs = [''.join(word[col] for word in key) for col in range(len(key))]
+        return list(key[1:]) + downs
+
+    def _add(self, key: GridKey) -> None:
+        if key in self.grids:
+            return
+        self.grids.add(key)
+        for word in self._entries(key):
+            self.index.setdefault(word, set()).add(key)
+
+    def _discard(self, key: GridKey) -> None:
+        self.grids.discard(key)
+        for word in self._entries(key):
+            keys = self.index.get(word)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.index[word]
+
+    def _search(self, trie: WordTrie, grid: Grid) -> int:
+        """
+        Add every fill of ``grid`` (with the seed placed in row 0) to the set.
+
+        Returns:
+            Number of grids that were not stored yet
+        """
+        grid.place_word(self.seed_word, 0)
+        cursors = column_cursors(grid, 1, trie)
+        if cursors is not None and None in cursors:
+            return 0
+
+        added = 0
+        for _ in iter_row_fills(grid, 1, word_bit(self.seed_word, trie), trie, cursors):
+            key = tuple(grid.get_acrosses())
+            if key not in self.grids:
+                self._add(key)
+                added += 1
+        return added
+
+    def remove_words(self, words: Iterable[str]) -> int:
+        """
+        Drop the grids that use any of ``words`` outside the seed row.
+
+        Returns:
+            Number of grids dropped
+        """
+        dropped = 0
+        for word in words:
+            for key in list(self.index.get(word.strip().upper(), ())):
+                self._discard(key)
+                dropped += 1
+        return dropped
+
+    def add_words(self, words: Iterable[str], trie: WordTrie) -> int:
+        """
+        Find the grids that use any of ``words`` outside the seed row.
+
+        Args:
+            words: Words newly added to the dictionary
+            trie: The dictionary after the edit (it must contain ``words``)
+
+        Returns:
+            Number of grids added
+        """
+        added = 0
+        for word in words:
+            word = word.strip().upper()
+            if len(word) != len(self.seed_word):
+                continue
+            for slot in [(Direction.ACROSS, row) for row in range(1, len(word))] + \
+                        [(Direction.DOWN, col) for col in range(len(word))]:
+                # The seed fixes the first letter of every down slot
+                if slot[0] is Direction.DOWN and word[0] != self.seed_word[slot[1]]:
+                    continue
+                grid = Grid()
+                for (row, col), letter in zip(slot_cells(grid.size, slot), word):
+                    grid.set_cell(row, col, letter)
+                added += self._search(trie, grid)
+        return added
+
+    def apply_delta(self, trie: WordTrie, added: Iterable[str] = (),
+                    removed: Iterable[str] = ()) -> Tuple[int, int]:
+        """
+        Update the set for a dictionary edit.
+
+        The result equals PuzzleSet.enumerate(seed, trie) for the edited
+        dictionary, provided the set matched the dictionary before the edit.
+
+        Args:
+            trie: The dictionary after the edit
+            added: Words added by the edit
+            removed: Words removed by the edit
+
+        Returns:
+            (grids added, grids dropped)
+        """
+        dropped = self.remove_words(removed)
+        return self.add_words(added, trie), dropped
+
+    def to_json(self) -> dict:
+        """Get a JSON-serializable form: the seed and every grid's across words."""
+        return {'seed': self.seed_word, 'grids': [list(key) for key in sorted(self.grids)]}
+
+    @classmethod
+    def from_json(cls, data: dict) -> 'PuzzleSet':
+        """Rebuild a set (and its index) from to_json output."""
+        return cls(data['seed'], data['grids'])
+
+    def save(self, path: str) -> None:
+        """Write the set to a JSON file."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_json(), f)
+
+    @classmethod
+    def load(cls, path: str) -> 'PuzzleSet':
+        """Read a set written by save."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_json(json.load(f))
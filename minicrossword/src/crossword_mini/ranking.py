@@ -0,0 +1,156 @@
+"""
+Exact top-k puzzles for a seed under a word-score function.
+"""
+
+import copy
+import heapq
+from typing import Callable, Dict, List, Optional, Tuple
+from .crossword_generator import generate_next_word_candidates
+from .grid import Grid
+from .row_search import claim_entries, column_cursors, word_bit
+from .word_trie import TrieNode, WordTrie
+
+GRID_SIZE = 5
+
+
+class PrefixScores:
+    """
+    Best word score reachable from every prefix of a dictionary.
+
+    Built once per dictionary and score function: every word of the grid
+    length is scored once, and each of its prefixes records the highest
+    score among the words extending it. A column whose letters so far are
+    ``prefix`` can therefore add at most best(prefix) to a puzzle's score.
+    """
+
+    def __init__(self, trie: WordTrie, score: Callable[[str], float], length: int = GRID_SIZE):
+        """
+        Args:
+            trie: Dictionary to score
+            score: Word score; a puzzle scores the sum over its ten entries
+            length: Word length to score (the grid size)
+        """
+        self.score = score
+        self.word_scores: Dict[str, float] = {}
+        self.prefix_best: Dict[str, float] = {}
+        for word in trie.iter_words_by_length(length):
+            value = score(word)
+            self.word_scores[word] = value
+            for end in range(length + 1):
+                prefix = word[:end]
+                if prefix not in self.prefix_best or value > self.prefix_best[prefix]:
+                    self.prefix_best[prefix] = value
+
+    def word_score(self, word: str) -> float:
+        """Score a word, using the precomputed value when there is one."""
+        value = self.word_scores.get(word)
+        return self.score(word) if value is None else value
+
+    def best(self, prefix: str) -> Optional[float]:
+        """Get the best score of any word starting with ``prefix`` (None if no word does)."""
+        return self.prefix_best.get(prefix)
+
+
+def _puzzle_key(total: float, grid: Grid) -> Tuple[float, Tuple[int, ...]]:
+    """
+    Heap key ordering puzzles from worst to best.
+
+    Higher totals are better; equal totals are broken by the across words,
+    alphabetically first being better, so the top k is fully determined.
+    """
+    return total, tuple(-ord(char) for char in ''.join(grid.get_acrosses()))
+
+
+def _search_best(grid: Grid, row: int, used: int, total: float, prefixes: List[str],
+                 trie: WordTrie, scores: PrefixScores, k: int, heap: list,
+                 cursors: Optional[List[TrieNode]]) -> None:
+    """
+    Branch and bound over rows ``row`` onwards, keeping the top k in ``heap``.
+
+    ``total`` is the score of the across words placed so far and
+    ``prefixes`` the column prefixes (``cursors`` their trie nodes, as in
+    the generator's search). A subtree is pruned when its bound,
+    the placed across words plus the best completion of each column plus
+    the best possible word for each open row, is below the k-th best.
+    Equal bounds are still searched, since a tie can win on the across words.
+    """
+    if row == grid.size:
+        # Rescore in entry order, so float totals match scoring the finished grid
+        entries = grid.get_acrosses() + prefixes
+        key = _puzzle_key(sum(scores.word_score(entry) for entry in entries), grid)
+        if len(heap) < k:
+            heapq.heappush(heap, (key, copy.deepcopy(grid)))
+        elif key > heap[0][0]:
+            heapq.heapreplace(heap, (key, copy.deepcopy(grid)))
+        return
+
+    candidate_words = generate_next_word_candidates(grid, row, trie, cursors)
+    # Best words first, so good puzzles are found early and prune more
+    candidate_words.sort(key=lambda word: (-scores.word_score(word), word))
+
+    open_rows_bound = (grid.size - row - 1) * scores.best('')
+    for word in candidate_words:
+        word_total = total + scores.word_score(word)
+        next_prefixes = [prefix + char for prefix, char in zip(prefixes, word)]
+        column_bounds = [scores.best(prefix) for prefix in next_prefixes]
+        if None in column_bounds:
+            # Only words of other lengths continue some column
+            continue
+        if len(heap) == k and word_total + open_rows_bound + sum(column_bounds) < heap[0][0][0]:
+            continue
+
+        next_cursors = None
+        if cursors is not None:
+            next_cursors = [node.children[char] for node, char in zip(cursors, word)]
+
+        grid.place_word(word, row)
+        new_used = claim_entries(grid, row, word, used, trie, next_prefixes)
+        if new_used is not None:
+            _search_best(grid, row + 1, new_used, word_total, next_prefixes,
+                         trie, scores, k, heap, next_cursors)
+
+    for col in range(grid.size):
+        grid.clear_cell(row, col)
+
+
+def best_puzzles(seed_word: str, trie: WordTrie, k: int, score: Callable[[str], float],
+                 prefix_scores: Optional[PrefixScores] = None) -> List[Tuple[float, Grid]]:
+    """
+    Find the k highest-scoring puzzles for a seed.
+
+    A puzzle scores the sum of ``score`` over its ten entries, and only
+    puzzles with ten distinct entries count, as in generate_all_puzzles.
+    The result is exactly that of scoring every puzzle from
+    generate_all_puzzles and sorting by score, best first, with ties in
+    alphabetical order of the across words; but the search keeps only a
+    heap of the current top k and skips every subtree whose optimistic
+    bound cannot beat the k-th best.
+
+    Args:
+        seed_word: The word in row 0
+        trie: Dictionary to fill from
+        k: Number of puzzles to return
+        score: Word score function
+        prefix_scores: Precomputed PrefixScores for ``trie`` and ``score``
+            (built if omitted; pass one to rank several seeds)
+
+    Returns:
+        Up to k (score, grid) pairs, best first
+    """
+    seed_word = seed_word.upper().strip()
+    if k <= 0:
+        return []
+    if prefix_scores is None:
+        prefix_scores = PrefixScores(trie, score, len(seed_word))
+
+    # A seed letter that starts no word leaves nothing to search
+    if any(prefix_scores.best(char) is None for char in seed_word):
+        return []
+
+    grid = Grid()
+    grid.place_word(seed_word, 0)
+    heap: list = []
+    _search_best(grid, 1, word_bit(seed_word, trie), prefix_scores.word_score(seed_word),
+                 list(seed_word), trie, prefix_scores, k, heap, column_cursors(grid, 1, trie))
+
+    return [(key[0], grid) for key, grid in sorted(heap, key=lambda item: item[0], reverse=True)]
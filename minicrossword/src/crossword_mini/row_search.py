@@ -0,0 +1,169 @@
+"""
+Building blocks of the row-by-row search, shared by the generator and by
+the modules that run their own searches over it (ranking, puzzle sets).
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from .grid import Direction, Grid
+from .word_trie import TrieNode, WordTrie
+
+
+def column_letter_sets(grid: Grid, row: int, trie: WordTrie,
+                       cursors: Optional[List[TrieNode]] = None) -> List[Iterable[str]]:
+    """
+    Get the letters each column allows in ``row``.
+
+    With cursors (see column_cursors) the letters are read off the column
+    nodes instead of walking each column prefix from the root.
+    """
+    last_row = row == grid.size - 1
+    if cursors is None:
+        column_letters = []
+        for col in range(grid.size):
+            prefix = grid.get_column(col)[:row]
+            letters = trie.next_letters(prefix, normalized=True)
+            if last_row:
+                # The last row must complete every column to a word
+                letters = {char for char in letters if trie.search(prefix + char)}
+            column_letters.append(letters)
+    elif last_row:
+        column_letters = [[char for char, child in node.children.items() if child.is_end_of_word]
+                          for node in cursors]
+    else:
+        column_letters = [node.children.keys() for node in cursors]
+    return column_letters
+
+
+def column_cursors(grid: Grid, row: int, trie: WordTrie) -> Optional[List[Optional[TrieNode]]]:
+    """
+    Find the trie node of each column prefix above ``row``.
+
+    The search then advances these cursors by one child lookup per placed
+    row instead of rebuilding and re-walking every column string. Only
+    WordTrie (and ShardedWordTrie, whose lookup here loads the shards the
+    columns need) exposes its nodes cheaply; for other dictionaries this
+    returns None and the search walks column prefixes as before. A column
+    with no continuation gets None.
+    """
+    if not isinstance(trie, WordTrie):
+        return None
+    return [trie._find_node(grid.get_column(col)[:row]) for col in range(grid.size)]
+
+
+def word_bit(word: str, trie: WordTrie) -> int:
+    """Return the used-word bitset bit for a word (0 for words not in the trie)."""
+    word_id = trie.get_word_id(word)
+    if word_id is None:
+        return 0
+    return 1 << word_id
+
+
+def claim_entries(grid: Grid, row: int, word: str, used: int, trie: WordTrie,
+                  downs: Optional[List[str]] = None) -> Optional[int]:
+    """
+    Claim the entries completed by placing ``word`` in ``row``.
+
+    The across word is always claimed; placing the last row also completes
+    and claims every down word (read from the grid unless the caller passes
+    them as ``downs``). Each claim is a single bit test against ``used``,
+    a bitset over trie word IDs.
+
+    Returns:
+        The updated bitset, or None if any claimed word is already in use
+    """
+    bit = word_bit(word, trie)
+    if used & bit:
+        return None
+    used |= bit
+
+    if row == grid.size - 1:
+        if downs is None:
+            downs = [grid.get_column(col) for col in range(grid.size)]
+        for down in downs:
+            bit = word_bit(down, trie)
+            if used & bit:
+                return None
+            used |= bit
+
+    return used
+
+
+def slot_cells(size: int, slot: Tuple[Direction, int]) -> List[Tuple[int, int]]:
+    """Return the (row, col) cells covered by an across or down slot."""
+    direction, index = slot
+    if direction is Direction.ACROSS:
+        return [(index, col) for col in range(size)]
+    return [(row, index) for row in range(size)]
+
+
+def slot_pattern(grid: Grid, slot: Tuple[Direction, int]) -> str:
+    """Return the slot's letters with '?' for each empty cell."""
+    return ''.join(grid.get_cell(row, col) or '?' for row, col in slot_cells(grid.size, slot))
+
+
+def _reaches_letter(node: TrieNode, depth: int, letter: str,
+                    memo: Dict[Tuple[int, int, str], bool]) -> bool:
+    """Check whether some word below ``node`` has ``letter`` ``depth`` levels further down."""
+    if depth == 0:
+        return letter in node.children
+    key = (id(node), depth, letter)
+    reaches = memo.get(key)
+    if reaches is None:
+        reaches = any(_reaches_letter(child, depth - 1, letter, memo)
+                      for child in node.children.values())
+        memo[key] = reaches
+    return reaches
+
+
+def iter_row_fills(grid: Grid, row: int, used: int, trie: WordTrie,
+                   cursors: Optional[List[TrieNode]],
+                   memo: Optional[Dict[Tuple[int, int, str], bool]] = None) -> Iterator[None]:
+    """
+    Enumerate every fill of rows ``row`` onwards in place, depth first.
+
+    Cells already filled in those rows stay fixed: only words with those
+    letters are placed there, which pins whole words in any slot. With
+    cursors, a column letter is also only allowed if the column can still
+    reach its next fixed cell, so a word pinned in a low row prunes the
+    rows above it. Entries follow the rules of generate_all_puzzles
+    (``used`` holds the claimed words). Yields each time the grid is
+    complete; the grid holds that fill until the generator is resumed, and
+    is restored once it is exhausted.
+    """
+    if row == grid.size:
+        yield
+        return
+    if memo is None:
+        memo = {}
+
+    fixed = [grid.get_cell(row, col) for col in range(grid.size)]
+    letter_sets = [letters if not letter else set(letters) & {letter}
+                   for letter, letters in zip(fixed, column_letter_sets(grid, row, trie, cursors))]
+    if cursors is not None:
+        for col, node in enumerate(cursors):
+            below = [(depth, grid.get_cell(depth, col)) for depth in range(row + 1, grid.size)
+                     if grid.get_cell(depth, col)]
+            if below:
+                depth, letter = below[0]
+                letter_sets[col] = [char for char in letter_sets[col]
+                                    if _reaches_letter(node.children[char], depth - row - 1,
+                                                       letter, memo)]
+
+    for word in list(trie.iter_words_with_letter_sets(letter_sets)):
+        grid.place_word(word, row)
+        next_cursors = None
+        downs = None
+        if cursors is not None:
+            next_cursors = [node.children[char] for node, char in zip(cursors, word)]
+            if row == grid.size - 1:
+                downs = [node.word for node in next_cursors]
+
+        new_used = claim_entries(grid, row, word, used, trie, downs)
+        if new_used is not None:
+            yield from iter_row_fills(grid, row + 1, new_used, trie, next_cursors, memo)
+
+    for col, letter in enumerate(fixed):
+        if letter:
+            grid.set_cell(row, col, letter)
+        else:
+            grid.clear_cell(row, col)
@@ -0,0 +1,349 @@
+"""
+Local asyncio HTTP service that generates puzzles in a process pool.
+
+Dictionaries are loaded once per worker process, concurrent requests for
+the same seed share one computation, and finished results are kept in a
+bounded LRU cache. With shared_memory=True the dictionaries are loaded once
+by the service and packed into shared memory that every worker queries in
+place; those workers search without the nogood table and least-constraining
+ordering, whose automata would otherwise be rebuilt in every worker. Only
+the standard library is used.
+
+Endpoints:
+    GET /puzzle?seed=HEART[&dictionary=NAME][&max_nodes=N][&timeout=SECONDS]
+    GET /stats
+"""
+
+import argparse
+import asyncio
+import json
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from .crossword_generator import (
+    LeastConstrainingOrder, NogoodTable, SearchBudgetExceeded, generate_puzzle)
+from .shared_trie import SharedWordTrie
+from .word_trie import WordTrie, load_words_from_file
+
+# Per-process state, filled in by _init_worker (or _attach_worker, which
+# leaves the nogood and ordering tables empty) in each pool worker
+_WORKER_TRIES: Dict[str, WordTrie] = {}
+_WORKER_NOGOODS: Dict[str, NogoodTable] = {}
+_WORKER_ORDERINGS: Dict[str, LeastConstrainingOrder] = {}
+
+# Results that do not depend on the node budget and can be cached
+CACHEABLE_STATUSES = ('ok', 'no_fill')
+
+HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed'}
+
+
+def _init_worker(dictionaries: Dict[str, str]) -> None:
+    """Load every dictionary once when a worker process starts."""
+    for name, path in dictionaries.items():
+        trie = load_words_from_file(path)
+        _WORKER_TRIES[name] = trie
+        _WORKER_NOGOODS[name] = NogoodTable(trie)
+        _WORKER_ORDERINGS[name] = LeastConstrainingOrder(trie, dawg=_WORKER_NOGOODS[name].dawg)
+
+
+def _attach_worker(segments: Dict[str, str]) -> None:
+    """
+    Attach to the service's shared dictionaries when a worker process starts.
+
+    Only the packed tries are attached. The nogood table and the
+    least-constraining ordering each need a WordDawg object graph built
+    from the whole dictionary, which would bring back a per-worker copy
+    and rebuild; shared workers search without them, in dictionary order.
+    """
+    for name, segment in segments.items():
+        _WORKER_TRIES[name] = SharedWordTrie.attach(segment)
+
+
+def _worker_ready() -> List[str]:
+    """Return the dictionaries loaded in a worker; used to start the pool."""
+    return sorted(_WORKER_TRIES)
+
+
+def _generate_in_worker(dictionary: str, seed_word: str,
+                        max_nodes: Optional[int]) -> Tuple[str, Optional[List[str]]]:
+    """
+    Generate one puzzle inside a worker process.
+
+    Returns:
+        (status, rows) where status is 'ok', 'no_fill' or 'budget_exceeded'
+        and rows holds the five across words when status is 'ok'
+    """
+    try:
+        grid = generate_puzzle(seed_word, _WORKER_TRIES[dictionary], _WORKER_NOGOODS.get(dictionary),
+                               max_nodes=max_nodes, ordering=_WORKER_ORDERINGS.get(dictionary))
+    except SearchBudgetExceeded:
+        return 'budget_exceeded', None
+
+    if grid is None:
+        return 'no_fill', None
+    return 'ok', grid.get_acrosses()
+
+
+class PuzzleService:
+    """
+    Puzzle generation service with request coalescing and a result cache.
+
+    Requests wait for their own timeout, but a timed-out computation keeps
+    running in its worker and its result is still cached, so a retry is
+    usually answered immediately.
+    """
+
+    def __init__(self, dictionaries: Dict[str, str], workers: Optional[int] = None,
+                 cache_size: int = 1024, max_nodes: int = 200000, timeout: float = 10.0,
+                 executor: Optional[Executor] = None, shared_memory: bool = False):
+        """
+        Args:
+            dictionaries: Mapping of dictionary name to word file path; the
+                first entry is the default dictionary
+            workers: Number of worker processes (default: one per CPU)
+            cache_size: Maximum number of cached results
+            max_nodes: Largest node budget a request may ask for
+            timeout: Default seconds a request waits for its result
+            executor: Executor to run generation in (default: a process pool
+                whose workers load ``dictionaries`` once)
+            shared_memory: Load each dictionary once in this process and
+                share it with the default pool through shared memory,
+                instead of loading a copy in every worker (the workers then
+                search without the nogood table and ordering, so they may
+                return a different valid fill)
+        """
+        if not dictionaries:
+            raise ValueError("At least one dictionary is required")
+
+        self.dictionaries = dict(dictionaries)
+        self.default_dictionary = next(iter(self.dictionaries))
+        self.cache_size = cache_size
+        self.max_nodes = max_nodes
+        self.timeout = timeout
+
+        self.shared_tries: Dict[str, SharedWordTrie] = {}
+        if executor is None and shared_memory:
+            for name, path in self.dictionaries.items():
+                self.shared_tries[name] = SharedWordTrie.create(load_words_from_file(path))
+            segments = {name: trie.name for name, trie in self.shared_tries.items()}
+            executor = ProcessPoolExecutor(
+                max_workers=workers, initializer=_attach_worker, initargs=(segments,))
+
+        self.executor = executor or ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(self.dictionaries,))
+
+        self.cache = OrderedDict()
+        self.inflight: Dict[Tuple[str, str, int], asyncio.Future] = {}
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.port: Optional[int] = None
+
+        self.requests = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+        self.computations = 0
+        self.evictions = 0
+        self.timeouts = 0
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> None:
+        """
+        Start the workers, then start listening.
+
+        Workers are started (and load their dictionaries) before the socket
+        is opened; otherwise a forked worker would inherit open client
+        connections and keep them from closing. With port 0 the chosen port
+        is stored in self.port.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, _worker_ready)
+        self.server = await asyncio.start_server(self._handle, host, port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        """Stop listening, shut down the worker pool and free shared dictionaries."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        # Waiting for the workers blocks, so it runs in a thread; they must
+        # exit before the shared dictionaries below are unlinked
+        await asyncio.to_thread(self.executor.shutdown, wait=True, cancel_futures=True)
+
+        for trie in self.shared_tries.values():
+            trie.close()
+            trie.unlink()
+        self.shared_tries = {}
+
+    async def get_puzzle(self, seed_word: str, dictionary: Optional[str] = None,
+                         max_nodes: Optional[int] = None,
+                         timeout: Optional[float] = None) -> dict:
+        """
+        Get a puzzle for a seed, from the cache or a shared computation.
+
+        Args:
+            seed_word: The 5-letter word in row 0
+            dictionary: Dictionary name (default: the first configured one)
+            max_nodes: Node budget, capped at the service's max_nodes
+            timeout: Seconds to wait (default: the service's timeout)
+
+        Returns:
+            Dictionary with 'seed', 'dictionary', 'status' ('ok', 'no_fill',
+            'budget_exceeded' or 'timeout'), 'grid' (list of row words or
+            None) and 'cached'
+        """
+        self.requests += 1
+        seed_word = seed_word.strip().upper()
+        dictionary = dictionary or self.default_dictionary
+        max_nodes = self.max_nodes if max_nodes is None else min(max_nodes, self.max_nodes)
+        timeout = self.timeout if timeout is None else timeout
+
+        response = {'seed': seed_word, 'dictionary': dictionary, 'cached': False}
+
+        cache_key = (dictionary, seed_word)
+        if cache_key in self.cache:
+            self.cache.move_to_end(cache_key)
+            self.cache_hits += 1
+            status, rows = self.cache[cache_key]
+            response.update(status=status, grid=rows, cached=True)
+            return response
+
+        key = (dictionary, seed_word, max_nodes)
+        future = self.inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._compute(key))
+            self.inflight[key] = future
+            future.add_done_callback(lambda _: self.inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+
+        try:
+            status, rows = await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            status, rows = 'timeout', None
+
+        response.update(status=status, grid=rows)
+        return response
+
+    async def _compute(self, key: Tuple[str, str, int]) -> Tuple[str, Optional[List[str]]]:
+        """Run one generation in the executor and cache a definitive result."""
+        self.computations += 1
+        loop = asyncio.get_running_loop()
+        status, rows = await loop.run_in_executor(self.executor, _generate_in_worker, *key)
+
+        if status in CACHEABLE_STATUSES:
+            self.cache[key[:2]] = (status, rows)
+            self.cache.move_to_end(key[:2])
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+                self.evictions += 1
+
+        return status, rows
+
+    def get_stats(self) -> dict:
+        """Get request, cache and coalescing counters."""
+        return {
+            'requests': self.requests,
+            'cache_hits': self.cache_hits,
+            'cache_size': len(self.cache),
+            'evictions': self.evictions,
+            'coalesced': self.coalesced,
+            'computations': self.computations,
+            'inflight': len(self.inflight),
+            'timeouts': self.timeouts,
+        }
+
+    async def _puzzle_response(self, query: Dict[str, str]) -> Tuple[int, dict]:
+        """Validate /puzzle query parameters and answer the request."""
+        seed_word = query.get('seed', '').strip().upper()
+        if len(seed_word) != 5 or not seed_word.isalpha():
+            return 400, {'error': 'seed must be exactly 5 letters'}
+
+        dictionary = query.get('dictionary', self.default_dictionary)
+        if dictionary not in self.dictionaries:
+            return 400, {'error': f'unknown dictionary: {dictionary}'}
+
+        try:
+            max_nodes = int(query['max_nodes']) if 'max_nodes' in query else None
+            timeout = float(query['timeout']) if 'timeout' in query else None
+        except ValueError:
+            return 400, {'error': 'max_nodes and timeout must be numbers'}
+
+        return 200, await self.get_puzzle(seed_word, dictionary, max_nodes, timeout)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one HTTP/1.1 request and close the connection."""
+        try:
+            request_line = await reader.readline()
+            while True:
+                header = await reader.readline()
+                if header in (b'\r\n', b'\n', b''):
+                    break
+
+            parts = request_line.decode('latin-1').split()
+            if len(parts) < 2:
+                code, body = 400, {'error': 'malformed request'}
+            elif parts[0] != 'GET':
+                code, body = 405, {'error': 'only GET is supported'}
+            else:
+                url = urlsplit(parts[1])
+                query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+                if url.path == '/puzzle':
+                    code, body = await self._puzzle_response(query)
+                elif url.path == '/stats':
+                    code, body = 200, self.get_stats()
+                else:
+                    code, body = 404, {'error': f'not found: {url.path}'}
+
+            payload = json.dumps(body).encode('utf-8')
+            writer.write(
+                f"HTTP/1.1 {code} {HTTP_REASONS[code]}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Connection: close\r\n\r\n".encode('latin-1') + payload)
+            await writer.drain()
+        finally:
+            writer.close()
+
+
+async def serve(service: PuzzleService, host: str, port: int) -> None:
+    """Run a service until cancelled."""
+    await service.start(host, port)
+    print(f"Serving puzzles on http://{host}:{service.port}")
+    try:
+        await service.server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve 5x5 mini crossword puzzles over HTTP.")
+    parser.add_argument('--dictionary', action='append', required=True, metavar='NAME=PATH',
+                        help="Word file to serve; repeat for several (first is the default)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--cache-size', type=int, default=1024)
+    parser.add_argument('--max-nodes', type=int, default=200000)
+    parser.add_argument('--timeout', type=float, default=10.0)
+    parser.add_argument('--shared-memory', action='store_true',
+                        help="Share one copy of each dictionary between all workers")
+    args = parser.parse_args()
+
+    dictionaries = {}
+    for entry in args.dictionary:
+        name, _, path = entry.partition('=')
+        if not path:
+            parser.error(f"--dictionary must look like NAME=PATH: {entry}")
+        dictionaries[name] = path
+
+    service = PuzzleService(dictionaries, workers=args.workers, cache_size=args.cache_size,
+                            max_nodes=args.max_nodes, timeout=args.timeout,
+                            shared_memory=args.shared_memory)
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Lazily loaded WordTrie split into shards by the first letters of each word.
+"""
+
+import json
+import os
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from .word_trie import WordTrie, TrieNode
+
+INDEX_FILENAME = 'index.json'
+
+
+def shard_key(word: str, prefix_length: int = 1) -> str:
+    """Return the shard a word belongs to: its first ``prefix_length`` letters."""
+    return word.upper().strip()[:prefix_length]
+
+
+class ShardedWordTrie(WordTrie):
+    """
+    WordTrie that only inserts a shard's words when a query first reaches it.
+
+    Words are grouped by their first ``prefix_length`` letters. A prefix or
+    pattern query loads just the shards whose keys it can match, so a query
+    that starts with a fixed letter never pays for the rest of the
+    dictionary. Queries that start with a wildcard, and length queries,
+    load every shard.
+
+    Word IDs are assigned in load order, so they are dense over the loaded
+    words but depend on which shards were reached first.
+    """
+
+    def __init__(self, shard_keys: Iterable[str],
+                 load_shard: Callable[[str], Iterable[str]],
+                 prefix_length: int = 1):
+        """
+        Args:
+            shard_keys: Keys of every available shard
+            load_shard: Called with a shard key; returns that shard's words
+            prefix_length: Number of leading letters in each shard key
+        """
+        super().__init__()
+        self.prefix_length = prefix_length
+        self.load_shard = load_shard
+        self.pending_shards = set(key.upper() for key in shard_keys)
+        self.loaded_shards = set()
+
+    def load_all(self) -> None:
+        """Load every shard that has not been loaded yet."""
+        for key in sorted(self.pending_shards):
+            self._load(key)
+
+    def _load(self, key: str) -> None:
+        """Insert the words of one pending shard."""
+        self.pending_shards.discard(key)
+        self.loaded_shards.add(key)
+        for word in self.load_shard(key):
+            self.insert(word)
+
+    def _ensure_prefix(self, prefix: str) -> None:
+        """Load the shards that can contain words starting with ``prefix``."""
+        if len(prefix) >= self.prefix_length:
+            key = prefix[:self.prefix_length]
+            if key in self.pending_shards:
+                self._load(key)
+            return
+
+        for key in sorted(self.pending_shards):
+            if key.startswith(prefix):
+                self._load(key)
+
+    def _ensure_letters(self, letters: List[Optional[Iterable[str]]]) -> None:
+        """Load the shards that can contain words matching ``letters``."""
+        for key in sorted(self.pending_shards):
+            # Keys shorter than prefix_length hold words of exactly that length
+            if len(key) < self.prefix_length and len(key) != len(letters):
+                continue
+            if len(key) > len(letters):
+                continue
+            if all(letters[i] is None or char in letters[i] for i, char in enumerate(key)):
+                self._load(key)
+
+    def _find_node(self, prefix: str) -> Optional[TrieNode]:
+        if self.pending_shards:
+            self._ensure_prefix(prefix)
+        return super()._find_node(prefix)
+
+    def _iter_level_words(self, letters: List[Optional[Iterable[str]]],
+                          limit: Optional[int]) -> Iterator[str]:
+        if self.pending_shards:
+            self._ensure_letters(letters)
+        return super()._iter_level_words(letters, limit)
+
+    def _iter_pattern_matches(self, patterns: List[str],
+                              wildcard: str) -> Iterator[Tuple[str, int]]:
+        if self.pending_shards:
+            for pattern in patterns:
+                self._ensure_letters([None if char == wildcard else char for char in pattern])
+        return super()._iter_pattern_matches(patterns, wildcard)
+
+    def get_stats(self) -> dict:
+        """Get statistics about the trie, loading every shard first."""
+        self.load_all()
+        return super().get_stats()
+
+
+def split_words(words: Iterable[str], output_dir: str, prefix_length: int = 1) -> Dict[str, int]:
+    """
+    Write words into one JSON shard file per key, plus an index file.
+
+    Each shard is written as ``<key>.json`` containing ``{"words": [...]}``,
+    the same shape as words.json, and ``index.json`` records the prefix
+    length and the word count of every shard. The layout can be read from
+    disk with load_sharded_words or fetched over HTTP by the browser build.
+
+    Args:
+        words: Words to split (blank entries are skipped)
+        output_dir: Directory to write the shards to (created if missing)
+        prefix_length: Number of leading letters in each shard key
+
+    Returns:
+        Mapping of shard key to word count
+    """
+    shards = {}
+    for word in words:
+        word = word.strip()
+        if word:
+            shards.setdefault(shard_key(word, prefix_length), []).append(word)
+
+    os.makedirs(output_dir, exist_ok=True)
+    for key, shard_words in shards.items():
+        with open(os.path.join(output_dir, f"{key}.json"), 'w', encoding='utf-8') as f:
+            json.dump({'words': shard_words}, f)
+
+    counts = {key: len(shards[key]) for key in sorted(shards)}
+    with open(os.path.join(output_dir, INDEX_FILENAME), 'w', encoding='utf-8') as f:
+        json.dump({'prefix_length': prefix_length, 'shards': counts}, f, indent=2)
+
+    return counts
+
+
+def load_sharded_words(directory: str) -> ShardedWordTrie:
+    """
+    Open a directory written by split_words as a lazily loaded trie.
+
+    Only the index is read up front; shard files are read on first use.
+
+    Args:
+        directory: Directory containing index.json and the shard files
+
+    Returns:
+        ShardedWordTrie backed by the shard files
+
+    Raises:
+        FileNotFoundError: If the index file doesn't exist
+    """
+    index_path = os.path.join(directory, INDEX_FILENAME)
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Shard index not found: {index_path}")
+
+    def load_shard(key: str) -> List[str]:
+        with open(os.path.join(directory, f"{key}.json"), 'r', encoding='utf-8') as f:
+            return json.load(f)['words']
+
+    return ShardedWordTrie(index['shards'], load_shard, index['prefix_length'])
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) not in (3, 4):
+        print("Usage: python3 -m src.crossword_mini.sharded_trie <words.json|words.txt> <output_dir> [prefix_length]")
+        sys.exit(1)
+
+    source, output_dir = sys.argv[1], sys.argv[2]
+    prefix_length = int(sys.argv[3]) if len(sys.argv) == 4 else 1
+
+    with open(source, 'r', encoding='utf-8') as f:
+        if source.endswith('.json'):
+            source_words = json.load(f)['words']
+        else:
+            source_words = [line.strip() for line in f]
+
+    counts = split_words(source_words, output_dir, prefix_length)
+    print(f"Wrote {sum(counts.values())} words into {len(counts)} shards in {output_dir}")
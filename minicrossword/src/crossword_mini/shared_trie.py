@@ -0,0 +1,397 @@
+"""
+Flat, read-only WordTrie layout that processes can share without copying.
+
+A WordTrie is a graph of Python objects, so every worker process has to
+build its own. This module packs a trie into a single buffer of integer
+arrays that can live in ``multiprocessing.shared_memory`` or in a file
+mapped with ``mmap``. Processes attach to the buffer and query it in place:
+nothing is rebuilt and the pages are shared by the operating system.
+
+Layout (native byte order, every array 4-byte aligned):
+
+    header          magic, node count, edge count, word count, word bytes
+    first_edge      uint32[nodes + 1]  node i owns edges first_edge[i] .. first_edge[i + 1] - 1
+    node_word       int32[nodes]       word ID ending at node i, or -1
+    edge_child      uint32[edges]      node reached by each edge
+    word_offsets    uint32[words + 1]  word i is word_bytes[offsets[i]:offsets[i + 1]]
+    edge_label      uint8[edges]       letter of each edge
+    word_bytes      uint8[...]         ASCII text of every word, by word ID
+
+Node 0 is the root. Edges keep the order of the source trie's children,
+so every query returns words in the same order as the source WordTrie.
+The buffer is native-endian and meant for processes on the same machine.
+
+Queries on a shared trie run a few times slower than on a WordTrie, since
+every step reads typed memory instead of following object references; the
+trade is one copy of the dictionary per machine instead of one per worker.
+"""
+
+import mmap
+import struct
+from array import array
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+from .word_trie import WordTrie
+
+MAGIC = b'MCT1'
+HEADER = struct.Struct('=4sIIII')
+
+
+def pack_trie(trie: WordTrie) -> bytes:
+    """
+    Pack a trie into the flat layout.
+
+    Args:
+        trie: The trie to pack; a ShardedWordTrie is fully loaded first
+
+    Returns:
+        The packed buffer
+
+    Raises:
+        ValueError: If the trie holds a non-ASCII word
+    """
+    if hasattr(trie, 'load_all'):
+        trie.load_all()
+
+    first_edge = array('I', [0])
+    node_word = array('i')
+    edge_child = array('I')
+    edge_label = bytearray()
+    words: List[Optional[bytes]] = [None] * trie.word_count
+
+    # Breadth-first numbering, so each node's edges are contiguous
+    queue = [trie.root]
+    for node in queue:
+        if node.is_end_of_word:
+            try:
+                words[node.word_id] = node.word.encode('ascii')
+            except UnicodeEncodeError:
+                raise ValueError(f"Only ASCII words can be packed: {node.word!r}")
+            node_word.append(node.word_id)
+        else:
+            node_word.append(-1)
+
+        for char, child in node.children.items():
+            edge_label.append(ord(char))
+            edge_child.append(len(queue))
+            queue.append(child)
+        first_edge.append(len(edge_child))
+
+    word_offsets = array('I', [0])
+    for word in words:
+        word_offsets.append(word_offsets[-1] + len(word))
+    word_bytes = b''.join(words)
+
+    header = HEADER.pack(MAGIC, len(queue), len(edge_child), len(words), len(word_bytes))
+    return b''.join([header, first_edge.tobytes(), node_word.tobytes(), edge_child.tobytes(),
+                     word_offsets.tobytes(), bytes(edge_label), word_bytes])
+
+
+def write_trie_file(trie: WordTrie, path: str) -> int:
+    """
+    Pack a trie into a file that processes can map with SharedWordTrie.open_file.
+
+    Returns:
+        Number of bytes written
+    """
+    data = pack_trie(trie)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+
+class FlatNode:
+    """
+    Node view over a SharedWordTrie with the attributes of a TrieNode.
+
+    Lets structure-walking code such as WordDawg run on a shared trie.
+    Views are created on demand and compare equal by node index.
+    """
+
+    __slots__ = ('trie', 'index')
+
+    def __init__(self, trie: 'SharedWordTrie', index: int):
+        self.trie = trie
+        self.index = index
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, FlatNode) and other.trie is self.trie and other.index == self.index
+
+    def __hash__(self) -> int:
+        return self.index
+
+    @property
+    def children(self) -> Dict[str, 'FlatNode']:
+        trie = self.trie
+        return {chr(trie.edge_label[edge]): FlatNode(trie, trie.edge_child[edge])
+                for edge in range(trie.first_edge[self.index], trie.first_edge[self.index + 1])}
+
+    @property
+    def is_end_of_word(self) -> bool:
+        return self.trie.node_word[self.index] >= 0
+
+    @property
+    def word_id(self) -> Optional[int]:
+        word_id = self.trie.node_word[self.index]
+        return word_id if word_id >= 0 else None
+
+    @property
+    def word(self) -> Optional[str]:
+        word_id = self.word_id
+        return None if word_id is None else self.trie.get_word(word_id)
+
+
+class SharedWordTrie:
+    """
+    Read-only trie queried directly from a packed buffer.
+
+    Supports the query methods the generators use, so it can be passed
+    anywhere a WordTrie is expected. Word IDs are those of the packed trie.
+
+    Create one with SharedWordTrie.create (new shared memory block),
+    SharedWordTrie.attach (existing block, by name) or
+    SharedWordTrie.open_file (mapped file from write_trie_file). The process
+    that created a shared memory block should unlink it once every user has
+    closed theirs.
+    """
+
+    def __init__(self, buffer, shm: Optional[shared_memory.SharedMemory] = None,
+                 mapping: Optional[mmap.mmap] = None):
+        """
+        Args:
+            buffer: Buffer holding a packed trie
+            shm: Shared memory block the buffer belongs to, if any
+            mapping: Memory-mapped file the buffer belongs to, if any
+
+        Raises:
+            ValueError: If the buffer does not hold a packed trie
+        """
+        self.shm = shm
+        self.mapping = mapping
+        self.buffer = memoryview(buffer)
+
+        magic, nodes, edges, words, word_bytes = HEADER.unpack_from(self.buffer)
+        if magic != MAGIC:
+            raise ValueError("Buffer does not hold a packed trie")
+
+        self.node_count = nodes
+        self.edge_count = edges
+        self.word_count = words
+
+        self._views = [self.buffer]
+        offset = HEADER.size
+        self.first_edge, offset = self._array(offset, nodes + 1, 'I')
+        self.node_word, offset = self._array(offset, nodes, 'i')
+        self.edge_child, offset = self._array(offset, edges, 'I')
+        self.word_offsets, offset = self._array(offset, words + 1, 'I')
+        self.edge_label, offset = self._array(offset, edges, 'B')
+        self.word_bytes, offset = self._array(offset, word_bytes, 'B')
+        self.nbytes = offset
+
+    def _array(self, offset: int, length: int, fmt: str):
+        """Return a typed view of ``length`` items at ``offset`` and the next offset."""
+        end = offset + length * struct.calcsize(fmt)
+        view = self.buffer[offset:end].cast(fmt)
+        self._views.append(view)
+        return view, end
+
+    @classmethod
+    def create(cls, trie: WordTrie, name: Optional[str] = None) -> 'SharedWordTrie':
+        """
+        Pack a trie into a new shared memory block.
+
+        Args:
+            trie: The trie to share
+            name: Block name (default: a random name chosen by the system)
+
+        Returns:
+            SharedWordTrie over the new block; its ``name`` is what other
+            processes pass to attach
+        """
+        data = pack_trie(trie)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=len(data))
+        shm.buf[:len(data)] = data
+        return cls(shm.buf, shm=shm)
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedWordTrie':
+        """Attach to a shared memory block created by SharedWordTrie.create."""
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(shm.buf, shm=shm)
+
+    @classmethod
+    def open_file(cls, path: str) -> 'SharedWordTrie':
+        """Map a file written by write_trie_file read-only."""
+        with open(path, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapping, mapping=mapping)
+
+    @property
+    def name(self) -> Optional[str]:
+        """Name of the shared memory block, or None for other buffers."""
+        return self.shm.name if self.shm is not None else None
+
+    @property
+    def root(self) -> FlatNode:
+        """Root node view, for structure-walking features such as WordDawg."""
+        return FlatNode(self, 0)
+
+    def close(self) -> None:
+        """Release the buffer; the trie cannot be queried afterwards."""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if self.shm is not None:
+            self.shm.close()
+        if self.mapping is not None:
+            self.mapping.close()
+
+    def unlink(self) -> None:
+        """Destroy the shared memory block; call once, from the creating process."""
+        if self.shm is not None:
+            self.shm.unlink()
+
+    def get_word(self, word_id: int) -> str:
+        """Get the word with the given ID."""
+        offsets = self.word_offsets
+        return self.word_bytes[offsets[word_id]:offsets[word_id + 1]].tobytes().decode('ascii')
+
+    def search(self, word: str) -> bool:
+        """Check if a word exists in the trie."""
+        return self.get_word_id(word) is not None
+
+    def starts_with(self, prefix: str) -> bool:
+        """Check if any word in the trie starts with the given prefix."""
+        return self._find_node(prefix.upper().strip()) is not None
+
+    def get_word_id(self, word: str) -> Optional[int]:
+        """Get the ID of a word, or None if the word is not in the trie."""
+        node = self._find_node(word.upper().strip())
+        if node is None:
+            return None
+        word_id = self.node_word[node]
+        return word_id if word_id >= 0 else None
+
+    def get_words_with_prefix(self, prefix: str) -> List[str]:
+        return list(self.iter_words_with_prefix(prefix))
+
+    def get_words_by_length(self, length: int) -> List[str]:
+        return list(self.iter_words_by_length(length))
+
+    def get_words_with_pattern(self, pattern: str, wildcard: str = '?') -> List[str]:
+        return list(self.iter_words_with_pattern(pattern, wildcard))
+
+    def iter_words_with_letter_sets(self, letter_sets: List[Optional[Iterable[str]]],
+                                    limit: Optional[int] = None) -> Iterator[str]:
+        """Lazily yield words whose i-th letter is one of ``letter_sets[i]`` (None allows any)."""
+        return self._iter_level_words(
+            [None if letters is None else frozenset(letters) for letters in letter_sets], limit)
+
+    def next_letters(self, prefix: str, normalized: bool = False) -> Set[str]:
+        """Get the letters that continue a prefix in at least one word."""
+        if not normalized:
+            prefix = prefix.upper().strip()
+        node = self._find_node(prefix)
+        if node is None:
+            return set()
+        return {chr(code) for code in self.edge_label[self.first_edge[node]:self.first_edge[node + 1]]}
+
+    def iter_words_with_prefix(self, prefix: str, limit: Optional[int] = None,
+                               normalized: bool = False) -> Iterator[str]:
+        """Lazily yield words that start with the given prefix, in WordTrie order."""
+        if not normalized:
+            prefix = prefix.upper().strip()
+        node = self._find_node(prefix)
+        if node is None or limit == 0:
+            return
+
+        first_edge = self.first_edge
+        edge_child = self.edge_child
+        node_word = self.node_word
+        get_word = self.get_word
+
+        found = 0
+        stack = [node]
+        pop = stack.pop
+        while stack:
+            node = pop()
+            word_id = node_word[node]
+            if word_id >= 0:
+                yield get_word(word_id)
+                found += 1
+                if found == limit:
+                    return
+            start, end = first_edge[node], first_edge[node + 1]
+            if start != end:
+                stack.extend(reversed(edge_child[start:end]))
+
+    def iter_words_by_length(self, length: int, limit: Optional[int] = None) -> Iterator[str]:
+        """Lazily yield words of a specific length."""
+        return self._iter_level_words([None] * length, limit)
+
+    def iter_words_with_pattern(self, pattern: str, wildcard: str = '?',
+                                limit: Optional[int] = None,
+                                normalized: bool = False) -> Iterator[str]:
+        """Lazily yield words that match a pattern with wildcards, in WordTrie order."""
+        if not normalized:
+            pattern = pattern.upper().strip()
+        return self._iter_level_words(
+            [None if char == wildcard else char for char in pattern], limit)
+
+    def _iter_level_words(self, letters: List[Optional[Iterable[str]]],
+                          limit: Optional[int]) -> Iterator[str]:
+        """Yield the words matching ``letters``: one letter, a frozenset of letters, or None each."""
+        if limit == 0:
+            return
+
+        first_edge = self.first_edge
+        edge_child = self.edge_child
+        node_word = self.node_word
+        edge_label = self.edge_label
+        child = self._child
+
+        nodes = [0]
+        for char in letters:
+            if char is None:
+                nodes = [next_node for node in nodes
+                         for next_node in edge_child[first_edge[node]:first_edge[node + 1]]]
+            elif isinstance(char, str):
+                code = ord(char)
+                if code > 255:
+                    return
+                nodes = [next_node for next_node in (child(node, code) for node in nodes)
+                         if next_node is not None]
+            else:
+                codes = {ord(letter) for letter in char}
+                nodes = [edge_child[edge] for node in nodes
+                         for edge in range(first_edge[node], first_edge[node + 1])
+                         if edge_label[edge] in codes]
+            if not nodes:
+                return
+
+        found = 0
+        for node in nodes:
+            word_id = node_word[node]
+            if word_id >= 0:
+                yield self.get_word(word_id)
+                found += 1
+                if found == limit:
+                    return
+
+    def _child(self, node: int, code: int) -> Optional[int]:
+        """Return the child of ``node`` along the letter with code ``code``."""
+        start, end = self.first_edge[node], self.first_edge[node + 1]
+        index = self.edge_label[start:end].tobytes().find(code)
+        return self.edge_child[start + index] if index >= 0 else None
+
+    def _find_node(self, prefix: str) -> Optional[int]:
+        """Find the node index corresponding to a prefix."""
+        node = 0
+        for char in prefix:
+            code = ord(char)
+            if code > 255:
+                return None
+            node = self._child(node, code)
+            if node is None:
+                return None
+        return node
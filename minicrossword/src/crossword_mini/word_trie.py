@@ -2,7 +2,10 @@
 Trie data structure for efficient word storage and prefix-based lookups.
 """
 
-from typing import List, Set, Optional
+import sys
+import tracemalloc
+from collections import OrderedDict
+from typing import Callable, Dict, Generator, Hashable, Iterable, Iterator, List, Sequence, Set, Optional, Tuple
 
 
 class TrieNode:
@@ -12,6 +15,101 @@ class TrieNode:
         self.children = {}  # Dictionary mapping character to TrieNode
         self.is_end_of_word = False
         self.word = None  # Store the complete word at end nodes
+        self.word_id = None  # Dense integer ID assigned when the word is first inserted
+
+
+class QueryCache:
+    """
+    Size-bounded LRU cache of query results.
+
+    Results are stored as tuples, so one cached result can be handed to
+    every caller without copying. ``max_size`` bounds the number of cached
+    queries; 'cached_words' in get_stats totals the words they hold, which
+    is what the cache costs in memory beyond the tuples themselves.
+
+    A query asked with a limit only computes and stores that many words.
+    Such a partial result answers later queries with the same or a smaller
+    limit; a query needing more words replaces it.
+    """
+
+    def __init__(self, max_size: int = 4096):
+        """
+        Args:
+            max_size: Maximum number of query results to keep
+        """
+        self.max_size = max_size
+        self.results: 'OrderedDict[Hashable, Tuple[str, ...]]' = OrderedDict()
+        # Keys whose stored result was cut off at a limit
+        self.partial: Set[Hashable] = set()
+        self.cached_words = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def lookup(self, key: Hashable, compute: Callable[[Optional[int]], Iterable[str]],
+               limit: Optional[int] = None) -> Tuple[str, ...]:
+        """
+        Get the result for ``key``, computing and storing it on a miss.
+
+        Args:
+            key: Normalized query
+            compute: Called with ``limit`` to run the query on a miss
+            limit: Only the first ``limit`` words are needed (default: all)
+
+        Returns:
+            The result, cut off after ``limit`` words
+        """
+        result = self.results.get(key)
+        if result is not None and (key not in self.partial or
+                                   (limit is not None and limit <= len(result))):
+            self.results.move_to_end(key)
+            self.hits += 1
+            return result if limit is None or limit >= len(result) else result[:limit]
+
+        self.misses += 1
+        result = tuple(compute(limit))
+        if self.max_size > 0:
+            previous = self.results.pop(key, None)
+            if previous is not None:
+                self.cached_words -= len(previous)
+            self.results[key] = result
+            self.cached_words += len(result)
+            if limit is not None and len(result) == limit:
+                self.partial.add(key)
+            else:
+                self.partial.discard(key)
+            if len(self.results) > self.max_size:
+                evicted_key, evicted = self.results.popitem(last=False)
+                self.partial.discard(evicted_key)
+                self.cached_words -= len(evicted)
+                self.evictions += 1
+        return result
+
+    def clear(self) -> None:
+        """Drop every cached result (the counters are kept)."""
+        if self.results:
+            self.results.clear()
+            self.partial.clear()
+            self.cached_words = 0
+            self.invalidations += 1
+
+    def get_stats(self) -> dict:
+        """Get hit/miss/eviction/invalidation counters and the current size."""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.results),
+            'max_size': self.max_size,
+            'cached_words': self.cached_words,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
 
 
 class WordTrie:
@@ -25,6 +123,34 @@ class WordTrie:
     def __init__(self):
         self.root = TrieNode()
         self.word_count = 0
+        self.query_cache: Optional[QueryCache] = None
+
+    def enable_query_cache(self, max_size: int = 4096) -> QueryCache:
+        """
+        Cache the results of prefix and pattern queries.
+
+        While enabled, get_words_with_prefix and get_words_with_pattern
+        return tuples shared between calls instead of fresh lists, and
+        iter_words_with_pattern, which the slot-by-slot searches repeat for
+        the same partly filled slots, iterates over cached tuples. Only
+        those queries are cached. The row search behind generate_puzzle
+        walks trie cursors and asks letter-set queries, which it rarely
+        repeats, so it neither uses nor fills the cache. Inserting a new
+        word clears the cache.
+
+        Args:
+            max_size: Maximum number of query results to keep (least
+                recently used results are evicted first)
+
+        Returns:
+            The cache, whose get_stats reports its counters
+        """
+        self.query_cache = QueryCache(max_size)
+        return self.query_cache
+
+    def disable_query_cache(self) -> None:
+        """Stop caching query results and drop the cached ones."""
+        self.query_cache = None
 
     def insert(self, word: str) -> None:
         """
@@ -45,7 +171,10 @@ class WordTrie:
             node = node.children[char]
 
         if not node.is_end_of_word:
+            node.word_id = self.word_count
             self.word_count += 1
+            if self.query_cache is not None:
+                self.query_cache.clear()
 
         node.is_end_of_word = True
         node.word = word
@@ -64,6 +193,24 @@ class WordTrie:
         node = self._find_node(word)
         return node is not None and node.is_end_of_word
 
+    def get_word_id(self, word: str) -> Optional[int]:
+        """
+        Get the dense integer ID of a word.
+
+        IDs run from 0 to word_count - 1 in insertion order, so they can be
+        used as bit positions in a used-word bitset.
+
+        Args:
+            word: The word to look up
+
+        Returns:
+            The word's ID, or None if the word is not in the trie
+        """
+        node = self._find_node(word.upper().strip())
+        if node is None or not node.is_end_of_word:
+            return None
+        return node.word_id
+
     def starts_with(self, prefix: str) -> bool:
         """
         Check if any word in the trie starts with the given prefix.
@@ -77,7 +224,7 @@ class WordTrie:
         prefix = prefix.upper().strip()
         return self._find_node(prefix) is not None
 
-    def get_words_with_prefix(self, prefix: str) -> List[str]:
+    def get_words_with_prefix(self, prefix: str) -> Sequence[str]:
         """
         Get all words that start with the given prefix.
 
@@ -85,17 +232,14 @@ class WordTrie:
             prefix: The prefix to search for
 
         Returns:
-            List of words that start with the prefix
+            List of words that start with the prefix (a cached tuple while
+            the query cache is enabled)
         """
+        if self.query_cache is None:
+            return list(self.iter_words_with_prefix(prefix))
         prefix = prefix.upper().strip()
-        node = self._find_node(prefix)
-
-        if node is None:
-            return []
-
-        words = []
-        self._collect_words(node, words)
-        return words
+        return self.query_cache.lookup(
+            ('prefix', prefix), lambda limit: self.iter_words_with_prefix(prefix, normalized=True))
 
     def get_words_by_length(self, length: int) -> List[str]:
         """
@@ -107,11 +251,9 @@ class WordTrie:
         Returns:
             List of words with the specified length
         """
-        words = []
-        self._collect_words_by_length(self.root, "", length, words)
-        return words
+        return list(self.iter_words_by_length(length))
 
-    def get_words_with_pattern(self, pattern: str, wildcard: str = '?') -> List[str]:
+    def get_words_with_pattern(self, pattern: str, wildcard: str = '?') -> Sequence[str]:
         """
         Get all words that match a pattern with wildcards.
 
@@ -120,12 +262,311 @@ class WordTrie:
             wildcard: Character used as wildcard (default '?')
 
         Returns:
-            List of words matching the pattern
+            List of words matching the pattern (a cached tuple while the
+            query cache is enabled)
         """
+        if self.query_cache is None:
+            return list(self.iter_words_with_pattern(pattern, wildcard))
         pattern = pattern.upper().strip()
-        words = []
-        self._match_pattern(self.root, pattern, 0, "", wildcard, words)
-        return words
+        return self._cached_level_words(('pattern', pattern, wildcard),
+                                        [None if char == wildcard else char for char in pattern])
+
+    def get_words_with_patterns(self, patterns: Iterable[str],
+                                wildcard: str = '?') -> Dict[str, List[str]]:
+        """
+        Answer several pattern queries with one shared traversal.
+
+        Patterns that agree on their first letters share the walk down
+        those levels, instead of each query re-walking them.
+
+        Args:
+            patterns: Pattern strings where wildcard represents any character
+            wildcard: Character used as wildcard (default '?')
+
+        Returns:
+            Mapping of each pattern (as given) to the words matching it, in
+            the same order as get_words_with_pattern
+        """
+        keys = list(dict.fromkeys(patterns))
+        results = {key: [] for key in keys}
+        for word, mask in self._iter_pattern_matches(
+                [key.upper().strip() for key in keys], wildcard):
+            index = 0
+            while mask:
+                if mask & 1:
+                    results[keys[index]].append(word)
+                mask >>= 1
+                index += 1
+        return results
+
+    def iter_words_matching_any(self, patterns: Iterable[str], wildcard: str = '?',
+                                limit: Optional[int] = None) -> Iterator[str]:
+        """
+        Lazily yield the words matching at least one of several patterns.
+
+        All patterns are matched in one shared traversal and each word is
+        yielded once, shorter words first.
+
+        Args:
+            patterns: Pattern strings where wildcard represents any character
+            wildcard: Character used as wildcard (default '?')
+            limit: Stop after yielding this many words (default: no limit)
+
+        Yields:
+            Words matching any of the patterns
+        """
+        if limit == 0:
+            return
+
+        found = 0
+        for word, _ in self._iter_pattern_matches(
+                list(dict.fromkeys(pattern.upper().strip() for pattern in patterns)), wildcard):
+            yield word
+            found += 1
+            if found == limit:
+                return
+
+    def iter_words_with_letter_sets(self, letter_sets: List[Optional[Iterable[str]]],
+                                    limit: Optional[int] = None) -> Iterator[str]:
+        """
+        Lazily yield words whose i-th letter is one of ``letter_sets[i]``.
+
+        A single traversal answers what would otherwise be one pattern
+        query per combination of allowed letters, e.g. [{'A', 'B'}, None,
+        {'C'}, None, None] for the patterns A?C??, B?C??.
+
+        Args:
+            letter_sets: Allowed uppercase letters for each position, or
+                None to allow any letter; the word length is len(letter_sets)
+            limit: Stop after yielding this many words (default: no limit)
+
+        Yields:
+            Matching words, in trie order
+        """
+        return self._iter_level_words(
+            [None if letters is None else frozenset(letters) for letters in letter_sets], limit)
+
+    def next_letters(self, prefix: str, normalized: bool = False) -> Set[str]:
+        """
+        Get the letters that continue a prefix in at least one word.
+
+        Args:
+            prefix: The prefix to extend
+            normalized: Skip upper()/strip() because the caller already passes
+                an uppercase, stripped prefix
+
+        Returns:
+            Set of letters (empty if no longer word starts with the prefix)
+        """
+        if not normalized:
+            prefix = prefix.upper().strip()
+        node = self._find_node(prefix)
+        if node is None:
+            return set()
+        return set(node.children)
+
+    def iter_words_with_prefix(self, prefix: str, limit: Optional[int] = None,
+                               normalized: bool = False) -> Iterator[str]:
+        """
+        Lazily yield words that start with the given prefix.
+
+        Args:
+            prefix: The prefix to search for
+            limit: Stop after yielding this many words (default: no limit)
+            normalized: Skip upper()/strip() because the caller already passes
+                an uppercase, stripped prefix
+
+        Yields:
+            Words that start with the prefix, in the same order as
+            get_words_with_prefix
+        """
+        if not normalized:
+            prefix = prefix.upper().strip()
+        node = self._find_node(prefix)
+        if node is None or limit == 0:
+            return
+
+        found = 0
+        stack = [node]
+        pop = stack.pop
+        extend = stack.extend
+        while stack:
+            node = pop()
+            if node.is_end_of_word:
+                yield node.word
+                found += 1
+                if found == limit:
+                    return
+            if node.children:
+                extend(reversed(node.children.values()))
+
+    def iter_words_by_length(self, length: int, limit: Optional[int] = None) -> Iterator[str]:
+        """
+        Lazily yield words of a specific length.
+
+        Args:
+            length: The desired word length
+            limit: Stop after yielding this many words (default: no limit)
+
+        Yields:
+            Words with the specified length
+        """
+        return self._iter_level_words([None] * length, limit)
+
+    def iter_words_with_pattern(self, pattern: str, wildcard: str = '?',
+                                limit: Optional[int] = None,
+                                normalized: bool = False) -> Iterator[str]:
+        """
+        Lazily yield words that match a pattern with wildcards.
+
+        Args:
+            pattern: Pattern string where wildcard represents any character
+            wildcard: Character used as wildcard (default '?')
+            limit: Stop after yielding this many words (default: no limit)
+            normalized: Skip upper()/strip() because the caller already passes
+                an uppercase, stripped pattern
+
+        Yields:
+            Words matching the pattern, in the same order as
+            get_words_with_pattern
+        """
+        if not normalized:
+            pattern = pattern.upper().strip()
+        letters = [None if char == wildcard else char for char in pattern]
+        if self.query_cache is None:
+            return self._iter_level_words(letters, limit)
+        return iter(self._cached_level_words(('pattern', pattern, wildcard), letters, limit))
+
+    def _cached_level_words(self, key: Tuple, letters: List[Optional[Iterable[str]]],
+                            limit: Optional[int] = None) -> Tuple[str, ...]:
+        """Answer a _iter_level_words query from the query cache."""
+        return self.query_cache.lookup(
+            key, lambda limit: self._iter_level_words(letters, limit), limit)
+
+    def _iter_level_words(self, letters: List[Optional[Iterable[str]]],
+                          limit: Optional[int]) -> Iterator[str]:
+        """
+        Yield the words whose letters match ``letters``: each entry is one
+        letter (a str), a frozenset of allowed letters, or None for any.
+
+        With a limit, the subtrees below the first letter are expanded in
+        batches of 1, 2, 4, ... subtrees, so the work stops soon after the
+        last word needed: at most about twice what that word's batch and
+        the ones before it cost. Results come out in the same order as a
+        depth-first walk.
+        """
+        if limit == 0:
+            return
+        if not letters:
+            if self.root.is_end_of_word:
+                yield self.root.word
+            return
+        # A single first letter leaves just one subtree, so there is nothing to split
+        if limit is None or len(letters) == 1 or isinstance(letters[0], str):
+            yield from self._expand_levels([self.root], letters, limit)
+            return
+
+        subtrees = self._matching_children([self.root], letters[0])
+        found = 0
+        start = 0
+        batch = 1
+        while start < len(subtrees) and found < limit:
+            found += yield from self._expand_levels(
+                subtrees[start:start + batch], letters[1:], limit - found)
+            start += batch
+            batch *= 2
+
+    @staticmethod
+    def _matching_children(nodes: List[TrieNode], char: Optional[Iterable[str]]) -> List[TrieNode]:
+        """Get the children of ``nodes`` allowed by one entry of a letter list, in order."""
+        if char is None:
+            return [child for node in nodes for child in node.children.values()]
+        if isinstance(char, str):
+            return [node.children[char] for node in nodes if char in node.children]
+        return [child for node in nodes
+                for letter, child in node.children.items() if letter in char]
+
+    def _expand_levels(self, nodes: List[TrieNode], letters: List[Optional[Iterable[str]]],
+                       limit: Optional[int]) -> Generator[str, None, int]:
+        """
+        Yield the words below ``nodes`` whose remaining letters match ``letters``.
+
+        Every level except the last is expanded breadth-first with list
+        comprehensions, which is much cheaper in CPython than per-node stack
+        pushes; the last level is walked lazily so ``limit`` exits early.
+        Returns the number of words yielded.
+        """
+        for char in letters[:-1]:
+            nodes = self._matching_children(nodes, char)
+            if not nodes:
+                return 0
+
+        found = 0
+        char = letters[-1]
+        for node in nodes:
+            if char is None:
+                children = node.children.values()
+            elif isinstance(char, str):
+                if char not in node.children:
+                    continue
+                children = (node.children[char],)
+            else:
+                children = [child for letter, child in node.children.items() if letter in char]
+
+            for child in children:
+                if child.is_end_of_word:
+                    yield child.word
+                    found += 1
+                    if found == limit:
+                        return found
+        return found
+
+    def _iter_pattern_matches(self, patterns: List[str],
+                              wildcard: str) -> Iterator[Tuple[str, int]]:
+        """
+        Match normalized patterns in one level-by-level traversal.
+
+        Each frontier entry carries a bitmask of the patterns still matching
+        its path, so a branch is walked once however many patterns share it
+        and dropped as soon as none do.
+
+        Yields:
+            (word, mask) with bit i set when the word matches patterns[i],
+            shorter words first and in trie order within a length
+        """
+        max_length = max((len(pattern) for pattern in patterns), default=0)
+        wild = [0] * max_length
+        fixed: List[Dict[str, int]] = [{} for _ in range(max_length)]
+        ends = [0] * (max_length + 1)
+        for index, pattern in enumerate(patterns):
+            bit = 1 << index
+            ends[len(pattern)] |= bit
+            for position, char in enumerate(pattern):
+                if char == wildcard:
+                    wild[position] |= bit
+                else:
+                    fixed[position][char] = fixed[position].get(char, 0) | bit
+
+        frontier = [(self.root, (1 << len(patterns)) - 1)]
+        for depth in range(max_length + 1):
+            if ends[depth]:
+                for node, mask in frontier:
+                    if node.is_end_of_word and mask & ends[depth]:
+                        yield node.word, mask & ends[depth]
+            if depth == max_length:
+                return
+
+            any_letter = wild[depth]
+            letter_masks = fixed[depth]
+            next_frontier = []
+            for node, mask in frontier:
+                for char, child in node.children.items():
+                    child_mask = mask & (any_letter | letter_masks.get(char, 0))
+                    if child_mask:
+                        next_frontier.append((child, child_mask))
+            frontier = next_frontier
+            if not frontier:
+                return
 
     def _find_node(self, prefix: str) -> Optional[TrieNode]:
         """Find the node corresponding to a prefix."""
@@ -138,74 +579,60 @@ class WordTrie:
 
         return node
 
-    def _collect_words(self, node: TrieNode, words: List[str]) -> None:
-        """Recursively collect all words from a node."""
-        if node.is_end_of_word:
-            words.append(node.word)
-
-        for child in node.children.values():
-            self._collect_words(child, words)
+    def get_stats(self) -> dict:
+        """
+        Get statistics about the trie, computed in a single iterative pass.
 
-    def _collect_words_by_length(self, node: TrieNode, current_word: str,
-                                target_length: int, words: List[str]) -> None:
-        """Recursively collect words of specific length."""
-        if len(current_word) == target_length:
-            if node.is_end_of_word:
-                words.append(node.word)
-            return
+        Memory figures come from sys.getsizeof and count each node object,
+        its children dict and the word string stored at end nodes. Shared
+        objects such as single characters and small ints are not counted,
+        and node.__dict__ is deliberately not touched because accessing it
+        can materialize a per-instance dict on recent CPython versions.
 
-        if len(current_word) < target_length:
-            for char, child in node.children.items():
-                self._collect_words_by_length(child, current_word + char,
-                                            target_length, words)
+        Returns:
+            Dictionary with word, node and depth counts, word counts by length
+            (for lengths 1-10, as before) and a 'memory' breakdown in bytes
+        """
+        total_nodes = 0
+        max_depth = 0
+        words_by_length = {length: 0 for length in range(1, 11)}
+        node_bytes = 0
+        dict_bytes = 0
+        word_bytes = 0
+
+        stack = [(self.root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            total_nodes += 1
+            if depth > max_depth:
+                max_depth = depth
+
+            node_bytes += sys.getsizeof(node)
+            dict_bytes += sys.getsizeof(node.children)
 
-    def _match_pattern(self, node: TrieNode, pattern: str, pos: int,
-                      current_word: str, wildcard: str, words: List[str]) -> None:
-        """Recursively match pattern with wildcards."""
-        if pos == len(pattern):
             if node.is_end_of_word:
-                words.append(node.word)
-            return
+                if depth in words_by_length:
+                    words_by_length[depth] += 1
+                word_bytes += sys.getsizeof(node.word)
 
-        char = pattern[pos]
+            for child in node.children.values():
+                stack.append((child, depth + 1))
 
-        if char == wildcard:
-            # Wildcard matches any character
-            for next_char, child in node.children.items():
-                self._match_pattern(child, pattern, pos + 1,
-                                  current_word + next_char, wildcard, words)
-        else:
-            # Exact character match
-            if char in node.children:
-                self._match_pattern(node.children[char], pattern, pos + 1,
-                                  current_word + char, wildcard, words)
-
-    def get_stats(self) -> dict:
-        """Get statistics about the trie."""
+        total_bytes = node_bytes + dict_bytes + word_bytes
         return {
             'total_words': self.word_count,
-            'total_nodes': self._count_nodes(self.root),
-            'max_depth': self._max_depth(self.root),
-            'words_by_length': {
-                length: len(self.get_words_by_length(length))
-                for length in range(1, 11)
+            'total_nodes': total_nodes,
+            'max_depth': max_depth,
+            'words_by_length': words_by_length,
+            'memory': {
+                'node_bytes': node_bytes,
+                'dict_bytes': dict_bytes,
+                'word_bytes': word_bytes,
+                'total_bytes': total_bytes,
+                'bytes_per_node': total_bytes / total_nodes,
             }
         }
 
-    def _count_nodes(self, node: TrieNode) -> int:
-        """Count total nodes in the trie."""
-        count = 1
-        for child in node.children.values():
-            count += self._count_nodes(child)
-        return count
-
-    def _max_depth(self, node: TrieNode) -> int:
-        """Find maximum depth of the trie."""
-        if not node.children:
-            return 0
-
-        return 1 + max(self._max_depth(child) for child in node.children.values())
-
 
 def load_words_from_file(filepath: str) -> WordTrie:
     """
@@ -239,6 +666,45 @@ def load_words_from_file(filepath: str) -> WordTrie:
         raise IOError(f"Error reading word file: {e}")
 
 
+def measure_load_memory(filepath: str) -> dict:
+    """
+    Measure the memory allocated while loading a word file into a WordTrie.
+
+    Unlike get_stats, which sums sys.getsizeof over the final object graph,
+    this traces every allocation with tracemalloc, so it also captures
+    interpreter overhead such as allocator rounding.
+
+    Args:
+        filepath: Path to the text file containing words (one per line)
+
+    Returns:
+        Dictionary with the trie, the retained and peak traced bytes, and
+        retained bytes per node and per word
+    """
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        trie = load_words_from_file(filepath)
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not already_tracing:
+            tracemalloc.stop()
+
+    retained = after - before
+    total_nodes = trie.get_stats()['total_nodes']
+    return {
+        'trie': trie,
+        'retained_bytes': retained,
+        'peak_bytes': peak - before,
+        'bytes_per_node': retained / total_nodes,
+        'bytes_per_word': retained / trie.word_count if trie.word_count else 0.0,
+    }
+
+
 def create_word_trie() -> WordTrie:
     """
     Create and return a WordTrie loaded with words from words_alpha.txt.
@@ -262,6 +728,9 @@ if __name__ == "__main__":
         print(f"Total words: {stats['total_words']}")
         print(f"Total nodes: {stats['total_nodes']}")
         print(f"Max depth: {stats['max_depth']}")
+        print(f"Memory: {stats['memory']['total_bytes']} bytes "
+              f"({stats['memory']['bytes_per_node']:.1f} bytes/node, "
+              f"{stats['memory']['dict_bytes']} bytes in dicts)")
 
         print(f"\nWords by length:")
         for length, count in stats['words_by_length'].items():
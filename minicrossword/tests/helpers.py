@@ -0,0 +1,36 @@
+"""
+Word lists and dictionary builders shared by the tests.
+"""
+
+import itertools
+from typing import Iterable
+from src.crossword_mini.sharded_trie import ShardedWordTrie
+from src.crossword_mini.word_trie import WordTrie
+
+# A 5x5 square: CRANE's only fill from these ten words has these rows and columns
+ACROSSES = ["CRANE", "LUNAR", "UPUPA", "MERUS", "PEASE"]
+DOWNS = ["CLUMP", "RUPEE", "ANURA", "NAPUS", "ERASE"]
+WORDS = ACROSSES + DOWNS
+
+# HEART's only fill from these words is a symmetric square, which repeats every word
+SYMMETRIC_SQUARE = ["HEART", "EMBER", "ABUSE", "RESIN", "TREND"]
+
+# Every A/B word with an even number of Bs: dozens of fills per seed
+EVEN_AB_WORDS = sorted(''.join(letters) for letters in itertools.product('AB', repeat=5)
+                       if letters.count('B') % 2 == 0)
+
+
+def make_trie(words: Iterable[str]) -> WordTrie:
+    """Build a WordTrie holding ``words``."""
+    trie = WordTrie()
+    for word in words:
+        trie.insert(word)
+    return trie
+
+
+def make_sharded(words: Iterable[str]) -> ShardedWordTrie:
+    """Build a lazily loaded trie with one shard per first letter."""
+    shards = {}
+    for word in words:
+        shards.setdefault(word[0], []).append(word)
+    return ShardedWordTrie(shards, lambda key: shards[key])
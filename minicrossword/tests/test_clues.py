@@ -0,0 +1,96 @@
+"""
+Tests for the clue store and providers.
+"""
+
+import asyncio
+import pytest
+from src.crossword_mini.clues import ClueProvider, ClueStore, StubClueProvider
+from src.crossword_mini.grid import Grid
+from tests.helpers import ACROSSES, DOWNS
+
+
+class LowercaseProvider(ClueProvider):
+    """Provider that answers with lowercase, padded words."""
+
+    async def get_clues(self, words):
+        return {f" {word.lower()}": f"Clue for {word}" for word in words}
+
+
+class TestClueStore:
+    """Test cases for ClueStore."""
+
+    def test_lookup_batches_missing_words(self):
+        """Test that only uncached words reach the provider, in one batch."""
+        store = ClueStore()
+        provider = StubClueProvider({"crane": "Tall wader"})
+
+        first = asyncio.run(store.lookup(["crane", "LUNAR"], provider))
+        second = asyncio.run(store.lookup(["CRANE", "LUNAR", "MERUS"], provider))
+
+        assert first["CRANE"] == "Tall wader"
+        assert set(second) == {"CRANE", "LUNAR", "MERUS"}
+        assert provider.calls == [["CRANE", "LUNAR"], ["MERUS"]]
+
+    def test_provider_keys_are_normalized(self):
+        """Test that lowercase provider keys are found in the result and the cache."""
+        store = ClueStore()
+
+        clues = asyncio.run(store.lookup(["crane"], LowercaseProvider()))
+
+        assert clues == {"CRANE": "Clue for CRANE"}
+        assert store.get("CRANE") == "Clue for CRANE"
+        assert asyncio.run(store.precompute(["LUNAR"], LowercaseProvider())) == 1
+        assert store.get("LUNAR") == "Clue for LUNAR"
+
+    def test_provider_is_abstract(self):
+        """Test that a provider without get_clues cannot be created."""
+        with pytest.raises(TypeError):
+            ClueProvider()
+
+    def test_clues_for_grid(self):
+        """Test clue lookup for the ten entries of a grid."""
+        grid = Grid()
+        for row, word in enumerate(ACROSSES):
+            grid.place_word(word, row)
+        store = ClueStore()
+        provider = StubClueProvider({"CLUMP": "Cluster"})
+
+        clues = asyncio.run(store.clues_for_grid(grid, provider))
+
+        assert len(clues['across']) == 5
+        assert clues['down'][0] == "Cluster"
+        assert len(provider.calls) == 1
+        assert sorted(provider.calls[0]) == sorted(ACROSSES + DOWNS)
+
+    def test_store_persists(self, tmp_path):
+        """Test that clues survive reopening the database."""
+        path = str(tmp_path / "clues.db")
+        store = ClueStore(path)
+        store.put_many({"crane": "Tall wader"})
+        store.close()
+
+        reopened = ClueStore(path)
+        assert reopened.get("CRANE") == "Tall wader"
+        assert reopened.get("LUNAR") is None
+        assert len(reopened) == 1
+
+    def test_precompute_skips_cached_words(self):
+        """Test offline precomputation in batches."""
+        store = ClueStore()
+        store.put_many({"CRANE": "Tall wader"})
+        provider = StubClueProvider()
+
+        added = asyncio.run(store.precompute(ACROSSES + DOWNS, provider, batch_size=4))
+
+        assert added == 9
+        assert len(store) == 10
+        assert store.get("CRANE") == "Tall wader"
+        assert [len(batch) for batch in provider.calls] == [4, 4, 1]
+
+    def test_get_many_large_batch(self):
+        """Test lookups with more words than SQLite's parameter limit."""
+        store = ClueStore()
+        words = [f"W{i:04d}" for i in range(1200)]
+        store.put_many({word: "clue" for word in words})
+
+        assert len(store.get_many(words)) == 1200
@@ -0,0 +1,203 @@
+"""
+Tests for counting puzzle completions.
+"""
+
+import itertools
+import random
+from collections import Counter
+import pytest
+from src.crossword_mini.counting import PuzzleCounter, count_all_seeds, count_puzzles, sample_puzzle
+from src.crossword_mini.crossword_generator import generate_all_puzzles
+from src.crossword_mini.dawg import WordDawg
+from tests.helpers import ACROSSES, DOWNS, EVEN_AB_WORDS, SYMMETRIC_SQUARE, make_sharded, make_trie
+
+WORDS = ACROSSES + DOWNS + ["CRAMP", "LUNES", "PEASY", "ERASY"]
+
+
+class TestWordDawg:
+    """Test cases for the minimized automaton."""
+
+    def test_dawg_accepts_trie_words(self):
+        """Test that the automaton accepts exactly the trie's words."""
+        trie = make_trie(["CATS", "BATS", "CAT", "BAT", "DOG"])
+        dawg = WordDawg(trie)
+
+        for word in ["CATS", "BATS", "CAT", "BAT", "DOG"]:
+            assert dawg.is_final[dawg.walk(word)]
+        assert not dawg.is_final[dawg.walk("CA")]
+        assert dawg.walk("COW") is None
+
+    def test_dawg_merges_equal_suffix_sets(self):
+        """Test that prefixes with the same completions share a state."""
+        trie = make_trie(["CATS", "BATS", "CAT", "BAT"])
+        dawg = WordDawg(trie)
+
+        assert dawg.walk("CA") == dawg.walk("BA")
+        # root, {ATS, AT}, {TS, T}, {S, ''}, {''}
+        assert dawg.state_count == 5
+
+    def test_suffix_counts(self):
+        """Test the number of words completable from each state."""
+        trie = make_trie(["CATS", "BATS", "CAT", "BAT", "DOG"])
+        dawg = WordDawg(trie)
+
+        assert dawg.suffix_counts[dawg.root] == 5
+        assert dawg.suffix_counts[dawg.walk("CA")] == 2
+        assert dawg.suffix_counts[dawg.walk("CATS")] == 1
+
+
+class TestCountPuzzles:
+    """Test cases for count_puzzles and count_all_seeds."""
+
+    def test_count_matches_enumeration(self):
+        """Test that counts match generate_all_puzzles."""
+        trie = make_trie(WORDS)
+        for seed in ["CRANE", "CRAMP", "LUNAR"]:
+            assert count_puzzles(seed, trie) == len(generate_all_puzzles(seed, trie))
+        assert count_puzzles("CRANE", trie) == 2
+
+    def test_count_excludes_repeated_words(self):
+        """Test that a symmetric square, which repeats every word, is not counted."""
+        trie = make_trie(SYMMETRIC_SQUARE)
+        assert count_puzzles("HEART", trie) == 0
+
+    def test_count_matches_enumeration_with_repeats(self):
+        """Test counts against enumeration on dictionaries where many fills repeat a word."""
+        rng = random.Random(5)
+        every_word = [''.join(letters) for letters in itertools.product('AB', repeat=5)]
+        for _ in range(10):
+            trie = make_trie(rng.sample(every_word, 16))
+            counter = PuzzleCounter(trie)
+            for seed in every_word[::4]:
+                assert counter.count(seed) == len(generate_all_puzzles(seed, trie))
+
+    def test_count_on_sharded_trie(self):
+        """Test that counting loads the shards a lazily loaded trie has not reached yet."""
+        trie = make_sharded(WORDS)
+
+        assert count_puzzles("CRANE", trie) == 2
+        assert trie.pending_shards == set()
+
+    def test_count_dead_seed(self):
+        """Test seeds with a column that no word starts with."""
+        trie = make_trie(WORDS)
+        assert count_puzzles("ZZZZZ", trie) == 0
+        assert count_puzzles("CAT", trie) == 0
+
+    def test_count_all_seeds(self):
+        """Test that batch counting agrees with counting seeds one at a time."""
+        trie = make_trie(WORDS)
+        counts = count_all_seeds(trie)
+
+        assert set(counts) == set(WORDS)
+        for seed, count in counts.items():
+            assert count == count_puzzles(seed, trie)
+
+    def test_counter_memo_is_reused(self):
+        """Test that a second count of the same seed is answered from the memo."""
+        counter = PuzzleCounter(make_trie(WORDS))
+        first = counter.count("CRANE")
+        memo_size = len(counter.memo)
+
+        assert counter.count("CRANE") == first
+        assert len(counter.memo) == memo_size
+
+    def test_memo_shared_between_seeds(self):
+        """Test that state counts stay memoized when another seed is counted."""
+        counter = PuzzleCounter(make_trie(WORDS))
+        counter.count("LUNAR")
+        lunar_memo = dict(counter.memo)
+        counter.count("CRANE")
+
+        assert lunar_memo.items() <= dict(counter.memo).items()
+        assert counter.count("LUNAR") == count_puzzles("LUNAR", make_trie(WORDS))
+
+    def test_memo_size_is_bounded(self):
+        """Test that the state memos evict old entries instead of growing past their size."""
+        trie = make_trie(EVEN_AB_WORDS)
+        counter = PuzzleCounter(trie, max_memo_size=5)
+        counts = {seed: counter.count(seed) for seed in EVEN_AB_WORDS}
+
+        assert len(counter.memo) <= 5
+        assert len(counter.branch_memo) <= 5
+        assert counter.evictions > 0
+        assert counts == count_all_seeds(trie)
+
+
+class TestSamplePuzzle:
+    """Test cases for uniform fill sampling."""
+
+    @pytest.fixture
+    def trie(self):
+        return make_trie(EVEN_AB_WORDS)
+
+    def test_row_words_lead_to_their_states(self, trie):
+        """Test that each row word leads to the column states it is grouped under."""
+        counter = PuzzleCounter(trie)
+        states = counter.seed_state("ABBAA")
+
+        for next_states, words in counter.row_words(states).items():
+            for word in words:
+                assert tuple(counter.dawg.edges[state][char]
+                             for state, char in zip(states, word)) == next_states
+
+    def test_samples_are_uniform(self, trie):
+        """Test that draws cover every fill with roughly equal frequency."""
+        fills = {tuple(grid.get_acrosses()) for grid in generate_all_puzzles("ABBAA", trie)}
+        counter = PuzzleCounter(trie)
+        rng = random.Random(7)
+        draws = Counter(tuple(counter.sample("ABBAA", rng).get_acrosses())
+                        for _ in range(50 * len(fills)))
+
+        assert set(draws) == fills
+        assert max(draws.values()) < 3 * min(draws.values())
+
+    def test_repeated_words_never_drawn(self):
+        """Test that a seed whose only fill repeats every word has nothing to draw."""
+        counter = PuzzleCounter(make_trie(SYMMETRIC_SQUARE))
+
+        assert counter.sample("HEART") is None
+
+    def test_reproducible(self, trie):
+        """Test that the same random seed gives the same puzzle."""
+        first = sample_puzzle("ABBAA", trie, random_seed=3)
+
+        assert first.get_acrosses() == sample_puzzle("ABBAA", trie, random_seed=3).get_acrosses()
+        assert sample_puzzle("CRANE", make_trie(WORDS)).get_acrosses()[0] == "CRANE"
+        assert sample_puzzle("ZZZZZ", trie) is None
+
+    def test_shared_counter(self, trie):
+        """Test that a passed counter is used and keeps its memo between draws."""
+        counter = PuzzleCounter(trie)
+        first = sample_puzzle("ABBAA", trie, 3, counter)
+        memo_size = len(counter.memo)
+
+        assert first.get_acrosses() == sample_puzzle("ABBAA", trie, 3).get_acrosses()
+        assert sample_puzzle("ABBAA", trie, 4, counter) is not None
+        assert len(counter.memo) == memo_size
+
+    def test_memos_stay_small_over_many_draws(self, trie):
+        """Test that repeated draws add no memo entries and another seed replaces the walk's."""
+        counter = PuzzleCounter(trie)
+        rng = random.Random(5)
+        counter.sample("ABBAA", rng)
+        sizes = (len(counter.memo), len(counter.branch_memo), len(counter.distinct_memo))
+        # Last-row counts are recomputed rather than kept per four-row prefix
+        assert max(len(rows) for rows in counter.distinct_memo) == 3
+
+        for _ in range(200):
+            counter.sample("ABBAA", rng)
+        assert (len(counter.memo), len(counter.branch_memo), len(counter.distinct_memo)) == sizes
+
+        counter.sample("BAABA", rng)
+        fresh = PuzzleCounter(trie)
+        fresh.sample("BAABA", rng)
+        assert len(counter.distinct_memo) == len(fresh.distinct_memo)
+        assert len(counter.memo) <= counter.max_memo_size
+
+    def test_sample_on_sharded_trie(self):
+        """Test that sampling loads the shards a lazily loaded trie has not reached yet."""
+        fills = [grid.get_acrosses() for grid in generate_all_puzzles("CRANE", make_trie(WORDS))]
+        grid = sample_puzzle("CRANE", make_sharded(WORDS), random_seed=1)
+
+        assert grid.get_acrosses() in fills
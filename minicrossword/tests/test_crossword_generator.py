@@ -0,0 +1,400 @@
+"""
+Tests for the crossword generator search.
+"""
+
+import asyncio
+import itertools
+import pytest
+from src.crossword_mini.crossword_generator import (
+    LeastConstrainingOrder, NogoodTable, SearchBudget, SearchBudgetExceeded, SearchCancelled,
+    ThemeIndex, _ThemedSearch, _fill_themed_slots, generate_all_puzzles,
+    generate_all_word_squares, generate_puzzle, generate_puzzle_async, generate_puzzle_from_grid,
+    generate_puzzle_with_words, generate_themed_puzzle, generate_word_square,
+    generate_word_square_async, iter_word_squares)
+from src.crossword_mini.grid import Direction, Grid
+from src.crossword_mini.overlay import OverlayDictionary
+from src.crossword_mini.row_search import column_cursors
+from tests.helpers import ACROSSES, DOWNS, SYMMETRIC_SQUARE, WORDS, make_sharded, make_trie
+
+
+def _entries(grid):
+    return grid.get_acrosses() + [grid.get_column(col) for col in range(grid.size)]
+
+
+class TestAllDifferent:
+    """Test cases for repeated-word prevention."""
+
+    @pytest.fixture
+    def square_trie(self):
+        """A trie whose only fill for HEART is a symmetric word square."""
+        return make_trie(SYMMETRIC_SQUARE)
+
+    def test_generate_all_puzzles_rejects_repeated_words(self, square_trie):
+        """Test that a symmetric square, which repeats every word, is not emitted."""
+        assert generate_all_puzzles("HEART", square_trie) == []
+
+    def test_generate_puzzle_rejects_repeated_words(self, square_trie):
+        """Test that generate_puzzle does not return a grid with repeated words."""
+        assert generate_puzzle("HEART", square_trie) is None
+
+    def test_distinct_fill_is_found(self):
+        """Test that a fill with ten distinct entries is still found."""
+        trie = make_trie(WORDS)
+
+        puzzles = generate_all_puzzles("CRANE", trie)
+
+        assert [grid.get_acrosses() for grid in puzzles] == [ACROSSES]
+        entries = _entries(puzzles[0])
+        assert len(entries) == len(set(entries))
+
+
+class TestPartialFill:
+    """Test cases for generation from arbitrary pre-filled cells."""
+
+    @pytest.fixture
+    def trie(self):
+        return make_trie(ACROSSES + DOWNS + ["CRAMP", "LOSER"])
+
+    def test_pinned_down_word(self, trie):
+        """Test pinning a word in a middle column."""
+        grid = generate_puzzle_with_words(trie, downs={2: "ANURA"})
+        assert grid.get_acrosses() == ACROSSES
+
+    def test_pinned_across_and_down(self, trie):
+        """Test pinning several words at once."""
+        grid = generate_puzzle_with_words(trie, acrosses={3: "MERUS"}, downs={4: "ERASE"})
+        assert grid.get_acrosses() == ACROSSES
+        assert [grid.get_column(col) for col in range(5)] == DOWNS
+
+    def test_query_cache_during_fill(self, trie):
+        """Test that a cached dictionary answers the fill's repeated slot queries."""
+        expected = generate_puzzle_with_words(trie, downs={2: "ANURA"}).get_acrosses()
+        cache = trie.enable_query_cache()
+
+        assert generate_puzzle_with_words(trie, downs={2: "ANURA"}).get_acrosses() == expected
+        assert cache.get_stats()['hits'] > 0
+
+    def test_pinned_cells(self, trie):
+        """Test pre-filled single cells and that the input grid is untouched."""
+        grid = Grid()
+        grid.set_cell(2, 2, "U")
+        grid.set_cell(4, 0, "P")
+
+        result = generate_puzzle_from_grid(grid, trie)
+
+        assert result.get_acrosses() == ACROSSES
+        assert grid.get_cell(0, 0) == ""
+
+    def test_unfillable_pins(self, trie):
+        """Test that impossible pins return None."""
+        assert generate_puzzle_with_words(trie, acrosses={2: "LOSER"}) is None
+
+    def test_pinned_word_outside_dictionary(self, trie):
+        """Test that a pinned word does not need to be in the dictionary."""
+        small = make_trie(ACROSSES[1:] + DOWNS)
+        grid = generate_puzzle_with_words(small, acrosses={0: "CRANE"})
+        assert grid.get_acrosses() == ACROSSES
+
+    def test_repeated_pins_outside_dictionary(self, trie):
+        """Test that pinned entries outside the dictionary must still be distinct."""
+        grid = Grid()
+        for row in range(grid.size):
+            grid.place_word("QQQQQ", row)
+
+        assert generate_puzzle_from_grid(grid, trie) is None
+        assert generate_puzzle_with_words(trie, acrosses={0: "CRANE", 4: "CRANE"}) is None
+
+    def test_conflicting_pins(self, trie):
+        """Test that pins disagreeing on a shared cell raise ValueError."""
+        with pytest.raises(ValueError):
+            generate_puzzle_with_words(trie, acrosses={0: "CRANE"}, downs={0: "LUNAR"})
+
+    def test_wrong_length_pin(self, trie):
+        """Test that pins of the wrong length raise ValueError."""
+        with pytest.raises(ValueError):
+            generate_puzzle_with_words(trie, acrosses={0: "CAT"})
+
+
+class TestColumnCursors:
+    """Test cases for the column trie cursors of the search."""
+
+    def test_cursors_match_prefix_walks(self):
+        """Test that cursors are the nodes of the column prefixes."""
+        trie = make_trie(ACROSSES + DOWNS)
+        grid = Grid()
+        grid.place_word("CRANE", 0)
+        grid.place_word("LUNAR", 1)
+
+        cursors = column_cursors(grid, 2, trie)
+
+        assert [node.children.keys() for node in cursors] == \
+            [trie._find_node(prefix).children.keys() for prefix in ["CL", "RU", "AN", "NA", "ER"]]
+        assert column_cursors(grid, 2, OverlayDictionary([trie])) is None
+
+    def test_last_row_completes_columns(self):
+        """Test that a column that is only a prefix of a longer word is rejected."""
+        trie = make_trie(ACROSSES + DOWNS[:4] + ["ERASED"])
+
+        assert generate_puzzle("CRANE", trie) is None
+        assert generate_puzzle("CRANE", OverlayDictionary([trie])) is None
+        assert generate_puzzle("CRANE", make_trie(ACROSSES + DOWNS)).get_acrosses() == ACROSSES
+
+
+class TestNogoodTable:
+    """Test cases for the dead-state table used by generate_puzzle."""
+
+    @pytest.fixture
+    def trie(self):
+        return make_trie(ACROSSES + DOWNS + ["CRAMP", "LOSER"])
+
+    def _seed_state(self, table, seed):
+        edges = table.dawg.edges[table.dawg.root]
+        return (1, tuple(edges[char] for char in seed))
+
+    def test_same_result_with_table(self, trie):
+        """Test that the table does not change which puzzle is found."""
+        table = NogoodTable(trie)
+        grid = generate_puzzle("CRANE", trie, table)
+        assert grid.get_acrosses() == ACROSSES
+
+    def test_same_result_on_sharded_trie(self):
+        """Test that a table over a lazily loaded trie still finds the puzzle."""
+        trie = make_sharded(ACROSSES + DOWNS)
+
+        grid = generate_puzzle("CRANE", trie, NogoodTable(trie))
+        assert grid.get_acrosses() == ACROSSES
+
+    def test_dead_seed_is_recorded(self, trie):
+        """Test that an infeasible seed is answered from the table the second time."""
+        table = NogoodTable(trie)
+
+        assert generate_puzzle("CRUMP", trie, table) is None
+        assert self._seed_state(table, "CRUMP") in table.dead
+
+        misses = table.misses
+        assert generate_puzzle("CRUMP", trie, table) is None
+        assert table.hits == 1
+        assert table.misses == misses
+
+    def test_repeated_word_failures_are_not_recorded(self):
+        """Test that states that only fail because of repeated words stay searchable."""
+        trie = make_trie(SYMMETRIC_SQUARE)
+        table = NogoodTable(trie)
+
+        assert generate_puzzle("HEART", trie, table) is None
+        assert len(table) == 0
+
+    def test_table_is_size_capped(self, trie):
+        """Test LRU eviction and the stats counters."""
+        table = NogoodTable(trie, max_size=2)
+        for state in ["A", "B", "C"]:
+            table.add(state)
+
+        assert len(table) == 2
+        assert not table.is_dead("A")
+        assert table.is_dead("C")
+
+        stats = table.get_stats()
+        assert stats['evictions'] == 1
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['hit_rate'] == 0.5
+
+
+class TestLeastConstrainingOrder:
+    """Test cases for least-constraining-value row ordering."""
+
+    @pytest.fixture
+    def trie(self):
+        return make_trie(ACROSSES + DOWNS + ["CRAMP", "LOSER", "LUMPS"])
+
+    def test_rows_leaving_more_completions_come_first(self, trie):
+        """Test scoring by the product and by the minimum of column counts."""
+        ordering = LeastConstrainingOrder(trie)
+        # Empty columns: each letter scores the number of words starting with it
+        states = (ordering.dawg.root,) * 5
+
+        # CLUMP: C(3) L(3) U(1) M(1) P(1); LUNAR: L(3) U N A R (1 each)
+        assert ordering.order(["UPUPA", "LUNAR", "CLUMP"], states) == ["CLUMP", "LUNAR", "UPUPA"]
+        # Every minimum is 1, so ties fall back to alphabetical order
+        min_ordering = LeastConstrainingOrder(trie, 'min')
+        assert min_ordering.order(["UPUPA", "LUNAR", "CLUMP"], states) == ["CLUMP", "LUNAR", "UPUPA"]
+
+    def test_search_with_ordering(self, trie):
+        """Test that ordered search still finds a valid, distinct fill."""
+        grid = generate_puzzle("CRANE", trie, ordering=LeastConstrainingOrder(trie))
+        assert grid.get_acrosses() == ACROSSES
+
+        table = NogoodTable(trie)
+        ordering = LeastConstrainingOrder(trie, dawg=table.dawg)
+        assert generate_puzzle("CRUMP", trie, table, ordering=ordering) is None
+
+    def test_invalid_arguments(self, trie):
+        """Test an unknown score and an ordering built on another automaton."""
+        with pytest.raises(ValueError):
+            LeastConstrainingOrder(trie, 'max')
+        with pytest.raises(ValueError):
+            generate_puzzle("CRANE", trie, NogoodTable(trie), ordering=LeastConstrainingOrder(trie))
+
+
+class TestAsyncGeneration:
+    """Test cases for the cooperative generate_puzzle_async."""
+
+    @pytest.fixture
+    def trie(self):
+        return make_trie(ACROSSES + DOWNS + ["CRAMP", "LOSER"])
+
+    def test_matches_sync_search_with_progress(self, trie):
+        """Test that pausing does not change the result and reports progress."""
+        reports = []
+        grid = asyncio.run(generate_puzzle_async("CRANE", trie, yield_every=1,
+                                                 progress=reports.append))
+
+        assert grid.get_acrosses() == generate_puzzle("CRANE", trie).get_acrosses()
+        assert [report['nodes'] for report in reports] == list(range(1, len(reports) + 1))
+        assert reports[-1]['depth'] == 4
+        assert reports[-1]['best_rows'] == ACROSSES[:4]
+
+    def test_no_fill(self, trie):
+        """Test an infeasible seed with and without a nogood table."""
+        assert asyncio.run(generate_puzzle_async("CRUMP", trie, yield_every=1)) is None
+        assert asyncio.run(generate_puzzle_async("CRUMP", trie, NogoodTable(trie))) is None
+
+    def test_positional_arguments(self, trie):
+        """Test that the pause arguments keep their original positions."""
+        reports = []
+        grid = asyncio.run(generate_puzzle_async("CRANE", trie, None, None, 1, reports.append))
+
+        assert grid.get_acrosses() == ACROSSES
+        assert len(reports) > 1
+
+    def test_cancel(self, trie):
+        """Test that the cancel callback stops the search at the first pause."""
+        reports = []
+        with pytest.raises(SearchCancelled):
+            asyncio.run(generate_puzzle_async("CRANE", trie, yield_every=1,
+                                              progress=reports.append, cancelled=lambda: True))
+        assert len(reports) == 1
+
+    def test_budget(self, trie):
+        """Test that the node budget still applies."""
+        with pytest.raises(SearchBudgetExceeded):
+            asyncio.run(generate_puzzle_async("CRANE", trie, max_nodes=1))
+
+
+class TestThemedGeneration:
+    """Test cases for theme-constrained generation."""
+
+    THEME = ["lunar", "ERASE", "PEASE", "ZEBRA", "CAT"]
+
+    @pytest.fixture
+    def trie(self):
+        return make_trie(ACROSSES + DOWNS + ["CRAMP", "LOSER"])
+
+    def test_theme_index(self, trie):
+        """Test that unusable theme words are skipped."""
+        theme = ThemeIndex(self.THEME, trie)
+
+        assert theme.words == ["ERASE", "LUNAR", "PEASE"]
+        assert theme.skipped == ["CAT", "ZEBRA"]
+        assert theme.matches("?U?A?") == ["LUNAR"]
+        assert theme.count(generate_puzzle("CRANE", trie)) == 3
+
+    def test_theme_index_query_cache(self, trie):
+        """Test that the theme trie is cached along with the dictionary and gets hits."""
+        cache = trie.enable_query_cache()
+        theme = ThemeIndex(self.THEME, trie)
+
+        grid = generate_themed_puzzle(trie, theme, min_theme_words=3)
+
+        assert sorted(_entries(grid)) == sorted(ACROSSES + DOWNS)
+        assert cache.get_stats()['hits'] > 0
+        assert theme.trie.query_cache.get_stats()['hits'] > 0
+
+    def test_quota(self, trie):
+        """Test that the quota is met when reachable and proven unreachable otherwise."""
+        grid = generate_themed_puzzle(trie, self.THEME, min_theme_words=3)
+        assert sorted(_entries(grid)) == sorted(ACROSSES + DOWNS)
+
+        assert generate_themed_puzzle(trie, self.THEME, min_theme_words=4) is None
+        assert generate_themed_puzzle(trie, ["CRAMP", "LOSER"], min_theme_words=1) is None
+
+    def test_progress_counts_filled_slots(self, trie):
+        """Test that progress reports the filled slots, not a fixed row."""
+        budget = SearchBudget()
+        search = _ThemedSearch(ThemeIndex(self.THEME, trie), 3, False, budget)
+        grid = Grid()
+        slots = ([(Direction.ACROSS, row) for row in range(5)] +
+                 [(Direction.DOWN, col) for col in range(5)])
+
+        assert _fill_themed_slots(grid, slots, set(), trie, search)
+        assert budget.get_progress()['depth'] == 10
+        assert sorted(budget.best_rows) == sorted(ACROSSES + DOWNS)
+
+    def test_maximize_and_partial_grid(self, trie):
+        """Test maximizing and completing a partially filled grid."""
+        theme = ThemeIndex(self.THEME, trie)
+        grid = generate_themed_puzzle(trie, theme, maximize=True)
+        assert theme.count(grid) == 3
+
+        start = Grid()
+        start.place_word("CRANE", 0)
+        grid = generate_themed_puzzle(trie, theme, min_theme_words=2, grid=start)
+        assert grid.get_acrosses() == ACROSSES
+        assert start.get_acrosses()[1] == ''
+
+    def test_budget(self, trie):
+        """Test that the node budget applies."""
+        with pytest.raises(SearchBudgetExceeded):
+            generate_themed_puzzle(trie, self.THEME, min_theme_words=3, max_nodes=1)
+
+
+class TestWordSquares:
+    """Test cases for the symmetric word-square mode."""
+
+    SQUARE = SYMMETRIC_SQUARE
+
+    @pytest.fixture
+    def trie(self):
+        return make_trie(self.SQUARE + ACROSSES + DOWNS + ["HARES", "EASEL", "ABBOT", "TENSE"])
+
+    def test_square(self, trie):
+        """Test that rows equal columns."""
+        grid = generate_word_square("heart", trie)
+
+        assert grid.get_acrosses() == self.SQUARE
+        assert [grid.get_column(col) for col in range(5)] == self.SQUARE
+        assert generate_word_square("CRANE", trie) is None
+
+    def test_all_squares_match_brute_force(self, trie):
+        """Test enumeration against checking every choice of four more rows."""
+        words = trie.get_words_by_length(5)
+        expected = []
+        for seed in ["HEART", "HARES", "CRANE"]:
+            for rows in itertools.permutations([word for word in words if word != seed], 4):
+                square = [seed] + list(rows)
+                if all(''.join(word[col] for word in square) == square[col] for col in range(5)):
+                    expected.append(square)
+
+        found = [grid.get_acrosses() for seed in ["HEART", "HARES", "CRANE"]
+                 for grid in generate_all_word_squares(seed, trie)]
+        assert sorted(found) == sorted(expected)
+
+    def test_budget_and_streaming(self, trie):
+        """Test the node budget and lazy enumeration."""
+        with pytest.raises(SearchBudgetExceeded):
+            generate_word_square("HEART", trie, max_nodes=1)
+        assert next(iter_word_squares("HEART", trie)).get_acrosses() == self.SQUARE
+        assert list(iter_word_squares("XYZZY", trie)) == []
+
+    def test_async(self, trie):
+        """Test progress reports and cancellation."""
+        reports = []
+        grid = asyncio.run(generate_word_square_async("HEART", trie, yield_every=1,
+                                                      progress=reports.append))
+        assert grid.get_acrosses() == self.SQUARE
+        assert reports[-1]['depth'] == 4
+
+        with pytest.raises(SearchCancelled):
+            asyncio.run(generate_word_square_async("HEART", trie, yield_every=1,
+                                                   cancelled=lambda: True))
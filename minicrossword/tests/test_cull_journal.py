@@ -0,0 +1,97 @@
+"""
+Tests for the append-only culling journal.
+"""
+
+import json
+import pytest
+from src.crossword_mini.cull_journal import CullJournal, kept_words, read_journal
+
+
+class TestCullJournal:
+    """Test cases for CullJournal and its readers."""
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        return str(tmp_path / "cull-state.txt")
+
+    def test_decisions_are_appended(self, path):
+        """Test that each decision is one appended line and survives reopening."""
+        journal = CullJournal(path)
+        journal.keep("crane")
+        journal.discard("peasy")
+        journal.keep("lunar")
+
+        with open(path) as f:
+            assert f.read() == "+crane\n-peasy\n+lunar\n"
+
+        reopened = CullJournal(path)
+        assert reopened.kept == ["crane", "lunar"]
+        assert reopened.discarded == ["peasy"]
+        assert "peasy" in reopened and "zebra" not in reopened
+        journal.close()
+        reopened.close()
+
+    def test_last_decision_wins_and_close_compacts(self, path):
+        """Test that a changed decision supersedes the old line until compaction."""
+        with CullJournal(path) as journal:
+            journal.keep("crane")
+            journal.discard("crane")
+            assert read_journal(path) == {"crane": False}
+
+        with open(path) as f:
+            assert f.read() == "-crane\n"
+
+    def test_automatic_compaction(self, path):
+        """Test compaction once superseded lines dominate the journal."""
+        journal = CullJournal(path, compact_ratio=2.0, min_compact_entries=4)
+        journal.keep("crane")
+        journal.discard("crane")
+        journal.keep("crane")
+        assert journal.entries == 3
+
+        journal.discard("crane")
+        assert journal.entries == 1
+        with open(path) as f:
+            assert f.read() == "-crane\n"
+        journal.close()
+
+    def test_torn_line_is_dropped(self, path):
+        """Test that a partial line from a crash is ignored and cut off."""
+        with open(path, "w") as f:
+            f.write("+crane\n-pea")
+
+        assert read_journal(path) == {"crane": True}
+        journal = CullJournal(path)
+        journal.keep("lunar")
+        journal.close()
+
+        with open(path) as f:
+            assert f.read() == "+crane\n+lunar\n"
+
+    def test_only_newlines_split_entries(self, path):
+        """Test that loading and reading agree on a word containing other line breaks."""
+        with CullJournal(path) as journal:
+            journal.keep("cr\rane")
+            journal.discard("lu\x1cnar")
+
+        assert read_journal(path) == {"cr\rane": True, "lu\x1cnar": False}
+        with CullJournal(path) as reopened:
+            assert reopened.decisions == read_journal(path)
+
+    def test_legacy_state_is_converted(self, path):
+        """Test reading and converting an old JSON state file."""
+        with open(path, "w") as f:
+            json.dump({"kept": ["crane", "lunar"], "discarded": ["peasy"]}, f, indent=2)
+
+        assert read_journal(path) == {"crane": True, "lunar": True, "peasy": False}
+        assert kept_words(read_journal(path)) == ["crane", "lunar"]
+
+        CullJournal(path).close()
+        with open(path) as f:
+            assert f.read() == "+crane\n+lunar\n-peasy\n"
+
+    def test_rejects_multiline_words(self, path):
+        """Test that a word cannot break the line format."""
+        with CullJournal(path) as journal:
+            with pytest.raises(ValueError):
+                journal.keep("two\nwords")
@@ -0,0 +1,65 @@
+"""
+Tests for the seed feasibility oracle and seed tables.
+"""
+
+import json
+import pytest
+from src.crossword_mini.feasibility import (
+    INFEASIBLE, UNKNOWN, SeedOracle, build_seed_table, load_seed_table,
+    write_seed_table)
+from tests.helpers import ACROSSES, DOWNS, make_trie
+
+
+@pytest.fixture
+def trie():
+    return make_trie(ACROSSES + DOWNS + ["CRAMP", "LOSER"])
+
+
+class TestSeedOracle:
+    """Test cases for the necessary-condition prechecks."""
+
+    def test_feasible_seed_passes(self, trie):
+        """Test that a seed with a fill is never rejected."""
+        assert SeedOracle(trie).check("crane") == {
+            'seed': 'CRANE', 'verdict': UNKNOWN, 'reason': 'passed the prechecks'}
+
+    def test_rejections(self, trie):
+        """Test each precheck on a seed it rejects."""
+        oracle = SeedOracle(trie)
+
+        assert "5 letters" in oracle.check("CRAN")['reason']
+        # No word starts with B
+        assert "column 2" in oracle.check("ABCDE")['reason']
+        assert "column 5" in oracle.check("MERUS")['reason']
+        # Row 2 would need a word matching [UO]PANU
+        result = oracle.check("LUNAR")
+        assert result['verdict'] == INFEASIBLE
+        assert "row 2" in result['reason']
+        assert oracle.stats == {'checked': 4, 'rejected': 4, 'table_hits': 0}
+
+    def test_table_verdicts(self, trie):
+        """Test that listed seeds are rejected before the prechecks."""
+        oracle = SeedOracle(trie, ['CRUMP'])
+
+        assert oracle.check("CRUMP")['verdict'] == INFEASIBLE
+        assert oracle.check("CRANE")['verdict'] == UNKNOWN
+        assert oracle.stats['table_hits'] == 1
+
+
+class TestSeedTable:
+    """Test cases for building and storing seed tables."""
+
+    def test_build_and_round_trip(self, trie, tmp_path):
+        """Test that only seeds proven to have no fill are listed and stored."""
+        table = build_seed_table(trie, ["CRANE", "CRUMP", "LOSER"])
+        assert table == ['CRUMP', 'LOSER']
+
+        path = str(tmp_path / "seeds.json")
+        write_seed_table(path, table)
+        assert load_seed_table(path) == {'CRUMP', 'LOSER'}
+        with open(path, encoding='utf-8') as f:
+            assert json.load(f) == {'infeasible': ['CRUMP', 'LOSER']}
+
+    def test_budget_leaves_seeds_out(self, trie):
+        """Test that seeds whose search exceeds the budget are not listed."""
+        assert build_seed_table(trie, ["CRANE", "LOSER"], max_nodes=1) == ['LOSER']
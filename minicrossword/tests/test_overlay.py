@@ -0,0 +1,66 @@
+"""
+Tests for layered dictionary overlays.
+"""
+
+import pytest
+from src.crossword_mini.counting import count_puzzles
+from src.crossword_mini.crossword_generator import generate_puzzle, generate_all_puzzles
+from src.crossword_mini.overlay import OverlayDictionary, read_discarded_words
+from tests.helpers import ACROSSES, DOWNS, make_trie
+
+
+class TestOverlayDictionary:
+    """Test cases for OverlayDictionary."""
+
+    @pytest.fixture
+    def bases(self):
+        return make_trie(ACROSSES + ["PEASY"]), make_trie(DOWNS + ["CRANE", "ERASY"])
+
+    def test_union_without_duplicates(self, bases):
+        """Test that words in several bases are returned once."""
+        overlay = OverlayDictionary(list(bases))
+        assert overlay.get_words_with_prefix("CR") == ["CRANE"]
+        assert overlay.word_count == 12
+
+    def test_include_and_exclude_layers(self, bases):
+        """Test include/exclude layers, with exclusions winning."""
+        overlay = OverlayDictionary(list(bases), include=["cramp", "zebra"], exclude=["zebra", "peasy"])
+
+        assert overlay.search("CRAMP")
+        assert not overlay.search("ZEBRA")
+        assert not overlay.search("PEASY")
+        assert set(overlay.get_words_with_pattern("PEAS?")) == {"PEASE"}
+        assert overlay.get_words_by_length(5).count("CRANE") == 1
+        assert overlay.next_letters("PEAS") == {"E"}
+        assert list(overlay.iter_words_with_letter_sets(["C", None, "A", None, None])) == ["CRANE", "CRAMP"]
+
+    def test_bases_are_shared(self, bases):
+        """Test that overlays reference the base tries instead of copying them."""
+        first = OverlayDictionary(list(bases), exclude=["PEASY"])
+        second = OverlayDictionary(list(bases), exclude=["ERASY"])
+        assert first.bases[0] is second.bases[0] is bases[0]
+
+    def test_word_ids_are_unique(self, bases):
+        """Test that IDs are unique across sources and shared words get one ID."""
+        overlay = OverlayDictionary(list(bases), include=["CRAMP"])
+        words = overlay.get_words_by_length(5)
+        ids = [overlay.get_word_id(word) for word in words]
+
+        assert None not in ids
+        assert len(set(ids)) == len(words)
+        assert overlay.get_word_id("crane") == overlay.get_word_id("CRANE")
+
+    def test_generation_with_overlay(self, bases):
+        """Test that the generators accept an overlay in place of a WordTrie."""
+        overlay = OverlayDictionary(list(bases), exclude=["PEASY"])
+
+        assert generate_puzzle("CRANE", overlay).get_acrosses() == ACROSSES
+        assert len(generate_all_puzzles("CRANE", overlay)) == 1
+        assert count_puzzles("CRANE", overlay) == 1
+        assert count_puzzles("CRANE", OverlayDictionary(list(bases))) == 2
+
+    def test_read_discarded_words(self, tmp_path):
+        """Test reading cull-state discards for an exclude layer."""
+        path = tmp_path / "state.json"
+        path.write_text('{"kept": ["crane"], "discarded": ["peasy"]}')
+        assert read_discarded_words(str(path)) == ["peasy"]
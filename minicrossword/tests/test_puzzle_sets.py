@@ -0,0 +1,68 @@
+"""
+Tests for stored puzzle sets and their incremental updates.
+"""
+
+import pytest
+from src.crossword_mini.crossword_generator import generate_all_puzzles
+from src.crossword_mini.puzzle_sets import PuzzleSet, dictionary_delta
+from tests.helpers import ACROSSES, EVEN_AB_WORDS, WORDS, make_trie
+
+SEED = "ABBAA"
+
+
+def _fills(seed, words):
+    return {tuple(grid.get_acrosses()) for grid in generate_all_puzzles(seed, make_trie(words))}
+
+
+@pytest.fixture
+def words():
+    return list(EVEN_AB_WORDS)
+
+
+class TestPuzzleSet:
+    """Test cases for enumerating and updating puzzle sets."""
+
+    def test_enumerate_matches_generate_all(self, words):
+        """Test that the stored set equals generate_all_puzzles."""
+        puzzles = PuzzleSet.enumerate(SEED, make_trie(words))
+
+        assert puzzles.grids == _fills(SEED, words)
+        assert len(puzzles) > 0
+        assert puzzles.get_grids()[0] in puzzles
+
+    @pytest.mark.parametrize("edited", [["BBAAB", "AABBA"], ["BABAA"], ["ABBBB", "AAAAA"]])
+    def test_remove_then_add(self, words, edited):
+        """Test that removing and re-adding words matches a fresh enumeration."""
+        remaining = [word for word in words if word not in edited]
+        puzzles = PuzzleSet.enumerate(SEED, make_trie(words))
+
+        _, dropped = puzzles.apply_delta(make_trie(remaining), removed=edited)
+        assert puzzles.grids == _fills(SEED, remaining)
+        assert dropped > 0
+
+        added, _ = puzzles.apply_delta(make_trie(words), added=edited)
+        assert puzzles.grids == _fills(SEED, words)
+        assert added == dropped
+
+    def test_added_words_make_first_fills(self):
+        """Test adding the words that give a seed with no fills its first one."""
+        puzzles = PuzzleSet.enumerate("CRANE", make_trie(WORDS[:-2]))
+        assert len(puzzles) == 0
+
+        assert puzzles.apply_delta(make_trie(WORDS), added=WORDS[-2:]) == (1, 0)
+        assert puzzles.get_grids()[0].get_acrosses() == ACROSSES
+
+    def test_dictionary_delta(self):
+        """Test comparing word lists."""
+        assert dictionary_delta(["crane", "lunar", ""], ["LUNAR", "upupa "]) == ({"UPUPA"}, {"CRANE"})
+
+    def test_save_and_load(self, words, tmp_path):
+        """Test that a saved set reloads with the same grids and index."""
+        puzzles = PuzzleSet.enumerate(SEED, make_trie(words))
+        path = str(tmp_path / "puzzles.json")
+        puzzles.save(path)
+
+        loaded = PuzzleSet.load(path)
+        assert loaded.seed_word == SEED
+        assert loaded.grids == puzzles.grids
+        assert loaded.index == puzzles.index
@@ -0,0 +1,62 @@
+"""
+Tests for top-k puzzle ranking.
+"""
+
+import pytest
+from src.crossword_mini.crossword_generator import generate_all_puzzles
+from src.crossword_mini.ranking import PrefixScores, best_puzzles
+from tests.helpers import EVEN_AB_WORDS, make_trie
+
+
+def _entries(grid):
+    return grid.get_acrosses() + [grid.get_column(col) for col in range(grid.size)]
+
+
+def _binary_value(word):
+    return int(word.replace('A', '0').replace('B', '1'), 2)
+
+
+def _count_b(word):
+    return word.count('B')
+
+
+@pytest.fixture
+def trie():
+    return make_trie(EVEN_AB_WORDS)
+
+
+class TestPrefixScores:
+    """Test cases for the per-prefix score maxima."""
+
+    def test_best_scores(self, trie):
+        """Test word scores and prefix maxima."""
+        scores = PrefixScores(trie, _binary_value)
+
+        assert scores.word_score("ABBAA") == 12
+        assert scores.best("") == 30  # BBBBA
+        assert scores.best("AB") == 15  # ABBBB
+        assert scores.best("AAAAB") is None
+
+
+class TestBestPuzzles:
+    """Test cases for best_puzzles against exhaustive enumeration."""
+
+    @pytest.mark.parametrize("score", [_binary_value, _count_b])
+    @pytest.mark.parametrize("k", [1, 5, 100])
+    def test_matches_exhaustive(self, trie, score, k):
+        """Test that the top k equals sorting every fill, ties included."""
+        ranked = sorted(((sum(score(entry) for entry in _entries(grid)), grid.get_acrosses())
+                         for grid in generate_all_puzzles("ABBAA", trie)),
+                        key=lambda item: (-item[0], item[1]))
+
+        result = best_puzzles("ABBAA", trie, k, score)
+
+        assert [(total, grid.get_acrosses()) for total, grid in result] == ranked[:k]
+
+    def test_shared_prefix_scores(self, trie):
+        """Test reusing PrefixScores and seeds without fills."""
+        scores = PrefixScores(trie, _count_b)
+
+        assert len(best_puzzles("BBBBA", trie, 3, _count_b, scores)) == 3
+        assert best_puzzles("AAAAA", trie, 3, _count_b, scores) == []
+        assert best_puzzles("ABBAA", trie, 0, _count_b, scores) == []
@@ -0,0 +1,176 @@
+"""
+Tests for the local puzzle generation service.
+"""
+
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src.crossword_mini.service import (
+    _WORKER_NOGOODS, _WORKER_ORDERINGS, _WORKER_TRIES, PuzzleService, _attach_worker,
+    _generate_in_worker)
+from src.crossword_mini.shared_trie import SharedWordTrie
+from src.crossword_mini.word_trie import load_words_from_file
+from tests.helpers import WORDS
+
+
+async def _http_get(port, path):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+
+    head, _, body = response.partition(b'\r\n\r\n')
+    status = int(head.split()[1])
+    return status, json.loads(body)
+
+
+class TestPuzzleService:
+    """Test cases for PuzzleService over localhost."""
+
+    @pytest.fixture
+    def dictionary(self, tmp_path):
+        path = tmp_path / "words.txt"
+        path.write_text("\n".join(WORDS) + "\n")
+        return {'mini': str(path)}
+
+    def _run(self, dictionary, scenario, **kwargs):
+        async def run():
+            service = PuzzleService(dictionary, workers=1, **kwargs)
+            await service.start()
+            try:
+                return await scenario(service)
+            finally:
+                await service.close()
+        return asyncio.run(run())
+
+    def test_puzzle_over_http(self, dictionary):
+        """Test generating a puzzle through the HTTP endpoint."""
+        async def scenario(service):
+            return await _http_get(service.port, "/puzzle?seed=crane")
+
+        status, body = self._run(dictionary, scenario)
+
+        assert status == 200
+        assert body['status'] == 'ok'
+        assert body['grid'] == WORDS[:5]
+        assert body['dictionary'] == 'mini'
+
+    def test_no_fill(self, dictionary):
+        """Test a seed with no fill."""
+        async def scenario(service):
+            return await _http_get(service.port, "/puzzle?seed=CRUMP")
+
+        status, body = self._run(dictionary, scenario)
+        assert status == 200
+        assert body['status'] == 'no_fill'
+        assert body['grid'] is None
+
+    def test_concurrent_requests_are_coalesced(self, dictionary):
+        """Test that concurrent requests for one seed share a computation."""
+        async def scenario(service):
+            results = await asyncio.gather(*[service.get_puzzle("CRANE") for _ in range(3)])
+            return results, service.get_stats()
+
+        results, stats = self._run(dictionary, scenario)
+
+        assert all(result['grid'] == WORDS[:5] for result in results)
+        assert stats['computations'] == 1
+        assert stats['coalesced'] == 2
+
+    def test_results_are_cached_with_eviction(self, dictionary):
+        """Test cache hits and LRU eviction."""
+        async def scenario(service):
+            await service.get_puzzle("CRANE")
+            await service.get_puzzle("CRUMP")
+            evicting = await service.get_puzzle("LUNAR")
+            cached = await service.get_puzzle("LUNAR")
+            recomputed = await service.get_puzzle("CRANE")
+            return evicting, cached, recomputed, service.get_stats()
+
+        evicting, cached, recomputed, stats = self._run(dictionary, scenario, cache_size=2)
+
+        assert not evicting['cached']
+        assert cached['cached']
+        assert not recomputed['cached']
+        assert stats['cache_hits'] == 1
+        assert stats['evictions'] == 2
+        assert stats['computations'] == 4
+
+    def test_budget_exceeded_is_not_cached(self, dictionary):
+        """Test that a node budget is applied and its outcome not cached."""
+        async def scenario(service):
+            limited = await service.get_puzzle("CRANE", max_nodes=0)
+            full = await service.get_puzzle("CRANE")
+            return limited, full
+
+        limited, full = self._run(dictionary, scenario)
+
+        assert limited['status'] == 'budget_exceeded'
+        assert full['status'] == 'ok'
+        assert not full['cached']
+
+    def test_bad_requests(self, dictionary):
+        """Test validation errors and unknown paths."""
+        async def scenario(service):
+            return [
+                await _http_get(service.port, "/puzzle?seed=CAT"),
+                await _http_get(service.port, "/puzzle?seed=CRANE&dictionary=nope"),
+                await _http_get(service.port, "/puzzle?seed=CRANE&max_nodes=lots"),
+                await _http_get(service.port, "/nowhere"),
+                await _http_get(service.port, "/stats"),
+            ]
+
+        responses = self._run(dictionary, scenario)
+
+        assert [status for status, _ in responses] == [400, 400, 400, 404, 200]
+        assert responses[-1][1]['requests'] == 0
+
+    def test_close_does_not_block_the_loop(self, dictionary):
+        """Test that waiting for the pool to shut down leaves the event loop running."""
+        class SlowShutdown(ThreadPoolExecutor):
+            def shutdown(self, wait=True, *, cancel_futures=False):
+                time.sleep(0.2)
+                super().shutdown(wait=wait, cancel_futures=cancel_futures)
+
+        async def run():
+            service = PuzzleService(dictionary, executor=SlowShutdown(1))
+            ticks = 0
+
+            async def tick():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            ticker = asyncio.create_task(tick())
+            await service.close()
+            ticker.cancel()
+            return ticks
+
+        assert asyncio.run(run()) > 5
+
+    def test_shared_memory_dictionaries(self, dictionary):
+        """Test workers querying a dictionary shared by the service."""
+        async def scenario(service):
+            return await service.get_puzzle("CRANE"), list(service.shared_tries)
+
+        result, shared = self._run(dictionary, scenario, shared_memory=True)
+
+        assert shared == ['mini']
+        assert result['grid'] == WORDS[:5]
+
+    def test_attached_workers_build_no_automata(self, dictionary):
+        """Test that attaching to shared dictionaries builds no per-worker tables."""
+        trie = SharedWordTrie.create(load_words_from_file(dictionary['mini']))
+        try:
+            _attach_worker({'mini': trie.name})
+            assert 'mini' not in _WORKER_NOGOODS
+            assert 'mini' not in _WORKER_ORDERINGS
+            assert _generate_in_worker('mini', "CRANE", None) == ('ok', WORDS[:5])
+        finally:
+            _WORKER_TRIES.pop('mini').close()
+            trie.close()
+            trie.unlink()
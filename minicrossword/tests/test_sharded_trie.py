@@ -0,0 +1,80 @@
+"""
+Tests for the lazily loaded ShardedWordTrie.
+"""
+
+import pytest
+from src.crossword_mini.crossword_generator import generate_all_puzzles
+from src.crossword_mini.sharded_trie import ShardedWordTrie, load_sharded_words, split_words
+from src.crossword_mini.word_trie import WordTrie
+from tests.helpers import ACROSSES, DOWNS
+
+WORDS = ACROSSES + DOWNS + ["ZEBRA"]
+
+
+class TestShardedWordTrie:
+    """Test cases for lazy shard loading."""
+
+    @pytest.fixture
+    def shard_dir(self, tmp_path):
+        split_words(WORDS, str(tmp_path))
+        return str(tmp_path)
+
+    def test_split_words_index(self, shard_dir):
+        """Test that the index records every shard and its word count."""
+        trie = load_sharded_words(shard_dir)
+        assert trie.prefix_length == 1
+        assert trie.pending_shards == {"A", "C", "E", "L", "M", "N", "P", "R", "U", "Z"}
+        assert trie.word_count == 0
+
+    def test_prefix_query_loads_one_shard(self, shard_dir):
+        """Test that a prefix query only loads the matching shard."""
+        trie = load_sharded_words(shard_dir)
+        assert trie.get_words_with_prefix("CL") == ["CLUMP"]
+        assert trie.loaded_shards == {"C"}
+
+    def test_pattern_query_loads_matching_shards(self, shard_dir):
+        """Test that a pattern with a fixed first letter loads one shard."""
+        trie = load_sharded_words(shard_dir)
+        assert trie.get_words_with_pattern("Z????") == ["ZEBRA"]
+        assert trie.loaded_shards == {"Z"}
+
+        assert set(trie.get_words_with_pattern("??U??")) == {"CLUMP", "UPUPA", "ANURA"}
+        assert not trie.pending_shards
+
+    def test_batch_queries_load_matching_shards(self, shard_dir):
+        """Test that batch queries only load shards their first letters allow."""
+        trie = load_sharded_words(shard_dir)
+        assert list(trie.iter_words_with_letter_sets([{"C", "Z"}, None, None, None, None])) == \
+            ["CRANE", "CLUMP", "ZEBRA"]
+        assert trie.get_words_with_patterns(["L????", "ZE???"]) == {
+            "L????": ["LUNAR"], "ZE???": ["ZEBRA"]}
+        assert trie.loaded_shards == {"C", "L", "Z"}
+
+    def test_search_and_word_ids(self, shard_dir):
+        """Test membership and word IDs over lazily loaded shards."""
+        trie = load_sharded_words(shard_dir)
+        assert trie.search("zebra") is True
+        assert trie.search("ZEBRAS") is False
+        assert trie.get_word_id("ZEBRA") == 0
+
+    def test_two_letter_shards(self):
+        """Test shard keys longer than one letter."""
+        shards = {"CR": ["CRANE"], "CL": ["CLUMP"], "A": ["A"]}
+        trie = ShardedWordTrie(shards, lambda key: shards[key], prefix_length=2)
+
+        assert set(trie.get_words_with_prefix("C")) == {"CRANE", "CLUMP"}
+        assert trie.pending_shards == {"A"}
+        assert trie.get_words_with_pattern("?") == ["A"]
+
+    def test_generation_matches_full_trie(self, shard_dir):
+        """Test that generation over shards finds the same puzzles."""
+        full = WordTrie()
+        for word in WORDS:
+            full.insert(word)
+        sharded = load_sharded_words(shard_dir)
+
+        expected = [grid.get_acrosses() for grid in generate_all_puzzles("CRANE", full)]
+        actual = [grid.get_acrosses() for grid in generate_all_puzzles("CRANE", sharded)]
+
+        assert actual == expected
+        assert "Z" in sharded.pending_shards
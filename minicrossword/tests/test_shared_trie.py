@@ -0,0 +1,89 @@
+"""
+Tests for the flat, shareable SharedWordTrie.
+"""
+
+import multiprocessing
+import pytest
+from src.crossword_mini.counting import count_puzzles
+from src.crossword_mini.crossword_generator import NogoodTable, generate_puzzle
+from src.crossword_mini.shared_trie import SharedWordTrie, pack_trie, write_trie_file
+from tests.helpers import ACROSSES, DOWNS, make_trie
+
+WORDS = ACROSSES + DOWNS + ["CRABS"]
+
+
+def _attached_fill(name, seed):
+    trie = SharedWordTrie.attach(name)
+    try:
+        grid = generate_puzzle(seed, trie, NogoodTable(trie))
+        return grid.get_acrosses()
+    finally:
+        trie.close()
+
+
+class TestSharedWordTrie:
+    """Test cases for SharedWordTrie."""
+
+    @pytest.fixture
+    def trie(self):
+        return make_trie(WORDS)
+
+    @pytest.fixture
+    def shared(self, trie):
+        return SharedWordTrie(pack_trie(trie))
+
+    def test_queries_match_word_trie(self, trie, shared):
+        """Test that every query returns the WordTrie's words in the same order."""
+        for prefix in ["", "C", "CRA", "Z"]:
+            assert shared.get_words_with_prefix(prefix) == trie.get_words_with_prefix(prefix)
+        for pattern in ["?????", "C????", "??U??", "????", "?", "Q????"]:
+            assert shared.get_words_with_pattern(pattern) == trie.get_words_with_pattern(pattern)
+        assert shared.get_words_by_length(5) == trie.get_words_by_length(5)
+        assert list(shared.iter_words_with_prefix("C", limit=2)) == ["CRANE", "CRABS"]
+
+        letter_sets = [{"C", "L"}, None, {"A", "U"}, None, None]
+        assert list(shared.iter_words_with_letter_sets(letter_sets)) == \
+            list(trie.iter_words_with_letter_sets(letter_sets))
+        assert shared.next_letters("C") == trie.next_letters("C") == {"R", "L"}
+
+    def test_membership_and_word_ids(self, trie, shared):
+        """Test search, prefixes and word IDs."""
+        assert shared.word_count == trie.word_count
+        assert shared.search("crabs") and not shared.search("CRA")
+        assert shared.starts_with("CRA") and not shared.starts_with("CRX")
+        assert not shared.search("ÉCLAT")
+        for word in WORDS:
+            assert shared.get_word_id(word) == trie.get_word_id(word)
+            assert shared.get_word(shared.get_word_id(word)) == word
+
+    def test_generation_and_counting(self, trie, shared):
+        """Test the generators and DAWG-based features on a shared trie."""
+        assert generate_puzzle("CRANE", shared, NogoodTable(shared)).get_acrosses() == WORDS[:5]
+        assert count_puzzles("CRANE", shared) == count_puzzles("CRANE", trie)
+
+    def test_rejects_foreign_buffers(self):
+        """Test that a buffer without the packed header is rejected."""
+        with pytest.raises(ValueError):
+            SharedWordTrie(bytes(64))
+
+    def test_mapped_file(self, trie, tmp_path):
+        """Test writing and mapping a packed trie file."""
+        path = str(tmp_path / "words.trie")
+        size = write_trie_file(trie, path)
+
+        shared = SharedWordTrie.open_file(path)
+        try:
+            assert shared.nbytes == size
+            assert shared.get_words_with_prefix("CL") == ["CLUMP"]
+        finally:
+            shared.close()
+
+    def test_shared_memory_across_processes(self, trie):
+        """Test a child process querying a block created by its parent."""
+        shared = SharedWordTrie.create(trie)
+        try:
+            with multiprocessing.Pool(1) as pool:
+                assert pool.apply(_attached_fill, (shared.name, "CRANE")) == WORDS[:5]
+        finally:
+            shared.close()
+            shared.unlink()
@@ -125,3 +125,236 @@ class TestWordTriePatternMatch:
         trie.insert("SKI")
         result = trie.get_words_with_pattern("??A")
         assert set(result) == {"SEA", "TEA", "PEA"}
+
+
+class TestWordTrieStats:
+    """Test cases for the get_stats method."""
+
+    def test_stats_counts(self):
+        """Test word, node, depth and length counts."""
+        trie = WordTrie()
+        for word in ["A", "AT", "ATE", "BE", "BEE"]:
+            trie.insert(word)
+
+        stats = trie.get_stats()
+
+        assert stats['total_words'] == 5
+        # root, A, AT, ATE, B, BE, BEE
+        assert stats['total_nodes'] == 7
+        assert stats['max_depth'] == 3
+        assert stats['words_by_length'][1] == 1
+        assert stats['words_by_length'][2] == 2
+        assert stats['words_by_length'][3] == 2
+        assert stats['words_by_length'][4] == 0
+
+    def test_stats_lengths_stay_one_to_ten(self):
+        """Test that words longer than ten letters leave words_by_length's keys alone."""
+        trie = WordTrie()
+        for word in ["CAT", "CROSSWORDED", "CROSSWORDING"]:
+            trie.insert(word)
+
+        stats = trie.get_stats()
+
+        assert list(stats['words_by_length']) == list(range(1, 11))
+        assert stats['words_by_length'][3] == 1
+        assert stats['total_words'] == 3
+        assert stats['max_depth'] == 12
+
+    def test_stats_empty_trie(self):
+        """Test statistics of an empty trie."""
+        stats = WordTrie().get_stats()
+        assert stats['total_words'] == 0
+        assert stats['total_nodes'] == 1
+        assert stats['max_depth'] == 0
+
+    def test_stats_memory(self):
+        """Test that the memory breakdown adds up."""
+        trie = WordTrie()
+        for word in ["APPLE", "APPLY", "APRON"]:
+            trie.insert(word)
+
+        memory = trie.get_stats()['memory']
+
+        assert memory['word_bytes'] > 0
+        assert memory['total_bytes'] == (
+            memory['node_bytes'] + memory['dict_bytes'] + memory['word_bytes'])
+        assert memory['bytes_per_node'] == memory['total_bytes'] / trie.get_stats()['total_nodes']
+
+    def test_measure_load_memory(self, tmp_path):
+        """Test tracemalloc-based measurement of loading a word file."""
+        from src.crossword_mini.word_trie import measure_load_memory
+        path = tmp_path / "words.txt"
+        path.write_text("APPLE\nAPPLY\nAPRON\n")
+
+        result = measure_load_memory(str(path))
+
+        assert result['trie'].word_count == 3
+        assert result['retained_bytes'] > 0
+        assert result['peak_bytes'] >= result['retained_bytes']
+
+
+class TestWordTrieLazyQueries:
+    """Test cases for the generator-based query methods."""
+
+    @pytest.fixture
+    def sample_trie(self):
+        trie = WordTrie()
+        for word in ["A", "AT", "ATE", "APPLE", "APPLY", "APRON", "BROWN", "BROKE"]:
+            trie.insert(word)
+        return trie
+
+    def test_iter_prefix_matches_list(self, sample_trie):
+        """Test that the lazy prefix query matches the list version in order."""
+        assert list(sample_trie.iter_words_with_prefix("A")) == \
+            sample_trie.get_words_with_prefix("A")
+        assert set(sample_trie.get_words_with_prefix("AP")) == {"APPLE", "APPLY", "APRON"}
+
+    def test_iter_prefix_preorder(self, sample_trie):
+        """Test that shorter words are yielded before their extensions."""
+        assert list(sample_trie.iter_words_with_prefix("A"))[:3] == ["A", "AT", "ATE"]
+
+    def test_iter_prefix_limit(self, sample_trie):
+        """Test that limit stops the prefix query early."""
+        assert list(sample_trie.iter_words_with_prefix("AP", limit=2)) == ["APPLE", "APPLY"]
+        assert list(sample_trie.iter_words_with_prefix("AP", limit=0)) == []
+
+    def test_iter_pattern_limit(self, sample_trie):
+        """Test that limit stops the pattern query early."""
+        assert len(list(sample_trie.iter_words_with_pattern("?????", limit=3))) == 3
+        assert list(sample_trie.iter_words_with_pattern("BRO??", limit=1)) == ["BROWN"]
+
+    def test_limited_queries_keep_order(self, sample_trie):
+        """Test that batched limited queries yield a prefix of the full result."""
+        letter_sets = [{"A", "B"}, None, {"O", "P"}, None, None]
+        full = list(sample_trie.iter_words_with_letter_sets(letter_sets))
+
+        for limit in range(1, len(full) + 2):
+            assert list(sample_trie._iter_level_words(letter_sets, limit)) == full[:limit]
+        assert list(sample_trie.iter_words_with_pattern("?????", limit=4)) == \
+            sample_trie.get_words_with_pattern("?????")[:4]
+
+    def test_iter_by_length(self, sample_trie):
+        """Test the lazy length query."""
+        assert set(sample_trie.iter_words_by_length(5)) == {
+            "APPLE", "APPLY", "APRON", "BROWN", "BROKE"}
+        assert list(sample_trie.iter_words_by_length(2)) == ["AT"]
+        assert list(sample_trie.iter_words_by_length(4)) == []
+
+    def test_normalized_fast_path(self, sample_trie):
+        """Test that normalized=True skips upper()/strip()."""
+        assert list(sample_trie.iter_words_with_prefix("BRO", normalized=True)) == \
+            ["BROWN", "BROKE"]
+        # Lowercase input is taken verbatim and so matches nothing
+        assert list(sample_trie.iter_words_with_prefix("bro", normalized=True)) == []
+        assert list(sample_trie.iter_words_with_pattern("br???", normalized=True)) == []
+
+
+class TestWordTrieBatchQueries:
+    """Test cases for queries answered in one shared traversal."""
+
+    @pytest.fixture
+    def sample_trie(self):
+        trie = WordTrie()
+        for word in ["A", "AT", "ATE", "APPLE", "APPLY", "APRON", "BROWN", "BROKE"]:
+            trie.insert(word)
+        return trie
+
+    def test_patterns_match_single_queries(self, sample_trie):
+        """Test that per-pattern results equal separate pattern queries."""
+        patterns = ["AP???", "?RO??", "A?", "????Y", "Z????", "ap??e"]
+        results = sample_trie.get_words_with_patterns(patterns)
+
+        assert list(results) == patterns
+        for pattern in patterns:
+            assert results[pattern] == sample_trie.get_words_with_pattern(pattern)
+
+    def test_matching_any_is_a_union(self, sample_trie):
+        """Test that the union yields each word once, shorter words first."""
+        words = list(sample_trie.iter_words_matching_any(["AP???", "??R??", "A?"]))
+        assert words == ["AT", "APPLE", "APPLY", "APRON"]
+        assert list(sample_trie.iter_words_matching_any(["AP???", "A?"], limit=1)) == ["AT"]
+        assert list(sample_trie.iter_words_matching_any([])) == []
+
+    def test_letter_sets(self, sample_trie):
+        """Test per-position allowed letters."""
+        assert list(sample_trie.iter_words_with_letter_sets(
+            [{"A", "B"}, None, {"O", "P"}, None, {"E", "N"}])) == ["APPLE", "BROWN", "BROKE"]
+        assert list(sample_trie.iter_words_with_letter_sets(["AB", "PR", "O"])) == []
+        assert list(sample_trie.iter_words_with_letter_sets([{"A"}, set()])) == []
+
+    def test_next_letters(self, sample_trie):
+        """Test the letters that continue a prefix."""
+        assert sample_trie.next_letters("A") == {"T", "P"}
+        assert sample_trie.next_letters("apr") == {"O"}
+        assert sample_trie.next_letters("APRON") == set()
+        assert sample_trie.next_letters("Q") == set()
+
+
+class TestWordTrieQueryCache:
+    """Test cases for the opt-in prefix/pattern result cache."""
+
+    @pytest.fixture
+    def sample_trie(self):
+        trie = WordTrie()
+        for word in ["A", "AT", "ATE", "APPLE", "APPLY", "APRON", "BROWN", "BROKE"]:
+            trie.insert(word)
+        return trie
+
+    def test_cached_results_match(self, sample_trie):
+        """Test that cached queries return the uncached results as tuples."""
+        prefix = sample_trie.get_words_with_prefix("AP")
+        pattern = sample_trie.get_words_with_pattern("?RO??")
+        cache = sample_trie.enable_query_cache()
+
+        assert sample_trie.get_words_with_prefix("ap ") == tuple(prefix)
+        assert sample_trie.get_words_with_prefix("AP") is sample_trie.get_words_with_prefix("AP")
+        assert sample_trie.get_words_with_pattern("?RO??") == tuple(pattern)
+        assert sample_trie.get_words_with_pattern("?RO??", wildcard='.') == ()
+        assert cache.get_stats()['hits'] == 2
+        assert cache.get_stats()['misses'] == 3
+
+    def test_insert_invalidates(self, sample_trie):
+        """Test that only inserting a new word clears the cache."""
+        cache = sample_trie.enable_query_cache()
+        sample_trie.get_words_with_prefix("BRO")
+
+        sample_trie.insert("BROKE")
+        assert len(cache) == 1
+        sample_trie.insert("BROOK")
+        assert len(cache) == 0
+        assert sample_trie.get_words_with_prefix("BRO") == ("BROWN", "BROKE", "BROOK")
+        assert cache.get_stats()['invalidations'] == 1
+
+    def test_lru_eviction(self, sample_trie):
+        """Test that the least recently used result is evicted first."""
+        cache = sample_trie.enable_query_cache(max_size=2)
+        sample_trie.get_words_with_prefix("A")
+        sample_trie.get_words_with_prefix("B")
+        sample_trie.get_words_with_prefix("A")
+        sample_trie.get_words_with_prefix("AP")
+
+        assert list(cache.results) == [('prefix', 'A'), ('prefix', 'AP')]
+        stats = cache.get_stats()
+        assert (stats['evictions'], stats['cached_words']) == (1, 9)
+        assert stats['hit_rate'] == 0.25
+
+    def test_limited_queries(self, sample_trie):
+        """Test that a result cut off at a limit only answers queries it covers."""
+        cache = sample_trie.enable_query_cache()
+
+        assert list(sample_trie.iter_words_with_pattern("AP???", limit=1)) == ["APPLE"]
+        assert list(sample_trie.iter_words_with_pattern("AP???", limit=1)) == ["APPLE"]
+        assert cache.get_stats()['hits'] == 1
+        assert list(sample_trie.iter_words_with_pattern("AP???", limit=2)) == ["APPLE", "APPLY"]
+        assert sample_trie.get_words_with_pattern("AP???") == ("APPLE", "APPLY", "APRON")
+        assert cache.get_stats()['misses'] == 3
+        assert list(sample_trie.iter_words_with_pattern("ap???", limit=2)) == ["APPLE", "APPLY"]
+        assert (len(cache), cache.cached_words) == (1, 3)
+
+    def test_disable(self, sample_trie):
+        """Test that disabling the cache brings back fresh lists."""
+        sample_trie.enable_query_cache()
+        sample_trie.disable_query_cache()
+
+        assert sample_trie.get_words_with_prefix("BRO") == ["BROWN", "BROKE"]
+        assert sample_trie.query_cache is None